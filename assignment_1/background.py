@@ -0,0 +1,76 @@
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Hashable
+import tkinter as tk
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundFetcher:
+    """
+    Runs blocking calls (HTTP fetches) on a thread pool and hands the results back
+    on the Tk main thread by polling with `root.after`, since Tk widgets must not be
+    touched from worker threads.
+
+    Every job has a key; submitting a new job with the same key supersedes the
+    in-flight one, whose result is then silently dropped.
+
+    Callbacks run inside a Tk `after` callback, so nothing is re-raised from them: a
+    failed job without `on_error`, or a callback that raises, is logged and the
+    polling goes on for the other jobs.
+    """
+
+    def __init__(self, root: tk.Tk, max_workers: int = 4, poll_interval_ms: int = 50):
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+
+        # key -> (future, on_done, on_error)
+        self.__jobs: dict[Hashable, tuple[Future, Callable, Callable | None]] = {}
+        self.__polling = False
+
+    def submit(
+            self,
+            key: Hashable,
+            fn: Callable,
+            *args,
+            on_done: Callable,
+            on_error: Callable[[Exception], None] | None = None
+    ) -> None:
+        if (previous := self.__jobs.get(key)) is not None:
+            # თუ ჯერ არ დაწყებულა, საერთოდ აღარ შესრულდება, თუ დაწყებულია - შედეგი გადაიყრება
+            previous[0].cancel()
+
+        self.__jobs[key] = (self.executor.submit(fn, *args), on_done, on_error)
+
+        if not self.__polling:
+            self.__polling = True
+            self.root.after(self.poll_interval_ms, self._poll)
+
+    def _poll(self) -> None:
+        try:
+            for key, (future, on_done, on_error) in list(self.__jobs.items()):
+                if not future.done():
+                    continue
+
+                del self.__jobs[key]
+                try:
+                    if future.cancelled():
+                        continue
+                    if (error := future.exception()) is None:
+                        on_done(future.result())
+                    elif on_error is not None:
+                        on_error(error)
+                    else:
+                        logger.error("background job %r failed", key, exc_info=error)
+                except Exception:
+                    logger.exception("callback of background job %r failed", key)
+        finally:
+            # შეცდომის შემთხვევაშიც polling უნდა გაგრძელდეს, თორემ ახალი შედეგები აღარ გამოჩნდება
+            if self.__jobs:
+                self.root.after(self.poll_interval_ms, self._poll)
+            else:
+                self.__polling = False
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,124 @@
+import argparse
+import csv
+import os
+import sys
+import time
+
+import numpy as np
+import requests
+
+# currency_core საერთოა ორივე კონვერტორისთვის და რეპოზიტორიის root-ში მდებარეობს
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from currency_core import RateMatrix, RateStore, convert_many  # noqa: E402
+
+
+def read_columns(path: str, amount_column: str, from_column: str, to_column: str) -> tuple:
+    """
+    Reads the CSV and returns (header, rows, line_numbers, amounts, from_codes, to_codes), where
+    line_numbers[i] is the 1-based line rows[i] ends on. Blank lines are skipped.
+
+    raises:
+        SystemExit if the file has no header or a row has a different number of fields than the header
+    """
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if not header:
+            raise SystemExit(f"{path} is empty, expected a header row")
+
+        rows, line_numbers = [], []
+        for row in reader:
+            if not row:
+                continue
+            if len(row) != len(header):
+                # line_num ფიზიკური სტრიქონია (1-დან), ბრჭყალებში მოქცეული ახალი სტრიქონების ჩათვლით
+                raise SystemExit(
+                    f"{path}, line {reader.line_num}: expected {len(header)} fields, got {len(row)}"
+                )
+            rows.append(row)
+            line_numbers.append(reader.line_num)
+
+    try:
+        amount_i, from_i, to_i = header.index(amount_column), header.index(from_column), header.index(to_column)
+    except ValueError:
+        raise SystemExit(f"CSV must have '{amount_column}', '{from_column}' and '{to_column}' columns")
+
+    line_numbers = np.array(line_numbers, dtype=np.int64)
+    if not rows:
+        return header, rows, line_numbers, np.empty(0, dtype=np.float64), np.empty(0, dtype=str), np.empty(0, dtype=str)
+
+    columns = np.array(rows, dtype=str).reshape(len(rows), len(header))
+
+    # ათასების გამყოფი მძიმე ისევე იშლება, როგორც აპლიკაციაში
+    try:
+        amounts = np.char.replace(columns[:, amount_i], ',', '').astype(np.float64)
+    except ValueError as e:
+        raise SystemExit(f"Invalid amount: {e}")
+
+    return header, rows, line_numbers, amounts, columns[:, from_i], columns[:, to_i]
+
+
+def first_unresolved(rates: RateMatrix, from_codes: np.ndarray, to_codes: np.ndarray) -> int | None:
+    """Index of the first row whose pair neither the snapshot nor the stored rates know; never fetches."""
+    for i, pair in enumerate(zip(np.char.lower(from_codes), np.char.lower(to_codes))):
+        if rates.peek_rate(*pair) is None:
+            return i
+    return None
+
+
+def is_not_found(error: requests.RequestException) -> bool:
+    return error.response is not None and error.response.status_code == 404
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Converts every row of a CSV file from one currency to another.")
+    parser.add_argument("input", help="input CSV file")
+    parser.add_argument("output", help="output CSV file, input columns plus the converted amount")
+    parser.add_argument("--amount-column", default="amount")
+    parser.add_argument("--from-column", default="from")
+    parser.add_argument("--to-column", default="to")
+    parser.add_argument("--result-column", default="converted")
+    parser.add_argument("--precision", type=int, default=2, help="decimal places of the converted amount")
+    parser.add_argument("--max-age", type=float, default=3600, help="maximum age of cached rates in seconds")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+
+    header, rows, line_numbers, amounts, from_codes, to_codes = read_columns(
+        args.input, args.amount_column, args.from_column, args.to_column
+    )
+
+    # მხოლოდ header-იანი ფაილისთვის კურსები არ გვჭირდება
+    converted = np.empty(0, dtype=np.float64)
+    if rows:
+        store = RateStore()
+        rates = RateMatrix(store)
+        try:
+            converted = convert_many(amounts, from_codes, to_codes, rates, args.max_age, line_numbers)
+        except ValueError as e:
+            raise SystemExit(f"{args.input}: {e}")
+        except (KeyError, requests.RequestException) as e:
+            # უცნობი ვალუტა (KeyError ან API-ის 404) თუ API მიუწვდომელია - პირველი გადაუყვანელი სტრიქონი
+            if (i := first_unresolved(rates, from_codes, to_codes)) is None:
+                raise SystemExit(f"rates are unavailable: {e}")
+
+            where = f"{args.input}, line {line_numbers[i]}"
+            if isinstance(e, requests.RequestException) and not is_not_found(e):
+                raise SystemExit(f"{where}: rates of {from_codes[i]} are unavailable: {e}")
+            raise SystemExit(f"{where}: unknown currency pair {from_codes[i]}/{to_codes[i]}")
+        finally:
+            store.close()
+
+    with open(args.output, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(header + [args.result_column])
+        writer.writerows(
+            row + [value] for row, value in zip(rows, np.char.mod(f"%.{args.precision}f", converted))
+        )
+
+    print(f"Converted {len(rows)} rows in {time.perf_counter() - start_time:.2f} seconds.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,28 @@
 from tkinter import messagebox, ttk
-from datetime import datetime, UTC
 import tkinter as tk
+from decimal import Decimal
+import logging
+import queue
 import requests
+import os
+import sys
+
+# currency_core საერთოა ორივე კონვერტორისთვის და რეპოზიტორიის root-ში მდებარეობს
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from currency_core import (  # noqa: E402
+    INT64_MAX, ConversionEngine, CurrencyCatalogue, CurrencyIndex, RateMatrix, RateRefresher, RateStore, parse_amount
+)
+from background import BackgroundFetcher  # noqa: E402
+
+logger = logging.getLogger(__name__)
 
 
 class CurrencyConverterApp:
     show_only_country_currency: bool
-    __INT64_MAX = 2**63 - 1
+    __INT64_MAX = INT64_MAX
     __DEFAULT_FROM_CURRENCY = "USD"
     __DEFAULT_TO_CURRENCY = "GEL"
-    __ALL_CURRENCIES_URL = "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies.json"
-    __SINGLE_CURRENCY_URL = __ALL_CURRENCIES_URL.replace('.json', '') + "/{currency_code}.json"
     country_currencies = [
         'USD', 'CAD', 'EUR', 'AED', 'AFN', 'ALL', 'AMD', 'ARS', 'AUD', 'AZN', 'BAM', 'BDT', 'BGN',
         'BHD', 'BIF', 'BND', 'BOB', 'BRL', 'BWP', 'BYN', 'BZD', 'CDF', 'CHF', 'CLP', 'CNY', 'COP',
@@ -39,11 +51,26 @@ class CurrencyConverterApp:
         self._cache_validity_seconds = cache_validity_seconds
         self.show_only_country_currency: bool = False
 
-        self.cache = {}
-        self.currency_names = {}
+        self.cache = RateStore()
+        self.rates = RateMatrix(self.cache, max_age=cache_validity_seconds)
+        self.engine = ConversionEngine(self.rates)
+        # კურსები ფონურად ახლდება ქეშის ვადის ნახევარში, კონვერტაცია fetch-ს აღარ ელოდება.
+        # ცვლილებები refresher-ის ნაკადიდან რიგით გადმოდის და root.after-ით მუშავდება
+        self.refresher = RateRefresher(self.rates, interval=cache_validity_seconds / 2)
+        self.rate_changes: queue.SimpleQueue = queue.SimpleQueue()
+        # ვალუტების სახელები ლოკალური კატალოგიდან იკითხება, ქსელი გაშვებისთვის საჭირო არ არის
+        self.catalogue = CurrencyCatalogue()
+        self.currency_names = self.catalogue
+        self.currency_index = CurrencyIndex({})
+        self.country_currency_index = CurrencyIndex({}, self.country_currencies)
         self.root = tk.Tk()
         self.root.title("ვალუტის კონვერტორი")
 
+        # HTTP რექუესტები ცალკე ნაკადებში სრულდება, რომ ფანჯარა არ გაიყინოს
+        self.fetcher = BackgroundFetcher(self.root)
+        self._active_pair: tuple[str, str] | None = None
+        self._active_amount: Decimal | None = None
+
         # Entries
         self.amount_entry: tk.Entry | None = None
         self.from_currency_entry: tk.Entry | None = None
@@ -84,17 +111,14 @@ class CurrencyConverterApp:
     def get_max_int64(self) -> int:
         return self.__INT64_MAX
 
-    def get_currency_names(self) -> dict:
+    def get_currency_names(self) -> CurrencyCatalogue:
         """
-        აბრუნებს ყველა ვალუტის სახელებს API-ს გამოყენებით.
+        ამოწმებს ლოკალურ ვალუტების კატალოგს API-სთან (ETag/Last-Modified) და საჭიროების
+        შემთხვევაში წერს ახალ ვერსიას. ეშვება ფონურ ნაკადში.
         """
-        currency_names = requests.get(
-            self.__ALL_CURRENCIES_URL
-        )
-    
-        currency_names.raise_for_status()
-        
-        return currency_names.json()
+        self.catalogue.refresh()
+
+        return self.catalogue
 
     def create_widgets(self) -> None:
         self.root.columnconfigure(0, weight=1)
@@ -142,9 +166,9 @@ class CurrencyConverterApp:
         self.to_currency_dropdown.grid(column=1, row=3, padx=10, pady=10, sticky='ew')
         
         # ბაინდები
-        self.from_currency_dropdown.bind('<KeyRelease>', self.validate_from_currency)
+        self.from_currency_dropdown.bind('<KeyRelease>', self.filter_from_currency)
         self.from_currency_dropdown.bind('<<ComboboxSelected>>', self.validate_from_currency)
-        self.to_currency_dropdown.bind('<KeyRelease>', self.validate_to_currency)
+        self.to_currency_dropdown.bind('<KeyRelease>', self.filter_to_currency)
         self.to_currency_dropdown.bind('<<ComboboxSelected>>', self.validate_to_currency)
 
         self.from_currency_validation_label = ttk.Label(
@@ -178,52 +202,74 @@ class CurrencyConverterApp:
         self.result_label = ttk.Label(self.root, text="კონვერტირებული თანხა:")
         self.result_label.grid(column=0, row=5, columnspan=3, padx=15, pady=10, sticky='w')
 
+        self.build_currency_index()
         self.replace_combobox_values()
 
+    def build_currency_index(self) -> None:
+        """
+        აგებს ვალუტების prefix ინდექსს. ეშვება მხოლოდ კატალოგის ჩატვირთვისას და არა ყოველ ღილაკზე.
+        """
+        self.currency_index = CurrencyIndex(self.currency_names)
+        self.country_currency_index = CurrencyIndex(self.currency_names, self.country_currencies)
+
+    @property
+    def combobox_index(self) -> CurrencyIndex:
+        return self.country_currency_index if self.show_only_country_currency else self.currency_index
+
     def validate_from_currency(self, event) -> None:
         """
         ამოწმებს "from_currency" ველში შეყვანილ ტექსტს და შესაბამისად განაახლებს ვალიდაციის ლეიბლის ტექსტს.
         """
 
-        code = self.from_currency.get().lower()
-        if code in self.currency_names:
-            self.from_currency_validation_label.config(
-                text=self.currency_names[code] if self.currency_names[code].strip() else 'ვალუტა მოიძებნა'
-            )
+        text = self.from_currency.get()
+        code = text.upper()
+        if (name := self.currency_index.names.get(code)) is not None:
+            self.from_currency_validation_label.config(text=name if name.strip() else 'ვალუტა მოიძებნა')
         else:
             self.from_currency_validation_label.config(text="ვალუტა ვერ მოიძებნა")
 
-        self.from_currency.set(self.from_currency.get().upper())
+        if text != code:
+            self.from_currency.set(code)
 
     def validate_to_currency(self, event) -> None:
         """
         ამოწმებს "to_currency" ველში შეყვანილ ტექსტს და შესაბამისად განაახლებს ვალიდაციის ლეიბლის ტექსტს.
         """
 
-        code = self.to_currency.get().lower()
-        if code in self.currency_names:
-            self.to_currency_validation_label.config(
-                text=self.currency_names[code] if self.currency_names[code].strip() else 'ვალუტა მოიძებნა'
-            )
+        text = self.to_currency.get()
+        code = text.upper()
+        if (name := self.currency_index.names.get(code)) is not None:
+            self.to_currency_validation_label.config(text=name if name.strip() else 'ვალუტა მოიძებნა')
         else:
             self.to_currency_validation_label.config(text="ვალუტა ვერ მოიძებნა")
 
-        self.to_currency.set(self.to_currency.get().upper())
+        if text != code:
+            self.to_currency.set(code)
+
+    def filter_from_currency(self, event) -> None:
+        """
+        ვალიდაციის შემდეგ dropdown-ში ტოვებს მხოლოდ იმ ვალუტებს, რომელთა კოდი ან სახელი შეყვანილი ტექსტით იწყება.
+        """
+        self.validate_from_currency(event)
+        self.from_currency_dropdown['values'] = self.combobox_index.search(self.from_currency.get())
+
+    def filter_to_currency(self, event) -> None:
+        """
+        ვალიდაციის შემდეგ dropdown-ში ტოვებს მხოლოდ იმ ვალუტებს, რომელთა კოდი ან სახელი შეყვანილი ტექსტით იწყება.
+        """
+        self.validate_to_currency(event)
+        self.to_currency_dropdown['values'] = self.combobox_index.search(self.to_currency.get())
     
     def replace_combobox_values(self) -> None:
-        if self.show_only_country_currency:
-            self.from_currency_dropdown['values'] = self.country_currencies
-            self.to_currency_dropdown['values'] = self.country_currencies
-        else:
-            self.from_currency_dropdown['values'] = list(map(lambda x: x.upper(), self.currency_names.keys()))
-            self.to_currency_dropdown['values'] = list(map(lambda x: x.upper(), self.currency_names.keys()))
+        self.from_currency_dropdown['values'] = self.combobox_index.codes
+        self.to_currency_dropdown['values'] = self.combobox_index.codes
 
     def convert_currency(self) -> None:
         """
         აკონვერტებს შეყვანილ თანხას ერთი ვალუტიდან მეორეში API-ს გამოყენებით.
         """
         self.result_label.config(text="კონვერტირებული თანხა: მუშავდება...")
-        self.root.update_idletasks()
+        self._active_pair = None
         # ამოწმებს თუ ვალიდაციის ლეიბელებში შეცდომაა
         if ((n := self.from_currency_validation_label.cget("text") == "ვალუტა ვერ მოიძებნა") or
                 self.to_currency_validation_label.cget("text") == "ვალუტა ვერ მოიძებნა"):
@@ -232,58 +278,52 @@ class CurrencyConverterApp:
                      f"{self.from_currency.get().upper() if n else self.to_currency.get().upper()}")
         else:
             try:
-                result = float(self.amount_entry.get().replace(',', ''))
-                assert result >= 0, "თანხა უნდა იყოს დადებითი რიცხვი"
-                
-                assert result < self.__INT64_MAX, "თანხა ძალიან დიდია"
-                
-                to_currency_code = self.to_currency.get().lower()
-                
-                # თუ შეყვანილი თანხაა 0 მაშინ არის საჭირო კონვერტაცია
-                if result == 0:
-                    self.result_label.config(text="კონვერტირებული თანხა: 0.00 " + to_currency_code.upper())
-                    return
-                
+                # Decimal: თანხა ზუსტად ისე ითვლება, როგორც შეიყვანეს, float-ის დამრგვალების გარეშე
+                amount = parse_amount(self.amount_entry.get())
                 from_currency_code = self.from_currency.get().lower()
+                to_currency_code = self.to_currency.get().lower()
 
-                # თუ ვალუტები ერთნაირია მაშინ არარი საჭიროა კონვერტაცია
-                if from_currency_code == to_currency_code:
-                    self.result_label.config(text=f"კონვერტირებული თანხა: {result:,.2f} {to_currency_code.upper()}")
+                pair = self._active_pair = (from_currency_code, to_currency_code)
+                self._active_amount = amount
+
+                # თუ შეყვანილი თანხაა 0 ან ვალუტები ერთნაირია, კონვერტაცია კურსის გარეშე ხდება
+                if not self.engine.needs_rate(amount, from_currency_code, to_currency_code):
+                    self.show_conversion_result(pair, self.engine.convert(amount, *pair))
                     return
 
-                # რექუესტი API სერვერზე ვალუტის კურსების მისაღებად თუ მეხსიერებაში არ გვაქვს ქეში
-                # ან ქეშის დრო ამოიწურა default: (1 საათი)
-                if (not (from_currency_cache := self.cache.get(from_currency_code)) or
-                        (datetime.now(UTC) - from_currency_cache['fetch_time']).seconds > self._cache_validity_seconds):
-                    
-                    currency_rates = requests.get(
-                        self.__SINGLE_CURRENCY_URL.format(
-                            currency_code=from_currency_code
-                        )
-                    )
-
-                    assert currency_rates.status_code == 200, "დაფიქსირდა შეცდომა"
-                    
-                    currency_rates = currency_rates.json()
-
-                    rate = currency_rates[from_currency_code][to_currency_code]
-
-                    result = result * rate
-                    
-                    # ქეშის განახლება
-                    self.cache.update({from_currency_code: {'currency_rate': currency_rates[from_currency_code],
-                                                            'fetch_time': datetime.now(UTC)}})
-                    
-                else:
-                    result = result * self.cache[from_currency_code]['currency_rate'][to_currency_code]
-
-                self.result_label.config(text=f"კონვერტირებული თანხა: {result:,.2f} {to_currency_code.upper()}")
-            except AssertionError as e:
+                # კურსი გამოითვლება USD-ის ერთი snapshot-იდან, API-ს მივმართავთ მხოლოდ თუ
+                # ქეშის დრო ამოიწურა default: (1 საათი) ან snapshot-ში ვალუტა არ არის.
+                # ახალი რექუესტი იმავე წყვილზე ანაცვლებს ჯერ დაუსრულებელს
+                self.refresher.touch(from_currency_code)
+
+                self.fetcher.submit(
+                    pair,
+                    self.engine.convert, amount, from_currency_code, to_currency_code, self._cache_validity_seconds,
+                    on_done=lambda result: self.show_conversion_result(pair, result),
+                    on_error=lambda error: self.show_conversion_error(pair, error)
+                )
+            except ValueError as e:
                 self.result_label.config(text=str(e))
-            except IndexError:
-                self.result_label.config(text='კონვერტირება ვერ მოხერხდა')
-            except ValueError:
-                self.result_label.config(text="გთხოვთ, შეიყვანოთ ვალიდური თანხა")
+
+    def show_conversion_result(self, pair: tuple[str, str], result: Decimal) -> None:
+        # ძველი წყვილის შედეგი აღარ გამოჩნდება, თუ მომხმარებელმა უკვე სხვა კონვერტაცია მოითხოვა
+        if pair != self._active_pair:
+            return
+
+        self.result_label.config(text=f"კონვერტირებული თანხა: {result:,f} {pair[1].upper()}")
+
+    def show_conversion_error(self, pair: tuple[str, str], error: Exception) -> None:
+        if pair != self._active_pair:
+            return
+
+        if isinstance(error, requests.RequestException):
+            self.result_label.config(text="დაფიქსირდა შეცდომა")
+        elif isinstance(error, (IndexError, KeyError)):
+            self.result_label.config(text='კონვერტირება ვერ მოხერხდა')
+        else:
+            # Tk-ის callback-იდან შეცდომა აღარ ვრცელდება: ვაჩვენებთ და ვლოგავთ
+            logger.error("conversion %s -> %s failed", *pair, exc_info=error)
+            self.result_label.config(text="დაფიქსირდა შეცდომა")
 
     def clear_fields(self) -> None:
         self.amount_entry.delete(0, tk.END)
@@ -307,21 +347,62 @@ class CurrencyConverterApp:
     def mainloop(self) -> None:
         """
             ეს არის მთავარი ფუნქცია, რომელიც გამოიძახება ფანჯრის გამოსატანად.
-
-            raises:
-                HTTPError თუ API-სთან კავშირი ვერ დამყარდა
+            ფანჯარა ლოკალური კატალოგით მაშინვე ჩნდება, კატალოგის განახლება კი ფონურად მიმდინარეობს.
         """
-       
-        self.currency_names = self.get_currency_names()
 
         self.center_window(self.root, self.width, self.height)
 
         self.create_widgets()
 
+        self.fetcher.submit(
+            'currency_names',
+            self.get_currency_names,
+            on_done=self.set_currency_names,
+            on_error=self.on_currency_names_error
+        )
+
+        self.refresher.subscribe(lambda *change: self.rate_changes.put(change))
+        self.refresher.start()
+        self.root.after(500, self.poll_rate_changes)
+
         self.root.attributes("-topmost", True)
         self.root.after(500, lambda: self.root.attributes("-topmost", False))
 
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.refresher.stop()
+            self.fetcher.shutdown()
+
+    def poll_rate_changes(self) -> None:
+        """
+        ამუშავებს refresher-ის შეტყობინებებს Tk-ის ნაკადში: ნაჩვენები შედეგი ხელახლა
+        ითვლება მხოლოდ მაშინ, თუ მისი წყვილის კურსი მართლა შეიცვალა.
+        """
+        while not self.rate_changes.empty():
+            base, _, changed = self.rate_changes.get()
+            pair = self._active_pair
+            if pair is not None and self.refresher.affects(base, changed, *pair):
+                if (result := self.engine.peek(self._active_amount, *pair)) is not None:
+                    self.show_conversion_result(pair, result)
+
+        self.root.after(500, self.poll_rate_changes)
+
+    def set_currency_names(self, currency_names: CurrencyCatalogue) -> None:
+        if not currency_names.reload():
+            return
+
+        self.currency_names = currency_names
+        self.build_currency_index()
+        self.replace_combobox_values()
+
+        self.validate_from_currency('')
+        self.validate_to_currency('')
+
+    def on_currency_names_error(self, error: Exception) -> None:
+        # API მიუწვდომელია - ლოკალური კატალოგი საკმარისია, თუ ის უკვე არსებობს
+        if not len(self.currency_names):
+            self.result_label.config(text="ვალუტების სია ვერ ჩაიტვირთა")
     
     def open_settings_window(self):
         settings_window = tk.Toplevel(self.root)
@@ -361,6 +442,7 @@ class CurrencyConverterApp:
             
             if cache_validity.isdigit() and int(cache_validity) >= 0:
                 self._cache_validity_seconds = int(cache_validity)
+                self.refresher.interval = self._cache_validity_seconds / 2
             else:
                 messagebox.showerror("შეცდომა", "გთხოვთ შეიყვანოთ მხოლოდ არაუარყოფითი რიცხვი", parent=settings_window)
                 return
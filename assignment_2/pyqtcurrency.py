@@ -1,24 +1,40 @@
-import os
-import requests
+import time
 
-from PyQt5 import uic
-from PyQt5.QtCore import Qt
-from datetime import datetime, UTC
+# --startup-profile-ის ათვლის წერტილი, ყველა import-მდე
+STARTED_AT = time.perf_counter()
 
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QStackedWidget, QLineEdit, QPushButton,
-                             QWidget, QLabel, QComboBox, QMessageBox)
+import argparse  # noqa: E402
+import logging  # noqa: E402
+import os  # noqa: E402
+import sys  # noqa: E402
+from collections.abc import Callable  # noqa: E402
+from decimal import Decimal  # noqa: E402
 
+import requests  # noqa: E402
 
-CACHE_FILE = 'cache.txt'
+from PyQt5.QtCore import Qt, QEvent, QObject, QStringListModel, QTimer  # noqa: E402
 
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QStackedWidget, QLineEdit, QPushButton,  # noqa: E402
+                             QWidget, QLabel, QComboBox, QMessageBox, QCompleter, QInputDialog)
+
+# currency_core საერთოა ორივე კონვერტორისთვის და რეპოზიტორიის root-ში მდებარეობს
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from currency_core import (  # noqa: E402
+    ConversionEngine, CurrencyCatalogue, CurrencyIndex, RateMatrix, RateRefresher, RateStore, parse_amount
+)
+from workers import CoalescingFetcher, RateChangeSignals  # noqa: E402
+from sessions import SessionStore, read_token, remove_token, write_token  # noqa: E402
+from ui import setup_ui  # noqa: E402
+
+logger = logging.getLogger(__name__)
 
-class LoginWindow(QWidget):
-    __USERNAME = "admin"
-    __PASSWORD = "admin"
 
-    def __init__(self, switch_to_currency_converter):
+class LoginWindow(QWidget):
+    def __init__(self, switch_to_currency_converter, sessions: SessionStore):
         super().__init__()
         self.switch_to_currency_converter = switch_to_currency_converter
+        self.sessions = sessions
 
         self.login_field: QLineEdit | None = None
         self.password_field: QLineEdit | None = None
@@ -27,8 +43,8 @@ class LoginWindow(QWidget):
         self.load_ui()
 
     def load_ui(self):
-        # Load login UI from the .ui file
-        uic.loadUi('ui/login.ui', self)
+        # Load login UI from the precompiled ui/login_ui.py (or the .ui file if it is newer)
+        setup_ui(self, 'login')
 
         self.login_field = self.findChild(QLineEdit, 'login_field')
         self.password_field = self.findChild(QLineEdit, 'password_field')
@@ -39,11 +55,40 @@ class LoginWindow(QWidget):
         self.login_field.installEventFilter(self)
         self.password_field.installEventFilter(self)
 
+    def create_first_operator(self, username: str, password: str) -> bool:
+        """Offers to create the first operator on a fresh install; returns whether it was created."""
+        if not username or not password:
+            QMessageBox.information(
+                self, 'პირველი გაშვება',
+                'ოპერატორი ჯერ არ არსებობს. შეიყვანეთ ახალი ოპერატორის სახელი და პაროლი და დააჭირეთ შესვლას '
+                '(ან გაუშვით: python sessions.py set-password <username>)'
+            )
+            return False
+
+        if QMessageBox.question(
+                self, 'პირველი გაშვება', f'ოპერატორი ჯერ არ არსებობს. შევქმნათ ოპერატორი "{username}"?'
+        ) != QMessageBox.Yes:
+            return False
+
+        repeated, ok = QInputDialog.getText(self, 'პირველი გაშვება', 'გაიმეორეთ პაროლი:', QLineEdit.Password)
+        if not ok:
+            return False
+        if repeated != password:
+            QMessageBox.warning(self, 'პირველი გაშვება', 'პაროლები არ ემთხვევა')
+            return False
+
+        # სხვა ფანჯარამ შეიძლება ამასობაში უკვე შექმნა - მაშინ ჩვეულებრივი შესვლა ხდება
+        self.sessions.create_first_operator(username, password)
+        return True
+
     def handle_login(self):
         username = self.login_field.text()
         password = self.password_field.text()
-        if username == self.__USERNAME and password == self.__PASSWORD:
-            self.cache_user_login()
+        if not self.sessions.has_operators() and not self.create_first_operator(username, password):
+            return
+
+        if (token := self.sessions.login(username, password)) is not None:
+            self.cache_user_login(token)
             self.switch_to_currency_converter()
             self.login_field.clear()
             self.password_field.clear()
@@ -51,9 +96,9 @@ class LoginWindow(QWidget):
             QMessageBox.warning(self, 'Login Error', 'ემაილი ან პაროლი არასწორია')
 
     @staticmethod
-    def cache_user_login():
-        with open(CACHE_FILE, 'w') as file:
-            file.write('logged_in')
+    def cache_user_login(token: str):
+        # ტოკენი ინახება, რომ გადატვირთვისას ხელახლა შესვლა არ დასჭირდეს, სანამ სესიას ვადა არ გაუვა
+        write_token(token)
 
     def eventFilter(self, source, event):
         if event.type() == event.KeyPress and event.key() == Qt.Key_Return:
@@ -67,11 +112,8 @@ class LoginWindow(QWidget):
 
 
 class CurrencyConverter(QWidget):
-    __INT64_MAX = 2**63 - 1
     __DEFAULT_FROM_CURRENCY = "USD"
     __DEFAULT_TO_CURRENCY = "GEL"
-    __ALL_CURRENCIES_URL = "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies.json"
-    __SINGLE_CURRENCY_URL = __ALL_CURRENCIES_URL.replace('.json', '') + "/{currency_code}.json"
     custom_html = '<html><head/><body><p><span style="font-size:12pt; font-weight:600;">{}</span></p></body></html>'
     currencies = [
                 'USD', 'CAD', 'EUR', 'AED', 'AFN', 'ALL', 'AMD', 'ARS', 'AUD', 'AZN', 'BAM', 'BDT', 'BGN',
@@ -86,11 +128,36 @@ class CurrencyConverter(QWidget):
                 'ZMK', 'ZWL'
             ]
 
-    def __init__(self):
+    def __init__(self, ensure_session: Callable[[], bool] | None = None):
+        """
+        arguments:
+            ensure_session: called before every conversion; False (the session expired or
+                was revoked) cancels the conversion
+        """
         super().__init__()
-
-        self.currency_names = self.get_currency_names()
-        self.cache = {}
+        self.ensure_session = ensure_session
+
+        # ვალუტების სია ლოკალური კატალოგიდან იკითხება, კატალოგის განახლება და კურსები
+        # QThreadPool-ში იტვირთება, ფანჯარა კი მაშინვე ჩნდება
+        self.fetcher = CoalescingFetcher()
+        self.catalogue = CurrencyCatalogue()
+        self.currency_names = self.catalogue
+        self.currency_index = CurrencyIndex({})
+        self.country_currency_index = CurrencyIndex({}, self.currencies)
+        self.cache = RateStore()
+        self.rates = RateMatrix(self.cache)
+        self.engine = ConversionEngine(self.rates)
+        self._active_pair: tuple[str, str] | None = None
+        self._active_amount: Decimal | None = None
+
+        # კურსები ფონურად ახლდება ქეშის ვადის ნახევარში, ეკრანზე შედეგი მხოლოდ
+        # რეალური ცვლილებისას ახლდება
+        self.refresher = RateRefresher(self.rates, interval=self.rates.max_age / 2)
+        self.rate_change_signals = RateChangeSignals()
+        self.rate_change_signals.changed.connect(self.on_rates_changed)
+        self.refresher.subscribe(self.rate_change_signals.changed.emit)
+        self.refresher.start()
+        QApplication.instance().aboutToQuit.connect(self.refresher.stop)
 
         self.show_only_country_currency: bool = False
 
@@ -104,13 +171,21 @@ class CurrencyConverter(QWidget):
         self.clear_button: QPushButton | None = None
 
         self.load_ui()
+        self.build_currency_index()
         self.replace_combobox_values()
 
+        self.fetcher.fetch(
+            'currency_names',
+            self.get_currency_names,
+            on_done=self.set_currency_names,
+            on_error=self.on_currency_names_error
+        )
+
     def load_ui(self):
         self.setWindowTitle("Currency Converter")
         self.setGeometry(100, 100, 600, 400)
 
-        uic.loadUi('ui/currency.ui', self)
+        setup_ui(self, 'currency')
 
         self.amount_entry = self.findChild(QLineEdit, 'amount_entry')
         self.from_currency_dropdown = self.findChild(QComboBox, 'from_currency_dropdown')
@@ -126,85 +201,156 @@ class CurrencyConverter(QWidget):
         self.from_currency_dropdown.currentTextChanged.connect(self.validate_from_currency)
         self.to_currency_dropdown.currentTextChanged.connect(self.validate_to_currency)
 
-        self.show()
+        self.create_completer(self.from_currency_dropdown)
+        self.create_completer(self.to_currency_dropdown)
+
+    def create_completer(self, dropdown: QComboBox) -> QCompleter:
+        """
+        dropdown-ის completer-ი აჩვენებს მხოლოდ იმ ვალუტებს, რომელთა კოდი ან სახელი შეყვანილი ტექსტით იწყება.
+        """
+        completer = QCompleter(QStringListModel(self), self)
+        completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        dropdown.setCompleter(completer)
+        dropdown.lineEdit().textEdited.connect(lambda text: self.filter_currencies(completer, text))
+        return completer
+
+    def filter_currencies(self, completer: QCompleter, text: str):
+        completer.model().setStringList(list(self.combobox_index.search(text)))
+        completer.complete()
+
+    def build_currency_index(self):
+        # ინდექსი მხოლოდ კატალოგის ჩატვირთვისას აიგება და არა ყოველ ღილაკზე
+        self.currency_index = CurrencyIndex(self.currency_names)
+        self.country_currency_index = CurrencyIndex(self.currency_names, self.currencies)
+
+    @property
+    def combobox_index(self) -> CurrencyIndex:
+        return self.country_currency_index if self.show_only_country_currency else self.currency_index
 
     def get_currency_names(self):
-        response = requests.get(self.__ALL_CURRENCIES_URL)
-        response.raise_for_status()
-        return response.json()
+        # კატალოგის ვალიდაცია API-სთან (ETag/Last-Modified), ეშვება QThreadPool-ში
+        self.catalogue.refresh()
+        return self.catalogue
+
+    def set_currency_names(self, currency_names: CurrencyCatalogue):
+        if not currency_names.reload():
+            return
+
+        self.currency_names = currency_names
+        self.build_currency_index()
+        self.replace_combobox_values()
+
+    def on_currency_names_error(self, error: Exception):
+        # API მიუწვდომელია - ლოკალური კატალოგი საკმარისია, თუ ის უკვე არსებობს
+        if not len(self.currency_names):
+            self.result_label.setText(self.custom_html.format("ვალუტების სია ვერ ჩაიტვირთა"))
 
     def validate_from_currency(self):
-        code = self.from_currency_dropdown.currentText().lower()
-        if code in self.currency_names:
-            self.from_currency_validation_label.setText(self.currency_names.get(code, 'ვალუტა ვერ მოიძებნა'))
+        text = self.from_currency_dropdown.currentText()
+        code = text.upper()
+        if (name := self.currency_index.names.get(code)) is not None:
+            self.from_currency_validation_label.setText(name)
         else:
             self.from_currency_validation_label.setText("ვალუტა ვერ მოიძებნა")
 
-        self.from_currency_dropdown.setCurrentText(code.upper())
+        if text != code:
+            self.from_currency_dropdown.setCurrentText(code)
 
     def validate_to_currency(self):
-        code = self.to_currency_dropdown.currentText().lower()
-        if code in self.currency_names:
-            self.to_currency_validation_label.setText(self.currency_names.get(code, 'ვალუტა მოიძებნა'))
+        text = self.to_currency_dropdown.currentText()
+        code = text.upper()
+        if (name := self.currency_index.names.get(code)) is not None:
+            self.to_currency_validation_label.setText(name)
         else:
             self.to_currency_validation_label.setText("ვალუტა ვერ მოიძებნა")
 
-        self.to_currency_dropdown.setCurrentText(code.upper())
+        if text != code:
+            self.to_currency_dropdown.setCurrentText(code)
 
     def replace_combobox_values(self):
-        if self.show_only_country_currency:
-            self.from_currency_dropdown.addItems(self.currencies)
-            self.to_currency_dropdown.addItems(self.currencies)
-        else:
-            self.from_currency_dropdown.addItems(list(map(lambda x: x.upper(), self.currency_names.keys())))
-            self.to_currency_dropdown.addItems(list(map(lambda x: x.upper(), self.currency_names.keys())))
+        self.from_currency_dropdown.clear()
+        self.to_currency_dropdown.clear()
+
+        codes = list(self.combobox_index.codes)
+        self.from_currency_dropdown.addItems(codes)
+        self.to_currency_dropdown.addItems(codes)
 
         self.from_currency_dropdown.setCurrentText(self.__DEFAULT_FROM_CURRENCY)
         self.to_currency_dropdown.setCurrentText(self.__DEFAULT_TO_CURRENCY)
 
     def convert_currency(self):
+        if self.ensure_session is not None and not self.ensure_session():
+            return
+
         try:
-            amount = float(self.amount_entry.text().replace(',', ''))
-            assert amount >= 0, "თანხა უნდა იყოს დადებითი რიცხვი"
-            assert amount < self.__INT64_MAX, "თანხა ძალიან დიდია"
+            amount = parse_amount(self.amount_entry.text())
 
             from_currency_code = self.from_currency_dropdown.currentText().lower()
             to_currency_code = self.to_currency_dropdown.currentText().lower()
 
-            if from_currency_code == to_currency_code:
-                self.result_label.setText(
-                    self.custom_html.format(f"კონვერტირებული თანხა: {amount:,.2f} {to_currency_code.upper()}")
-                )
-                return
+            pair = self._active_pair = (from_currency_code, to_currency_code)
+            self._active_amount = amount
 
-            if (from_currency_code not in self.cache or (datetime.now(UTC) -
-                                                         self.cache[from_currency_code]['fetch_time']).seconds > 3600):
-                response = requests.get(
-                    self.__SINGLE_CURRENCY_URL.format(
-                        currency_code=from_currency_code
-                    )
-                )
+            if not self.engine.needs_rate(amount, from_currency_code, to_currency_code):
+                self.show_conversion_result(pair, self.engine.convert(amount, *pair))
+                return
 
-                assert response.status_code == 200, "დაფიქსირდა შეცდომა"
+            self.refresher.touch(from_currency_code)
 
-                currency_rates = response.json()
-                rate = currency_rates[from_currency_code][to_currency_code]
-                self.cache[from_currency_code] = {'currency_rate': currency_rates[from_currency_code],
-                                                  'fetch_time': datetime.now(UTC)}
+            # stale-while-revalidate: ქეშში არსებული კურსი მაშინვე ჩანს (თუნდაც ძველი),
+            # განახლება კი ფონურად მიმდინარეობს
+            if (result := self.engine.peek(amount, *pair)) is not None:
+                self.show_conversion_result(pair, result)
             else:
-                rate = self.cache[from_currency_code]['currency_rate'][to_currency_code]
-
-            result = amount * rate
-            self.result_label.setText(self.custom_html.format(
-                f"კონვერტირებული თანხა: {result:,.2f} {to_currency_code.upper()}")
-            )
+                self.result_label.setText(self.custom_html.format("კონვერტირებული თანხა: მუშავდება..."))
+
+            if result is None or not self.rates.is_fresh():
+                # ერთი ბაზის პარალელური რექუესტები ერთ fetch-ში ერთიანდება, რამდენ სამიზნე
+                # ვალუტასაც არ უნდა ითხოვდნენ; თავის წყვილს (და მის KeyError-ს) თითოეული თავად არკვევს
+                self.fetcher.fetch(
+                    from_currency_code,
+                    self.rates.get_base_rates, from_currency_code,
+                    on_done=lambda _: self.on_rates_refreshed(pair, amount),
+                    on_error=lambda error: self.show_conversion_error(pair, error)
+                )
 
-        except AssertionError as e:
+        except ValueError as e:
             self.result_label.setText(self.custom_html.format(str(e)))
-        except IndexError:
+
+    def on_rates_refreshed(self, pair: tuple[str, str], amount: Decimal):
+        """Shows the result of one waiter once the rates of its base are loaded; an unknown target fails only it."""
+        if (result := self.engine.peek(amount, *pair)) is None:
+            self.show_conversion_error(pair, KeyError(pair[1]))
+        else:
+            self.show_conversion_result(pair, result)
+
+    def on_rates_changed(self, base: str, _snapshot_date: str | None, changed: dict):
+        pair = self._active_pair
+        if pair is not None and self.refresher.affects(base, changed, *pair):
+            if (result := self.engine.peek(self._active_amount, *pair)) is not None:
+                self.show_conversion_result(pair, result)
+
+    def show_conversion_result(self, pair: tuple[str, str], result: Decimal):
+        # ძველი წყვილის შედეგი აღარ გამოჩნდება, თუ მომხმარებელმა უკვე სხვა კონვერტაცია მოითხოვა
+        if pair != self._active_pair:
+            return
+
+        self.result_label.setText(self.custom_html.format(
+            f"კონვერტირებული თანხა: {result:,f} {pair[1].upper()}")
+        )
+
+    def show_conversion_error(self, pair: tuple[str, str], error: Exception):
+        if pair != self._active_pair:
+            return
+
+        if isinstance(error, requests.RequestException):
+            self.result_label.setText(self.custom_html.format("დაფიქსირდა შეცდომა"))
+        elif isinstance(error, (IndexError, KeyError)):
             self.result_label.setText(self.custom_html.format('კონვერტირება ვერ მოხერხდა'))
-        except ValueError:
-            self.result_label.setText(self.custom_html.format("გთხოვთ, შეიყვანოთ ვალიდური თანხა"))
+        else:
+            # slot-იდან გასული შეცდომა PyQt5-ში მთელ აპლიკაციას აჩერებს (qFatal)
+            logger.error("conversion %s -> %s failed", *pair, exc_info=error)
+            self.result_label.setText(self.custom_html.format("დაფიქსირდა შეცდომა"))
 
     def clear_fields(self):
         self.amount_entry.clear()
@@ -214,43 +360,114 @@ class CurrencyConverter(QWidget):
 
 
 class MainWindow(QMainWindow):
+    # ღია ფანჯარაც ამოწმებს, ხომ არ გაუვიდა სესიას ვადა ან ხომ არ გაუქმდა (set-password)
+    SESSION_CHECK_INTERVAL_MS = 60_000
+
     def __init__(self):
         super().__init__()
-        uic.loadUi('ui/main.ui', self)
+        setup_ui(self, 'main')
         self.stacked_widget: QStackedWidget = self.findChild(QStackedWidget, 'stacked_widget')
 
         self.log_out = self.findChild(QPushButton, 'logout')
         self.log_out.clicked.connect(self.clear_user_login_cache)
 
-        self.login_page: QWidget = LoginWindow(self.show_currency_converter)
-        self.currency_converter_page: QWidget = CurrencyConverter()
+        self.sessions = SessionStore()
+        self.login_page: QWidget = LoginWindow(self.show_currency_converter, self.sessions)
+        # კონვერტორის გვერდი (კატალოგი, კურსები, refresher) მხოლოდ პირველ გახსნაზე იქმნება
+        self.currency_converter_page: CurrencyConverter | None = None
 
         self.stacked_widget.addWidget(self.login_page)
-        self.stacked_widget.addWidget(self.currency_converter_page)
 
-        if os.path.exists(CACHE_FILE):
+        self.session_timer = QTimer(self)
+        self.session_timer.setInterval(self.SESSION_CHECK_INTERVAL_MS)
+        self.session_timer.timeout.connect(self.ensure_session)
+
+        if (token := read_token()) is not None and self.sessions.validate(token) is not None:
             self.show_currency_converter()
         else:
             self.show_login_page()
 
     def show_login_page(self):
+        self.session_timer.stop()
         self.stacked_widget.setCurrentWidget(self.login_page)
         self.log_out.hide()
 
     def show_currency_converter(self):
+        if self.currency_converter_page is None:
+            self.currency_converter_page = CurrencyConverter(self.ensure_session)
+            self.stacked_widget.addWidget(self.currency_converter_page)
+
         self.stacked_widget.setCurrentWidget(self.currency_converter_page)
         self.log_out.show()
+        self.session_timer.start()
+
+    def ensure_session(self) -> bool:
+        """Whether the saved session is still valid; if not, returns to the login page."""
+        if (token := read_token()) is not None and self.sessions.validate(token) is not None:
+            return True
+
+        remove_token()
+        if self.stacked_widget.currentWidget() is not self.login_page:
+            self.show_login_page()
+            QMessageBox.information(self, 'სესია', 'სესიას ვადა გაუვიდა, გთხოვთ, თავიდან შეხვიდეთ')
+        return False
 
     def clear_user_login_cache(self):
-        if os.path.exists(CACHE_FILE):
-            os.remove(CACHE_FILE)
+        if (token := read_token()) is not None:
+            self.sessions.logout(token)
+            remove_token()
 
         self.show_login_page()
 
 
+class StartupProfiler(QObject):
+    """Prints how long startup took until the first paint of a window, then quits (--startup-profile)."""
+
+    def __init__(self, started_at: float):
+        super().__init__()
+        self.started_at = started_at
+        self.marks: list[tuple[str, float]] = []
+
+    def mark(self, name: str):
+        self.marks.append((name, time.perf_counter()))
+
+    def watch(self, window: QWidget):
+        window.installEventFilter(self)
+
+    def eventFilter(self, source, event):
+        if event.type() == QEvent.Paint:
+            source.removeEventFilter(self)
+            self.mark('first paint')
+            QTimer.singleShot(0, self.report)
+        return False
+
+    def report(self):
+        previous = self.started_at
+        for name, at in self.marks:
+            print(f"{name:<12} {(at - self.started_at) * 1000:8.1f} ms  (+{(at - previous) * 1000:.1f} ms)",
+                  file=sys.stderr)
+            previous = at
+        QApplication.instance().quit()
+
+
 if __name__ == "__main__":
-    import sys
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="Currency converter")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print the time to first paint (per startup phase) and exit")
+    args, qt_args = parser.parse_known_args()
+
+    profiler = StartupProfiler(STARTED_AT) if args.startup_profile else None
+    if profiler:
+        profiler.mark('imports')
+
+    app = QApplication(sys.argv[:1] + qt_args)
     window = MainWindow()
+    if profiler:
+        profiler.mark('main window')
+        profiler.watch(window)
+
     window.show()
+    if profiler:
+        profiler.mark('shown')
+
     sys.exit(app.exec_())
@@ -0,0 +1,222 @@
+"""
+Operators and login sessions of the Qt converter.
+
+There is no built-in account. On the first run, while no operator exists, the login
+window offers to create the first operator from the name and password typed into it.
+Operators can also be added, or their passwords changed, from the command line:
+
+    python sessions.py set-password <username>
+"""
+import argparse
+import getpass
+import hashlib
+import hmac
+import os
+import secrets
+import sqlite3
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# ოპერატორები და სესიები ერთ SQLite ფაილშია, ყველა პროცესისთვის საერთო
+SESSION_DB_PATH = os.path.join(BASE_DIR, 'data', 'sessions.sqlite3')
+# ამ OS მომხმარებლის ბოლო სესიის ტოკენი (ძველი cache.txt-ის ნაცვლად); კიოსკზე ყოველ
+# ოპერატორის სესიას CURRENCY_SESSION_FILE-ით საკუთარი ფაილი შეიძლება მიეცეს
+SESSION_TOKEN_PATH = os.environ.get(
+    'CURRENCY_SESSION_FILE', os.path.join(os.path.expanduser('~'), '.currency_converter', 'session')
+)
+
+SESSION_TTL_SECONDS = 8 * 3600
+PASSWORD_HASH_ITERATIONS = 200_000
+
+
+def hash_password(password: str, salt: bytes, iterations: int = PASSWORD_HASH_ITERATIONS) -> bytes:
+    return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+
+
+def hash_token(token: str) -> bytes:
+    # ბაზაში მხოლოდ ტოკენის ჰეში ინახება, ფაილის წამკითხველი სხვის სესიას ვერ აიღებს
+    return hashlib.sha256(token.encode('utf-8')).digest()
+
+
+class SessionStore:
+    """
+    Operators with salted PBKDF2 password hashes and their login sessions.
+
+    Sessions are keyed by the SHA-256 of a random token, so validating a token is a
+    single primary-key lookup. SQLite in WAL mode with immediate transactions keeps
+    concurrent converter processes on one host consistent.
+    """
+
+    def __init__(self, db_path: str = SESSION_DB_PATH, ttl_seconds: int = SESSION_TTL_SECONDS):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.__lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS users (
+                username TEXT PRIMARY KEY,
+                password_hash BLOB NOT NULL,
+                salt BLOB NOT NULL,
+                iterations INTEGER NOT NULL
+            )
+        ''')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS sessions (
+                token_hash BLOB PRIMARY KEY,
+                username TEXT NOT NULL REFERENCES users (username) ON DELETE CASCADE,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        ''')
+        self.conn.execute("CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS sessions_username ON sessions (username)")
+
+        self.purge_expired()
+
+    def has_operators(self) -> bool:
+        with self.__lock:
+            return self.conn.execute("SELECT 1 FROM users LIMIT 1").fetchone() is not None
+
+    def create_first_operator(self, username: str, password: str) -> bool:
+        """
+        Adds `username` only if there is no operator yet, so two windows on a fresh
+        install can not both create one. Returns whether it was added.
+        """
+        salt = secrets.token_bytes(16)
+        password_hash = hash_password(password, salt)
+
+        with self.__lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                created = self.conn.execute("SELECT 1 FROM users LIMIT 1").fetchone() is None
+                if created:
+                    self.conn.execute(
+                        "INSERT INTO users (username, password_hash, salt, iterations) VALUES (?, ?, ?, ?)",
+                        (username, password_hash, salt, PASSWORD_HASH_ITERATIONS)
+                    )
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+        return created
+
+    def set_password(self, username: str, password: str) -> None:
+        """Adds the operator or replaces their password; their existing sessions are revoked."""
+        salt = secrets.token_bytes(16)
+        password_hash = hash_password(password, salt)
+
+        with self.__lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute('''
+                    INSERT INTO users (username, password_hash, salt, iterations) VALUES (?, ?, ?, ?)
+                    ON CONFLICT (username) DO UPDATE SET
+                        password_hash = excluded.password_hash, salt = excluded.salt, iterations = excluded.iterations
+                ''', (username, password_hash, salt, PASSWORD_HASH_ITERATIONS))
+                self.conn.execute("DELETE FROM sessions WHERE username = ?", (username,))
+            except BaseException:
+                # ღია ტრანზაქცია ბაზას სხვა პროცესებისთვის დაბლოკავდა
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def verify_password(self, username: str, password: str) -> bool:
+        with self.__lock:
+            row = self.conn.execute(
+                "SELECT password_hash, salt, iterations FROM users WHERE username = ?", (username,)
+            ).fetchone()
+
+        if row is None:
+            # უცნობ მომხმარებელზეც იგივე დრო იხარჯება, რომ სახელები პასუხის დროით არ გამოჩნდეს
+            hash_password(password, b'\0' * 16)
+            return False
+
+        password_hash, salt, iterations = row
+        return hmac.compare_digest(hash_password(password, salt, iterations), password_hash)
+
+    def login(self, username: str, password: str) -> str | None:
+        """Returns a new session token, or None if the credentials are wrong."""
+        if not self.verify_password(username, password):
+            return None
+
+        token = secrets.token_urlsafe(32)
+        now = time.time()
+        with self.__lock:
+            self.conn.execute(
+                "INSERT INTO sessions (token_hash, username, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                (hash_token(token), username, now, now + self.ttl_seconds)
+            )
+        return token
+
+    def validate(self, token: str) -> str | None:
+        """Returns the username of a live session, or None if the token is unknown or expired."""
+        with self.__lock:
+            row = self.conn.execute(
+                "SELECT username FROM sessions WHERE token_hash = ? AND expires_at > ?",
+                (hash_token(token), time.time())
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def logout(self, token: str) -> None:
+        with self.__lock:
+            self.conn.execute("DELETE FROM sessions WHERE token_hash = ?", (hash_token(token),))
+
+    def purge_expired(self) -> int:
+        with self.__lock:
+            return self.conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def close(self) -> None:
+        with self.__lock:
+            self.conn.close()
+
+
+def read_token(path: str = SESSION_TOKEN_PATH) -> str | None:
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return file.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def write_token(token: str, path: str = SESSION_TOKEN_PATH) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # ტოკენი მხოლოდ ფაილის მფლობელისთვის იკითხება
+    fd = os.open(path + '.tmp', os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as file:
+        file.write(token)
+    os.replace(path + '.tmp', path)
+
+
+def remove_token(path: str = SESSION_TOKEN_PATH) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manages the converter's operators.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('set-password', help="adds an operator or changes their password").add_argument('username')
+    subparsers.add_parser('purge', help="removes expired sessions")
+    args = parser.parse_args()
+
+    store = SessionStore()
+    if args.command == 'set-password':
+        password = getpass.getpass("პაროლი: ")
+        if password != getpass.getpass("გაიმეორეთ პაროლი: "):
+            raise SystemExit("პაროლები არ ემთხვევა")
+        store.set_password(args.username, password)
+    else:
+        print(f"removed {store.purge_expired()} expired sessions")
+    store.close()
+
+
+if __name__ == '__main__':
+    main()
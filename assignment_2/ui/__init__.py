@@ -0,0 +1,33 @@
+import hashlib
+import importlib
+import os
+
+from PyQt5.QtWidgets import QWidget
+
+UI_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def source_hash(name: str) -> str:
+    with open(os.path.join(UI_DIR, f'{name}.ui'), 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def setup_ui(widget: QWidget, name: str) -> None:
+    """
+    Builds ui/`name`.ui into `widget`, like uic.loadUi(path, widget).
+
+    The precompiled ui/`name`_ui.py (see ui/compile.py) is used when it was generated
+    from the current .ui file, so startup does not parse XML; an edited .ui file
+    without a recompiled module still loads, just through uic.
+    """
+    try:
+        module = importlib.import_module(f'{__name__}.{name}_ui')
+    except ImportError:
+        module = None
+
+    if module is not None and module.UI_SOURCE_HASH == source_hash(name):
+        module.Ui_Form().setupUi(widget)
+        return
+
+    from PyQt5 import uic
+    uic.loadUi(os.path.join(UI_DIR, f'{name}.ui'), widget)
@@ -0,0 +1,39 @@
+"""
+Precompiles every ui/*.ui file into ui/<name>_ui.py, so startup does not parse XML.
+
+    python -m ui.compile
+
+Rerun after editing a .ui file; until then setup_ui falls back to uic.loadUi for it.
+"""
+import glob
+import io
+import os
+import re
+
+from PyQt5 import uic
+
+from . import UI_DIR, source_hash
+
+
+def compile_ui(name: str) -> str:
+    source = io.StringIO()
+    uic.compileUi(os.path.join(UI_DIR, f'{name}.ui'), source)
+
+    # <class> შეიძლება ჰქონდეს ნებისმიერი სახელი (სივრცითაც), setup_ui კი ერთ სახელს ელის
+    code = re.sub(r'^class Ui_.*\(object\):$', 'class Ui_Form(object):', source.getvalue(), count=1, flags=re.M)
+    code = code.replace(f"'{os.path.join(UI_DIR, name)}.ui'", f"'ui/{name}.ui'")
+
+    path = os.path.join(UI_DIR, f'{name}_ui.py')
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(code)
+        file.write(f"\n\nUI_SOURCE_HASH = '{source_hash(name)}'\n")
+    return path
+
+
+def main() -> None:
+    for ui_path in sorted(glob.glob(os.path.join(UI_DIR, '*.ui'))):
+        print(compile_ui(os.path.splitext(os.path.basename(ui_path))[0]))
+
+
+if __name__ == '__main__':
+    main()
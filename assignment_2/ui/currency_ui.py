@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'ui/currency.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Form(object):
+    def setupUi(self, Form):
+        Form.setObjectName("Form")
+        Form.resize(960, 570)
+        Form.setMinimumSize(QtCore.QSize(960, 570))
+        Form.setMaximumSize(QtCore.QSize(960, 570))
+        self.verticalLayoutWidget = QtWidgets.QWidget(Form)
+        self.verticalLayoutWidget.setGeometry(QtCore.QRect(0, 0, 961, 571))
+        self.verticalLayoutWidget.setObjectName("verticalLayoutWidget")
+        self.verticalLayout_2 = QtWidgets.QVBoxLayout(self.verticalLayoutWidget)
+        self.verticalLayout_2.setContentsMargins(0, 0, 0, 0)
+        self.verticalLayout_2.setObjectName("verticalLayout_2")
+        self.horizontalLayout_6 = QtWidgets.QHBoxLayout()
+        self.horizontalLayout_6.setObjectName("horizontalLayout_6")
+        self.label_2 = QtWidgets.QLabel(self.verticalLayoutWidget)
+        self.label_2.setObjectName("label_2")
+        self.horizontalLayout_6.addWidget(self.label_2)
+        self.verticalLayout_2.addLayout(self.horizontalLayout_6)
+        self.gridLayout_2 = QtWidgets.QGridLayout()
+        self.gridLayout_2.setObjectName("gridLayout_2")
+        self.label_3 = QtWidgets.QLabel(self.verticalLayoutWidget)
+        self.label_3.setObjectName("label_3")
+        self.gridLayout_2.addWidget(self.label_3, 2, 0, 1, 1)
+        self.label_6 = QtWidgets.QLabel(self.verticalLayoutWidget)
+        self.label_6.setObjectName("label_6")
+        self.gridLayout_2.addWidget(self.label_6, 4, 0, 1, 1)
+        self.to_currency_dropdown = QtWidgets.QComboBox(self.verticalLayoutWidget)
+        self.to_currency_dropdown.setEditable(True)
+        self.to_currency_dropdown.setObjectName("to_currency_dropdown")
+        self.gridLayout_2.addWidget(self.to_currency_dropdown, 4, 1, 1, 1)
+        self.to_currency_validation_label = QtWidgets.QLabel(self.verticalLayoutWidget)
+        self.to_currency_validation_label.setMinimumSize(QtCore.QSize(150, 0))
+        self.to_currency_validation_label.setMaximumSize(QtCore.QSize(150, 16777215))
+        self.to_currency_validation_label.setObjectName("to_currency_validation_label")
+        self.gridLayout_2.addWidget(self.to_currency_validation_label, 4, 2, 1, 1)
+        self.from_currency_validation_label = QtWidgets.QLabel(self.verticalLayoutWidget)
+        self.from_currency_validation_label.setMinimumSize(QtCore.QSize(150, 0))
+        self.from_currency_validation_label.setMaximumSize(QtCore.QSize(150, 16777215))
+        self.from_currency_validation_label.setObjectName("from_currency_validation_label")
+        self.gridLayout_2.addWidget(self.from_currency_validation_label, 2, 2, 1, 1)
+        self.amount_entry = QtWidgets.QLineEdit(self.verticalLayoutWidget)
+        self.amount_entry.setObjectName("amount_entry")
+        self.gridLayout_2.addWidget(self.amount_entry, 0, 1, 1, 1)
+        self.from_currency_dropdown = QtWidgets.QComboBox(self.verticalLayoutWidget)
+        self.from_currency_dropdown.setEditable(True)
+        self.from_currency_dropdown.setObjectName("from_currency_dropdown")
+        self.gridLayout_2.addWidget(self.from_currency_dropdown, 2, 1, 1, 1)
+        self.label_5 = QtWidgets.QLabel(self.verticalLayoutWidget)
+        self.label_5.setObjectName("label_5")
+        self.gridLayout_2.addWidget(self.label_5, 0, 0, 1, 1)
+        spacerItem = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
+        self.gridLayout_2.addItem(spacerItem, 1, 1, 1, 1)
+        spacerItem1 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
+        self.gridLayout_2.addItem(spacerItem1, 3, 1, 1, 1)
+        spacerItem2 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
+        self.gridLayout_2.addItem(spacerItem2, 5, 1, 1, 1)
+        self.verticalLayout_2.addLayout(self.gridLayout_2)
+        self.convert_button = QtWidgets.QPushButton(self.verticalLayoutWidget)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.convert_button.setFont(font)
+        self.convert_button.setObjectName("convert_button")
+        self.verticalLayout_2.addWidget(self.convert_button)
+        self.result_label = QtWidgets.QLabel(self.verticalLayoutWidget)
+        self.result_label.setObjectName("result_label")
+        self.verticalLayout_2.addWidget(self.result_label)
+        self.clear_button = QtWidgets.QPushButton(self.verticalLayoutWidget)
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.clear_button.setFont(font)
+        self.clear_button.setObjectName("clear_button")
+        self.verticalLayout_2.addWidget(self.clear_button)
+
+        self.retranslateUi(Form)
+        QtCore.QMetaObject.connectSlotsByName(Form)
+        Form.setTabOrder(self.amount_entry, self.from_currency_dropdown)
+        Form.setTabOrder(self.from_currency_dropdown, self.to_currency_dropdown)
+        Form.setTabOrder(self.to_currency_dropdown, self.convert_button)
+        Form.setTabOrder(self.convert_button, self.clear_button)
+
+    def retranslateUi(self, Form):
+        _translate = QtCore.QCoreApplication.translate
+        Form.setWindowTitle(_translate("Form", "Form"))
+        self.label_2.setText(_translate("Form", "<html><head/><body><p align=\"center\"><span style=\" font-size:18pt; font-weight:600;\">Currency Convertor</span></p></body></html>"))
+        self.label_3.setText(_translate("Form", "<html><head/><body><p align=\"center\"><span style=\" font-size:9pt; font-weight:600;\">საბაზისო ვალუტა</span></p></body></html>"))
+        self.label_6.setText(_translate("Form", "<html><head/><body><p align=\"center\"><span style=\" font-size:9pt; font-weight:600;\">კონვერტაციის ვალუტა</span></p></body></html>"))
+        self.to_currency_validation_label.setText(_translate("Form", "<html><head/><body><p align=\"center\"><br/></p></body></html>"))
+        self.from_currency_validation_label.setText(_translate("Form", "<html><head/><body><p align=\"center\"><br/></p></body></html>"))
+        self.label_5.setText(_translate("Form", "<html><head/><body><p align=\"center\"><span style=\" font-size:9pt; font-weight:600;\">თანხა</span></p></body></html>"))
+        self.convert_button.setText(_translate("Form", "კონვერტაცია"))
+        self.result_label.setText(_translate("Form", "<html><head/><body><p><span style=\" font-size:12pt; font-weight:600;\">კონვერტირებული თანხა:</span></p></body></html>"))
+        self.clear_button.setText(_translate("Form", "გასუფთავება"))
+
+
+UI_SOURCE_HASH = 'd3ee84e8e947a8b94a736fe71e5fc5d9578bf8c48fc27e3b0f8e3ce314a77bf9'
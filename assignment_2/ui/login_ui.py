@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'ui/login.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Form(object):
+    def setupUi(self, Form):
+        Form.setObjectName("Form")
+        Form.resize(950, 560)
+        self.gridLayoutWidget = QtWidgets.QWidget(Form)
+        self.gridLayoutWidget.setGeometry(QtCore.QRect(0, 0, 951, 561))
+        self.gridLayoutWidget.setObjectName("gridLayoutWidget")
+        self.gridLayout = QtWidgets.QGridLayout(self.gridLayoutWidget)
+        self.gridLayout.setContentsMargins(20, 20, 20, 20)
+        self.gridLayout.setObjectName("gridLayout")
+        self.login_button = QtWidgets.QPushButton(self.gridLayoutWidget)
+        self.login_button.setMinimumSize(QtCore.QSize(200, 40))
+        self.login_button.setMaximumSize(QtCore.QSize(300, 40))
+        font = QtGui.QFont()
+        font.setPointSize(10)
+        font.setBold(True)
+        font.setWeight(75)
+        self.login_button.setFont(font)
+        self.login_button.setObjectName("login_button")
+        self.gridLayout.addWidget(self.login_button, 3, 0, 1, 1, QtCore.Qt.AlignHCenter)
+        spacerItem = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Minimum)
+        self.gridLayout.addItem(spacerItem, 1, 0, 1, 1)
+        self.title = QtWidgets.QLabel(self.gridLayoutWidget)
+        self.title.setMinimumSize(QtCore.QSize(200, 50))
+        self.title.setMaximumSize(QtCore.QSize(200, 50))
+        self.title.setObjectName("title")
+        self.gridLayout.addWidget(self.title, 0, 0, 1, 1, QtCore.Qt.AlignHCenter)
+        self.gridLayout_2 = QtWidgets.QGridLayout()
+        self.gridLayout_2.setContentsMargins(-1, -1, 50, -1)
+        self.gridLayout_2.setObjectName("gridLayout_2")
+        self.password_field = QtWidgets.QLineEdit(self.gridLayoutWidget)
+        self.password_field.setMinimumSize(QtCore.QSize(400, 30))
+        self.password_field.setMaximumSize(QtCore.QSize(400, 30))
+        self.password_field.setObjectName("password_field")
+        self.gridLayout_2.addWidget(self.password_field, 2, 1, 1, 1)
+        spacerItem1 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Fixed)
+        self.gridLayout_2.addItem(spacerItem1, 1, 1, 1, 1)
+        self.login_label = QtWidgets.QLabel(self.gridLayoutWidget)
+        self.login_label.setMinimumSize(QtCore.QSize(50, 20))
+        self.login_label.setMaximumSize(QtCore.QSize(50, 20))
+        font = QtGui.QFont()
+        font.setPointSize(9)
+        font.setBold(True)
+        font.setWeight(75)
+        self.login_label.setFont(font)
+        self.login_label.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self.login_label.setObjectName("login_label")
+        self.gridLayout_2.addWidget(self.login_label, 0, 0, 1, 1, QtCore.Qt.AlignHCenter)
+        self.login_field = QtWidgets.QLineEdit(self.gridLayoutWidget)
+        self.login_field.setMinimumSize(QtCore.QSize(400, 30))
+        self.login_field.setMaximumSize(QtCore.QSize(400, 30))
+        font = QtGui.QFont()
+        font.setKerning(True)
+        font.setStyleStrategy(QtGui.QFont.PreferAntialias)
+        self.login_field.setFont(font)
+        self.login_field.setObjectName("login_field")
+        self.gridLayout_2.addWidget(self.login_field, 0, 1, 1, 1, QtCore.Qt.AlignHCenter|QtCore.Qt.AlignVCenter)
+        self.password_label = QtWidgets.QLabel(self.gridLayoutWidget)
+        self.password_label.setMinimumSize(QtCore.QSize(80, 20))
+        self.password_label.setMaximumSize(QtCore.QSize(80, 20))
+        font = QtGui.QFont()
+        font.setPointSize(9)
+        font.setBold(True)
+        font.setWeight(75)
+        self.password_label.setFont(font)
+        self.password_label.setObjectName("password_label")
+        self.gridLayout_2.addWidget(self.password_label, 2, 0, 1, 1)
+        self.gridLayout.addLayout(self.gridLayout_2, 2, 0, 1, 1)
+        spacerItem2 = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Minimum)
+        self.gridLayout.addItem(spacerItem2, 4, 0, 1, 1)
+
+        self.retranslateUi(Form)
+        QtCore.QMetaObject.connectSlotsByName(Form)
+        Form.setTabOrder(self.login_field, self.password_field)
+        Form.setTabOrder(self.password_field, self.login_button)
+
+    def retranslateUi(self, Form):
+        _translate = QtCore.QCoreApplication.translate
+        Form.setWindowTitle(_translate("Form", "Form"))
+        self.login_button.setText(_translate("Form", "შესვლა"))
+        self.title.setText(_translate("Form", "<html><head/><body><p align=\"center\"><span style=\" font-size:18pt; font-weight:600;\">Login Page</span></p></body></html>"))
+        self.login_label.setText(_translate("Form", "Login"))
+        self.password_label.setText(_translate("Form", "Password"))
+
+
+UI_SOURCE_HASH = '5cbadf20b2ff12b899c3edd4401fb8811892d6b4d3ce3ea0b858b453a1087f76'
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'ui/main.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Form(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.setGeometry(QtCore.QRect(0, 0, 1000, 700))
+        MainWindow.setMinimumSize(QtCore.QSize(1000, 700))
+        MainWindow.setMaximumSize(QtCore.QSize(1000, 700))
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.stacked_widget = QtWidgets.QStackedWidget(self.centralwidget)
+        self.stacked_widget.setGeometry(QtCore.QRect(20, 80, 960, 570))
+        self.stacked_widget.setMinimumSize(QtCore.QSize(960, 570))
+        self.stacked_widget.setMaximumSize(QtCore.QSize(960, 570))
+        self.stacked_widget.setObjectName("stacked_widget")
+        self.page = QtWidgets.QWidget()
+        self.page.setObjectName("page")
+        self.stacked_widget.addWidget(self.page)
+        self.page_2 = QtWidgets.QWidget()
+        self.page_2.setObjectName("page_2")
+        self.stacked_widget.addWidget(self.page_2)
+        self.logout = QtWidgets.QPushButton(self.centralwidget)
+        self.logout.setGeometry(QtCore.QRect(20, 10, 100, 50))
+        self.logout.setMinimumSize(QtCore.QSize(100, 50))
+        self.logout.setMaximumSize(QtCore.QSize(100, 50))
+        self.logout.setObjectName("logout")
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.menubar = QtWidgets.QMenuBar(MainWindow)
+        self.menubar.setGeometry(QtCore.QRect(0, 0, 1000, 26))
+        self.menubar.setObjectName("menubar")
+        MainWindow.setMenuBar(self.menubar)
+        self.statusbar = QtWidgets.QStatusBar(MainWindow)
+        self.statusbar.setObjectName("statusbar")
+        MainWindow.setStatusBar(self.statusbar)
+
+        self.retranslateUi(MainWindow)
+        self.stacked_widget.setCurrentIndex(1)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("Currency Converter", "MainWindow"))
+        self.logout.setText(_translate("Currency Converter", "გასვლა"))
+
+
+UI_SOURCE_HASH = '0f9994b343209bcc6eb2a82914c10d0816f97a7945c919b5623c147283505d7e'
@@ -0,0 +1,91 @@
+import logging
+from typing import Callable, Hashable
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerSignals(QObject):
+    finished = pyqtSignal(object, object)  # key, result
+    failed = pyqtSignal(object, object)  # key, exception
+
+
+class RateChangeSignals(QObject):
+    # base, snapshot_date, {code: rate}; RateRefresher-ის ნაკადიდან GUI ნაკადში queued კავშირით გადმოდის
+    changed = pyqtSignal(str, object, object)
+
+
+class FetchWorker(QRunnable):
+    """Runs one blocking call on a QThreadPool thread and reports back through signals."""
+
+    def __init__(self, key: Hashable, fn: Callable, *args):
+        super().__init__()
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(self.key, e)
+        else:
+            self.signals.finished.emit(self.key, result)
+
+
+class CoalescingFetcher(QObject):
+    """
+    Starts fetches on a QThreadPool and delivers results on the GUI thread.
+
+    While a fetch for a key is in flight, further requests for the same key do not
+    start a new one, they just wait for the same result, so the key must identify the
+    call and its arguments completely.
+
+    The callbacks run in slots, where PyQt5 aborts the application on an unhandled
+    exception: an error without `on_error`, or a callback that raises, is logged instead.
+    """
+
+    def __init__(self, pool: QThreadPool | None = None):
+        super().__init__()
+        self.pool = pool or QThreadPool.globalInstance()
+
+        # key -> [(on_done, on_error), ...]
+        self.__waiting: dict[Hashable, list[tuple[Callable, Callable | None]]] = {}
+
+    def fetch(
+            self,
+            key: Hashable,
+            fn: Callable,
+            *args,
+            on_done: Callable,
+            on_error: Callable[[Exception], None] | None = None
+    ) -> None:
+        if (callbacks := self.__waiting.get(key)) is not None:
+            callbacks.append((on_done, on_error))
+            return
+
+        self.__waiting[key] = [(on_done, on_error)]
+
+        worker = FetchWorker(key, fn, *args)
+        worker.signals.finished.connect(self._on_finished)
+        worker.signals.failed.connect(self._on_failed)
+        self.pool.start(worker)
+
+    def _on_finished(self, key, result):
+        for on_done, _ in self.__waiting.pop(key, []):
+            try:
+                on_done(result)
+            except Exception:
+                logger.exception("callback of fetch %r failed", key)
+
+    def _on_failed(self, key, error):
+        for _, on_error in self.__waiting.pop(key, []):
+            if on_error is None:
+                logger.error("fetch %r failed", key, exc_info=error)
+                continue
+            try:
+                on_error(error)
+            except Exception:
+                logger.exception("error callback of fetch %r failed", key)
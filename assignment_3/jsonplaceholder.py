@@ -1,101 +1,240 @@
+import argparse
+import itertools
+import os
+import sys
 import requests
 import json
 import time
 import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from requests.adapters import HTTPAdapter
+
+# fetch_core საერთოა ორივე fetcher-ისთვის და რეპოზიტორიის root-ში მდებარეობს
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetch_core import (  # noqa: E402
+    CACHE_FILE, JSON_ARRAY, NDJSON, POST_SCHEMA, FetchMetrics, FetchScheduler, HttpCache, ParsePool, RetryPolicy,
+    StreamingWriter, external_sort, open_checkpoint
+)
+
+API_URL = "https://jsonplaceholder.typicode.com/posts/{post_id}"
 
 
 class PostFetcher:
-    def __init__(self, post_count: int = 77):
+    def __init__(
+            self,
+            post_count: int = 77,
+            first_post_id: int = 1,
+            max_workers: int = 32,
+            output_format: str = JSON_ARRAY,
+            sort_output: bool = True,
+            api: str = API_URL,
+            resume: bool = False,
+            rate: float | None = None,
+            max_attempts: int = 5,
+            parse_processes: int = 0,
+            cache_file: str | None = None
+    ):
+        """
+        arguments:
+            post_count: how many consecutive posts to fetch, starting at `first_post_id`
+            max_workers: threads (and pooled keep-alive connections); the scheduler's
+                adaptive concurrency limit never goes above it
+            output_format: JSON_ARRAY (data.json) or NDJSON (data.ndjson), one post per line
+            sort_output: sort the output by id at the end (external merge sort)
+            api: post URL template with a {post_id} field, e.g. a local fetch_core.mock_server
+            resume: continue the run recorded in the checkpoint file instead of starting over
+            rate: at most this many requests per second, None for no limit
+            max_attempts: tries per post before it goes to the dead-letter file
+            parse_processes: decode, validate and encode the response bodies in a pool of this
+                many processes; 0 does it in the writer thread. Never in the fetch threads.
+            cache_file: SQLite HTTP cache; posts it holds are refetched conditionally and
+                an unchanged one (304) is read from it instead of downloaded. None for no cache.
+        """
         if post_count <= 0:
             raise ValueError("post_count must be greater than 0")
-        if post_count > 100:
-            print("WARNING: post_count cannot be greater than 100")
+        if max_workers <= 0:
+            raise ValueError("max_workers must be greater than 0")
 
-        self.file_lock = threading.Lock()
         self.print_lock = threading.Lock()
-        self.response_times = []
-        self.output_file = "data.json"
+        self.metrics = FetchMetrics()
+        self.API = api
+        self.output_format = output_format
+        self.output_file = "data.ndjson" if output_format == NDJSON else "data.json"
+        self.sort_output = sort_output
+        self.writer: StreamingWriter | None = None
+        # output_file-ში უკვე ჩაწერილი პოსტების bitmap (იხ. fetch_core.Checkpoint)
+        self.checkpoint_file = self.output_file + ".checkpoint"
+        self.resume = resume
         self.response_file = "response_times.json"
-        self.post_count = post_count if post_count <= 100 else 100
+        self.post_ids = range(first_post_id, first_post_id + post_count)
+        self.max_workers = max_workers
+        self.scheduler = FetchScheduler(max_workers, rate=rate, retry=RetryPolicy(max_attempts))
+        self.dead_letter_file = "dead_letters.json"
+        self.parse_processes = parse_processes
+        self.cache_file = cache_file
+        self.cache: HttpCache | None = None
+
+        # ერთი Session ყველა ნაკადისთვის: კავშირები pool-იდან მეორდება (keep-alive),
+        # ერთდროულად max_workers-ზე მეტი socket არ იხსნება
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
     def fetch_post(self, post_id):
-        url = f"https://jsonplaceholder.typicode.com/posts/{post_id}"
-
-        # Start time of request
-        start_time = time.time()
+        url = self.API.format(post_id=post_id)
 
         with self.print_lock:
             print('Sending request to', post_id)
 
-        response = requests.get(url)
-
-        end_time = time.time()
-        duration = end_time - start_time
-
-        if response.status_code != 200:
-            print("Error fetching post", post_id)
-            return None
-
-        post_data = response.json()
-
-        with self.file_lock:
-            self.response_times.append((post_id, duration))
+        # 304-ზე, რომლის სხეულიც ქეშში აღარ არის, ერთხელ პირობითი header-ების გარეშე ვცდით
+        revalidate = self.cache is not None
+        for attempt in itertools.count():
+            # სლოტის აღებამდე, რომ აქ გავარდნილმა შეცდომამ სლოტი არ დაკარგოს
+            conditional = self.cache.conditional_headers(url) if revalidate else {}
+            self.scheduler.acquire()
+
+            # requests DNS-ს და connect-ს ცალკე არ აჩვენებს: stream=True-თ get() header-ებზე
+            # ბრუნდება (ttfb, ახალ კავშირზე connect-ის ჩათვლით), სხეული კი ცალკე იკითხება
+            status = retry_after = None
+            start_time = time.perf_counter()
+            try:
+                with self.session.get(url, headers=conditional, stream=True, timeout=30) as response:
+                    headers_time = time.perf_counter()
+                    status = response.status_code
+                    if status == 200:
+                        content = response.content
+                    elif status != 304:
+                        retry_after = response.headers.get("Retry-After")
+            except requests.RequestException:
+                status = None
+            end_time = time.perf_counter()
+            self.scheduler.release(status, end_time - start_time)
+
+            if status == 200:
+                if self.cache is not None:
+                    self.cache.store(url, response.headers, content)
+                break
+            # 304: პოსტი არ შეცვლილა, სხეული ქეშიდან იკითხება
+            if status == 304:
+                if (content := self.cache.not_modified(url)) is not None:
+                    break
+                if revalidate:
+                    revalidate = False
+                    continue
+
+            # retry სლოტის გარეშე ელოდება, ამ დროს სხვა მოთხოვნებს შეუძლიათ გაგზავნა
+            delay = self.scheduler.retry_delay(post_id, attempt, status, retry_after)
+            if delay is None:
+                self.metrics.record_error()
+                with self.print_lock:
+                    print("Error fetching post", post_id)
+                return None
+            time.sleep(delay)
+
+        self.metrics.record(post_id, {
+            'ttfb': headers_time - start_time,
+            'body': end_time - headers_time,
+            'total': end_time - start_time,
+        })
+
+        # პარსინგს და ჩაწერას ცალკე ნაკადი (ან პროცესები) აკეთებს, fetch-ის ნაკადი მხოლოდ რიგში დებს
+        self.writer.write(content, post_id)
 
+        with self.print_lock:
             print("Got post data:", post_id)
-            with open(self.output_file, "r+", encoding="utf-8") as file:
-                try:
-                    current_data = json.load(file)
-                except json.JSONDecodeError:
-                    current_data = []
-
-                current_data.append(post_data)
-
-                file.seek(0)
-                json.dump(current_data, file, ensure_ascii=False, indent=4)
-                file.truncate()
 
     def main(self):
-        start_time = time.time()
-
-        with open(self.output_file, "w", encoding="utf-8") as file:
-            json.dump([], file)
-
-        threads = []
-
-        for post_id in range(1, self.post_count+1):
-            thread = threading.Thread(target=self.fetch_post, args=(post_id,))
-            threads.append(thread)
-            thread.start()
-
-        for thread in threads:
-            thread.join()
-
-        end_time = time.time()
-        elapsed_time = end_time - start_time
-
-        fastest_response = min(self.response_times, key=lambda x: x[1])
-        slowest_response = max(self.response_times, key=lambda x: x[1])
-
-        print(f"Fetching all posts took {elapsed_time:.2f} seconds.")
-        print(f"Fastest response: Post ID {fastest_response[0]} took {fastest_response[1]:.2f} seconds.")
-        print(f"Slowest response: Post ID {slowest_response[0]} took {slowest_response[1]:.2f} seconds.")
+        self.metrics.start()
+
+        checkpoint, resumed = open_checkpoint(self.checkpoint_file, self.post_ids, self.output_format, self.resume)
+        post_ids = checkpoint.pending() if resumed else self.post_ids
+        if resumed:
+            print(f"Resuming: {checkpoint.done} of {checkpoint.count} posts are already fetched")
+
+        self.cache = HttpCache(self.cache_file) if self.cache_file else None
+        parse_pool = ParsePool(self.parse_processes) if self.parse_processes else None
+        self.writer = StreamingWriter(self.output_file, self.output_format, checkpoint=checkpoint, resume=resumed,
+                                      schema=POST_SCHEMA, parse_pool=parse_pool)
+        self.writer.start()
+
+        # შეცდომის შემთხვევაშიც ყველაფერი იხურება: output სრულდება და checkpoint ინახება
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="fetch") as executor:
+                # რიგში max_workers * 2-ზე მეტი დავალება არ დგას, ასე რომ ათიათასობით პოსტიც
+                # მეხსიერებაში მხოლოდ მიმდინარე ფანჯრის ზომას იკავებს
+                in_flight = set()
+                try:
+                    for post_id in post_ids:
+                        if len(in_flight) >= self.max_workers * 2:
+                            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                future.result()
+                        in_flight.add(executor.submit(self.fetch_post, post_id))
+
+                    for future in wait(in_flight).done:
+                        future.result()
+                except BaseException:
+                    # რიგში დარჩენილი დავალებები აღარ იწყება
+                    for future in in_flight:
+                        future.cancel()
+                    raise
+        finally:
+            self.session.close()
+            try:
+                self.writer.close()
+            finally:
+                if parse_pool is not None:
+                    parse_pool.close()
+                if self.cache is not None:
+                    self.cache.close()
+
+        self.metrics.stop()
+        # სხეული, რომელიც პოსტი არ აღმოჩნდა, dead letter-ია ისევე, როგორც ჩავარდნილი რექუესტი
+        for post_id, error in self.writer.rejected:
+            self.scheduler.reject(post_id, error)
+        if self.writer.rejected:
+            print(f"{len(self.writer.rejected)} responses were not valid posts, e.g.: {self.writer.rejected[0][1]}")
+        print(self.metrics.report())
+        print(self.scheduler.report())
+        if self.cache is not None:
+            print(self.cache.report())
 
         with open(self.response_file, "w", encoding="utf-8") as file:
             json.dump({
-                "total_time": elapsed_time,
-                "fastest_response": fastest_response,
-                "slowest_response": slowest_response,
-                "response_times": dict(self.response_times)  # Convert list to dict for JSON serialization
+                **self.metrics.summary(),
+                "scheduler": self.scheduler.summary(),
+                "cache": self.cache.summary() if self.cache is not None else None,
             }, file, ensure_ascii=False, indent=4)
+        with open(self.dead_letter_file, "w", encoding="utf-8") as file:
+            json.dump(self.scheduler.dead_letters, file, indent=4)
 
-        # sorting response output_file
-        with open(self.output_file, "r", encoding="utf-8") as file:
-            data = json.load(file)
-
-        with open(self.output_file, "w", encoding="utf-8") as file:
-            json.dump(sorted(data, key=lambda item: item['id']), file, ensure_ascii=False, indent=4)
+        # sorting response output_file (ზომა არ იცვლება, checkpoint-ის offset სწორი რჩება)
+        if self.sort_output:
+            external_sort(self.output_file, self.output_format)
 
 
 if __name__ == "__main__":
-    fetcher = PostFetcher()
+    parser = argparse.ArgumentParser(description="Fetches posts from JSONPlaceholder in a bounded thread pool.")
+    parser.add_argument("--count", type=int, default=77, help="number of posts to fetch")
+    parser.add_argument("--first-id", type=int, default=1, help="id of the first post")
+    parser.add_argument("--workers", type=int, default=32, help="maximum concurrent requests")
+    parser.add_argument("--format", choices=(JSON_ARRAY, NDJSON), default=JSON_ARRAY, help="output format")
+    parser.add_argument("--no-sort", action="store_true", help="keep the posts in arrival order")
+    parser.add_argument("--api", default=API_URL, help="post URL template with a {post_id} field")
+    parser.add_argument("--resume", action="store_true", help="skip the posts the last run already saved")
+    parser.add_argument("--rate", type=float, default=None, help="maximum requests per second")
+    parser.add_argument("--attempts", type=int, default=5, help="tries per post before giving up")
+    parser.add_argument("--parse-processes", type=int, default=0,
+                        help="processes that decode and encode the responses (0: the writer thread)")
+    parser.add_argument("--cache", nargs='?', const=CACHE_FILE, default=None, metavar="FILE",
+                        help=f"refetch conditionally through an HTTP cache (default file: {CACHE_FILE})")
+    args = parser.parse_args()
+
+    fetcher = PostFetcher(
+        args.count, args.first_id, args.workers, args.format, not args.no_sort, args.api, args.resume, args.rate,
+        args.attempts, args.parse_processes, args.cache
+    )
     fetcher.main()
@@ -1,90 +1,222 @@
+import argparse
+import itertools
+import os
+import sys
 import aiohttp
 import asyncio
 import json
 import time
 import aiofiles
 
+# fetch_core საერთოა ორივე fetcher-ისთვის და რეპოზიტორიის root-ში მდებარეობს
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetch_core import (  # noqa: E402
+    CACHE_FILE, JSON_ARRAY, NDJSON, POST_SCHEMA, AsyncBatchWriter, FetchMetrics, FetchScheduler, HttpCache, ParsePool,
+    RetryPolicy, aiohttp_trace_config, open_checkpoint, trace_phases
+)
+
+API_URL = "https://jsonplaceholder.typicode.com/posts/{post_id}"
+
 
 class PostFetcher:
-    def __init__(self, post_count: int = 77):
+    def __init__(self, post_count: int = 77, first_post_id: int = 1, concurrency: int = 100,
+                 limit_per_host: int = 100, output_format: str = JSON_ARRAY, api: str = API_URL,
+                 resume: bool = False, rate: float | None = None, max_attempts: int = 5,
+                 parse_processes: int = 0, cache_file: str | None = None):
+        """
+        arguments:
+            post_count: how many consecutive posts to fetch, starting at `first_post_id`
+            concurrency: the most requests in flight at once; the scheduler adapts its limit
+                below it. Also the connector's total limit.
+            limit_per_host: keep-alive connections per host
+            output_format: JSON_ARRAY (data.json) or NDJSON (data.ndjson), one post per line
+            api: post URL template with a {post_id} field, e.g. a local fetch_core.mock_server
+            resume: continue the run recorded in the checkpoint file instead of starting over
+            rate: at most this many requests per second, None for no limit
+            max_attempts: tries per post before it goes to the dead-letter file
+            parse_processes: decode, validate and encode the response bodies in a pool of this
+                many processes; 0 does it in the writer's flush thread. Never on the event loop.
+            cache_file: SQLite HTTP cache; URLs it holds are refetched conditionally and an
+                unchanged response (304) is read from it instead of downloaded. None for no cache.
+        """
         if post_count <= 0:
             raise ValueError("post_count must be greater than 0")
-        if post_count > 100:
-            print("WARNING: post_count cannot be greater than 100")
-
-        self.API = "https://jsonplaceholder.typicode.com/posts/{post_id}"
-        self.response_times = []
-        self.output_file = "data.json"
+        if concurrency <= 0:
+            raise ValueError("concurrency must be greater than 0")
+
+        self.API = api
+        self.metrics = FetchMetrics()
+        self.output_format = output_format
+        self.output_file = "data.ndjson" if output_format == NDJSON else "data.json"
+        self.writer: AsyncBatchWriter | None = None
+        # output_file-ში უკვე ჩაწერილი პოსტების bitmap (იხ. fetch_core.Checkpoint)
+        self.checkpoint_file = self.output_file + ".checkpoint"
+        self.resume = resume
         self.response_file = "response_times.json"
-        self.post_count = post_count if post_count <= 100 else 100
-        self.file_lock = asyncio.Lock()
+        self.post_ids = range(first_post_id, first_post_id + post_count)
+        self.concurrency = concurrency
+        self.limit_per_host = limit_per_host
+        self.scheduler = FetchScheduler(concurrency, rate=rate, retry=RetryPolicy(max_attempts))
+        self.dead_letter_file = "dead_letters.json"
+        self.parse_processes = parse_processes
+        self.cache_file = cache_file
+        self.cache: HttpCache | None = None
+        self.session: aiohttp.ClientSession | None = None
+
+    def create_session(self) -> aiohttp.ClientSession:
+        # ერთი სესია და connector ყველა რექუესტისთვის: keep-alive კავშირები და DNS ქეში მეორდება
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.limit_per_host,
+                                         ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=30)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout, trace_configs=[aiohttp_trace_config()])
+
+    async def request(self, url: str, key: int | str) -> bytes | None:
+        """
+        GETs `url` when the scheduler allows it, retrying as long as it says so. Returns
+        the body of the 200 response (or the cached one on a 304), or None once the request
+        is dead-lettered as `key`.
+        """
+        # 304-ზე, რომლის სხეულიც ქეშში აღარ არის, ერთხელ პირობითი header-ების გარეშე ვცდით
+        revalidate = self.cache is not None
+        for attempt in itertools.count():
+            # სლოტის აღებამდე, რომ აქ გავარდნილმა შეცდომამ სლოტი არ დაკარგოს
+            conditional = self.cache.conditional_headers(url) if revalidate else {}
+            await self.scheduler.acquire_async()
+
+            # TraceConfig ამ dict-ში წერს DNS/connect/header-ების დროებს
+            marks = {}
+            status = retry_after = None
+            start_time = time.perf_counter()
+            try:
+                async with self.session.get(url, headers=conditional, trace_request_ctx=marks) as response:
+                    status = response.status
+                    if status == 200:
+                        body = await response.read()
+                    elif status != 304:
+                        retry_after = response.headers.get("Retry-After")
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                status = None
+            end_time = time.perf_counter()
+            self.scheduler.release(status, end_time - start_time)
+
+            # SQLite-ის კითხვა და commit-ი ნაკადში სრულდება, event loop-ს არ აჩერებს
+            if status == 200:
+                if self.cache is not None:
+                    await asyncio.to_thread(self.cache.store, url, response.headers, body)
+                self.metrics.record(key, trace_phases(marks, end_time))
+                return body
+            # 304: რესურსი არ შეცვლილა, სხეული ქეშიდან იკითხება
+            if status == 304:
+                if (body := await asyncio.to_thread(self.cache.not_modified, url)) is not None:
+                    self.metrics.record(key, trace_phases(marks, end_time))
+                    return body
+                if revalidate:
+                    revalidate = False
+                    continue
+
+            delay = self.scheduler.retry_delay(key, attempt, status, retry_after)
+            if delay is None:
+                self.metrics.record_error()
+                return None
+            await asyncio.sleep(delay)
 
     async def fetch_post(self, post_id):
-        start_time = time.time()
         print(f'Sending request to {post_id}')
 
-        async with aiohttp.request("GET", self.API.format(post_id=post_id)) as response:
-            duration = time.time() - start_time
-            if response.status != 200:
-                print(f"Error fetching post {post_id}")
-                return None
-
-            post_data = await response.json()
-            self.response_times.append((post_id, duration))
-
-            async with self.file_lock:
-                await self.append_to_json_file(post_data)
+        body = await self.request(self.API.format(post_id=post_id), post_id)
+        if body is None:
+            print(f"Error fetching post {post_id}")
+            return None
 
-            print(f"Got post data: {post_id}")
+        # სხეულს writer-ი შიფრავს და ამოწმებს, event loop-ზე JSON აღარ იპარსება
+        self.writer.write(body, post_id)
+        print(f"Got post data: {post_id}")
 
-    async def append_to_json_file(self, data):
-        async with aiofiles.open(self.output_file, "a", encoding="utf-8") as file:
-            await file.write(json.dumps(data, ensure_ascii=False, indent=4) + ",\n")
+    async def fetch_all(self, post_ids):
+        """
+        Fetches `post_ids`; the scheduler decides how many requests are in flight. At most
+        2 * `concurrency` tasks (waiting for a retry included) exist at a time, so a large
+        range does not create all of them up front.
 
-    @staticmethod
-    async def overwrite_last_char(file_path, new_char):
-        async with aiofiles.open(file_path, 'r+b') as file:
-            await file.seek(0, 2)
-            file_size = await file.tell()
+        The tasks run in a TaskGroup: if one raises, the others are cancelled and the
+        errors are raised here (as an ExceptionGroup) instead of being lost.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency * 2)
 
-            if file_size > 0:
-                await file.seek(file_size - 3)
-                await file.write(new_char.encode('utf-8'))
-
-                await file.truncate()
+        async with asyncio.TaskGroup() as group:
+            for post_id in post_ids:
+                await semaphore.acquire()
+                task = group.create_task(self.fetch_post(post_id))
+                task.add_done_callback(lambda _: semaphore.release())
 
     async def main(self):
-        start_time = time.time()
-
-        async with aiofiles.open(self.output_file, "w", encoding="utf-8") as file:
-            await file.write("[\n")
-
-        tasks = [
-            self.fetch_post(post_id)
-            for post_id in range(1, self.post_count + 1)
-        ]
-        await asyncio.gather(*tasks)
-
-        await self.overwrite_last_char(self.output_file, ']')
-
-        elapsed_time = time.time() - start_time
-
-        fastest_response = min(self.response_times, key=lambda x: x[1])
-        slowest_response = max(self.response_times, key=lambda x: x[1])
-
-        print(f"Fetching all posts took {elapsed_time:.2f} seconds.")
-        print(f"Fastest response: Post ID {fastest_response[0]} took {fastest_response[1]:.2f} seconds.")
-        print(f"Slowest response: Post ID {slowest_response[0]} took {slowest_response[1]:.2f} seconds.")
+        self.metrics.start()
+
+        checkpoint, resumed = open_checkpoint(self.checkpoint_file, self.post_ids, self.output_format, self.resume)
+        post_ids = checkpoint.pending() if resumed else self.post_ids
+        if resumed:
+            print(f"Resuming: {checkpoint.done} of {checkpoint.count} posts are already fetched")
+
+        self.cache = self.open_cache()
+        parse_pool = ParsePool(self.parse_processes) if self.parse_processes else None
+        try:
+            async with AsyncBatchWriter(self.output_file, self.output_format, checkpoint=checkpoint, resume=resumed,
+                                        schema=POST_SCHEMA, parse_pool=parse_pool) as self.writer:
+                async with self.create_session() as self.session:
+                    await self.fetch_all(post_ids)
+        finally:
+            if parse_pool is not None:
+                parse_pool.close()
+            if self.cache is not None:
+                self.cache.close()
+
+        self.metrics.stop()
+        # სხეული, რომელიც პოსტი არ აღმოჩნდა, dead letter-ია ისევე, როგორც ჩავარდნილი რექუესტი
+        for post_id, error in self.writer.rejected:
+            self.scheduler.reject(post_id, error)
+        if self.writer.rejected:
+            print(f"{len(self.writer.rejected)} responses were not valid posts, e.g.: {self.writer.rejected[0][1]}")
+        await self.save_reports()
+
+    def open_cache(self) -> HttpCache | None:
+        return HttpCache(self.cache_file) if self.cache_file else None
+
+    async def save_reports(self):
+        print(self.metrics.report())
+        print(self.scheduler.report())
+        if self.cache is not None:
+            print(self.cache.report())
 
         async with aiofiles.open(self.response_file, "w", encoding="utf-8") as file:
             await file.write(json.dumps({
-                "total_time": elapsed_time,
-                "fastest_response": fastest_response,
-                "slowest_response": slowest_response,
-                "response_times": dict(self.response_times)
+                **self.metrics.summary(),
+                "scheduler": self.scheduler.summary(),
+                "cache": self.cache.summary() if self.cache is not None else None,
             }, indent=4))
+        async with aiofiles.open(self.dead_letter_file, "w", encoding="utf-8") as file:
+            await file.write(json.dumps(self.scheduler.dead_letters, indent=4))
 
 
 if __name__ == "__main__":
-    fetcher = PostFetcher()
+    parser = argparse.ArgumentParser(description="Fetches posts from JSONPlaceholder with asyncio.")
+    parser.add_argument("--count", type=int, default=77, help="number of posts to fetch")
+    parser.add_argument("--first-id", type=int, default=1, help="id of the first post")
+    parser.add_argument("--concurrency", type=int, default=100, help="maximum requests in flight at once")
+    parser.add_argument("--limit-per-host", type=int, default=100, help="connections per host")
+    parser.add_argument("--format", choices=(JSON_ARRAY, NDJSON), default=JSON_ARRAY, help="output format")
+    parser.add_argument("--api", default=API_URL, help="post URL template with a {post_id} field")
+    parser.add_argument("--resume", action="store_true", help="skip the posts the last run already saved")
+    parser.add_argument("--rate", type=float, default=None, help="maximum requests per second")
+    parser.add_argument("--attempts", type=int, default=5, help="tries per post before giving up")
+    parser.add_argument("--parse-processes", type=int, default=0,
+                        help="processes that decode and encode the responses (0: the writer thread)")
+    parser.add_argument("--cache", nargs='?', const=CACHE_FILE, default=None, metavar="FILE",
+                        help=f"refetch conditionally through an HTTP cache (default file: {CACHE_FILE})")
+    args = parser.parse_args()
+
+    fetcher = PostFetcher(
+        args.count, args.first_id, args.concurrency, args.limit_per_host, args.format, args.api, args.resume,
+        args.rate, args.attempts, args.parse_processes, args.cache
+    )
     asyncio.run(fetcher.main())
@@ -0,0 +1,213 @@
+import argparse
+import asyncio
+import os
+import sys
+
+from async_request import PostFetcher
+
+# fetch_core საერთოა ორივე fetcher-ისთვის და რეპოზიტორიის root-ში მდებარეობს
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fetch_core import (  # noqa: E402
+    ALBUM_SCHEMA, CACHE_FILE, COMMENT_SCHEMA, JSON_ARRAY, NDJSON, PHOTO_SCHEMA, POST_SCHEMA, USER_SCHEMA,
+    AsyncBatchWriter, FetchMetrics, decode_record
+)
+
+BASE_URL = "https://jsonplaceholder.typicode.com"
+
+# რიგში ჩადებული ეს ობიექტი ნიშნავს, რომ წინა ეტაპმა მუშაობა დაასრულა
+_DONE = object()
+
+
+class CrawlPipeline(PostFetcher):
+    """
+    Crawls posts together with their comments and authors, and the authors' albums and photos.
+
+        post ids -> fetch -> parse -> join (comments + user) -> writer
+
+    The stages are tasks connected by bounded asyncio.Queues, so a slow stage holds back
+    the ones before it and no more than `queue_size` items wait between two stages.
+    They run in one TaskGroup, so a stage that raises cancels the others.
+    Every request goes through the PostFetcher's session, scheduler (rate limit,
+    adaptive concurrency, retries) and metrics.
+
+    Users are shared through a cache of futures: the first post of a user starts its
+    fetch, later posts await the same future, so every user (with its albums and
+    photos) is requested once. The full user record is written to `users_file` once;
+    joined posts only carry the user's profile.
+
+    Bodies are decoded and validated in a worker thread, off the event loop. A
+    malformed body is dead-lettered under its path like a failed request, so it
+    drops that post or user instead of aborting the crawl.
+    """
+
+    def __init__(
+            self,
+            post_count: int = 100,
+            first_post_id: int = 1,
+            concurrency: int = 50,
+            output_format: str = NDJSON,
+            base_url: str = BASE_URL,
+            queue_size: int = 100,
+            rate: float | None = None,
+            max_attempts: int = 5,
+            cache_file: str | None = None
+    ):
+        """
+        arguments:
+            base_url: root of the API, e.g. a local fetch_core.mock_server
+            queue_size: capacity of every queue between two stages
+            cache_file: HTTP cache shared by all requests, so a repeated crawl only
+                downloads what changed
+        """
+        base_url = base_url.rstrip('/')
+        super().__init__(post_count, first_post_id, concurrency, concurrency, output_format,
+                         base_url + "/posts/{post_id}", rate=rate, max_attempts=max_attempts, cache_file=cache_file)
+
+        self.base_url = base_url
+        self.queue_size = queue_size
+        self.metrics = FetchMetrics(key_label="request")
+
+        extension = "ndjson" if output_format == NDJSON else "json"
+        self.output_file = f"crawl_posts.{extension}"
+        self.users_file = f"crawl_users.{extension}"
+        self.response_file = "crawl_response_times.json"
+        self.dead_letter_file = "crawl_dead_letters.json"
+
+        self.users: dict[int, asyncio.Future] = {}
+        self.users_writer: AsyncBatchWriter | None = None
+
+    async def decode(self, body: bytes, key: int | str, schema: dict[str, type], many: bool = False):
+        """The decoded body, or None after dead-lettering `key` if it is malformed."""
+        record, error = await asyncio.to_thread(decode_record, body, schema, many)
+        if error is not None:
+            self.scheduler.reject(key, error)
+            print(f"Invalid response for {key}: {error}")
+        return record
+
+    async def get_json(self, path: str, schema: dict[str, type], many: bool = False):
+        body = await self.request(self.base_url + path, path)
+        return await self.decode(body, path, schema, many) if body is not None else None
+
+    async def user(self, user_id: int) -> dict | None:
+        """The user's profile; it is fetched (with albums and photos) only by the first caller."""
+        if user_id not in self.users:
+            self.users[user_id] = asyncio.ensure_future(self._fetch_user(user_id))
+        return await self.users[user_id]
+
+    async def _fetch_user(self, user_id: int) -> dict | None:
+        user = await self.get_json(f"/users/{user_id}", USER_SCHEMA)
+        if user is None:
+            return None
+
+        albums = await self.get_json(f"/users/{user_id}/albums", ALBUM_SCHEMA, many=True) or []
+        photos = await asyncio.gather(
+            *(self.get_json(f"/albums/{album['id']}/photos", PHOTO_SCHEMA, many=True) for album in albums)
+        )
+
+        # albums და photos მხოლოდ ერთხელ იწერება, მეხსიერებაში პროფილი რჩება
+        self.users_writer.write({
+            **user,
+            "albums": [{**album, "photos": album_photos} for album, album_photos in zip(albums, photos)],
+        })
+        return user
+
+    async def _source(self, outbox: asyncio.Queue) -> None:
+        for post_id in self.post_ids:
+            await outbox.put(post_id)
+        await outbox.put(_DONE)
+
+    @staticmethod
+    async def _stage(inbox: asyncio.Queue, outbox: asyncio.Queue | None, handle, workers: int) -> None:
+        """Runs `workers` copies of `handle` over `inbox`, passing results that are not None to `outbox`."""
+        async def work():
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    # იგივე ნიშანი ამ ეტაპის დანარჩენ worker-ებსაც აჩერებს
+                    await inbox.put(_DONE)
+                    return
+
+                result = await handle(item)
+                if result is not None and outbox is not None:
+                    await outbox.put(result)
+
+        async with asyncio.TaskGroup() as group:
+            for _ in range(workers):
+                group.create_task(work())
+        if outbox is not None:
+            await outbox.put(_DONE)
+
+    async def _fetch(self, post_id: int) -> tuple[str, bytes] | None:
+        print(f'Sending request to {post_id}')
+
+        path = f"/posts/{post_id}"
+        body = await self.request(self.API.format(post_id=post_id), path)
+        if body is None:
+            print(f"Error fetching post {post_id}")
+            return None
+        return path, body
+
+    async def _parse(self, response: tuple[str, bytes]) -> dict | None:
+        path, body = response
+        return await self.decode(body, path, POST_SCHEMA)
+
+    async def _join(self, post: dict) -> None:
+        comments, user = await asyncio.gather(
+            self.get_json(f"/posts/{post['id']}/comments", COMMENT_SCHEMA, many=True),
+            self.user(post['userId'])
+        )
+        self.writer.write({**post, "comments": comments, "user": user})
+        print(f"Got post data: {post['id']}")
+
+    async def main(self):
+        self.metrics.start()
+
+        post_ids = asyncio.Queue(self.queue_size)
+        bodies = asyncio.Queue(self.queue_size)
+        posts = asyncio.Queue(self.queue_size)
+
+        self.cache = self.open_cache()
+        try:
+            async with AsyncBatchWriter(self.output_file, self.output_format) as self.writer, \
+                    AsyncBatchWriter(self.users_file, self.output_format) as self.users_writer:
+                async with self.create_session() as self.session:
+                    # TaskGroup: ერთი ეტაპის შეცდომა დანარჩენებს აუქმებს, სანამ writer-ები დაიხურება
+                    try:
+                        async with asyncio.TaskGroup() as group:
+                            group.create_task(self._source(post_ids))
+                            group.create_task(self._stage(post_ids, bodies, self._fetch, self.concurrency))
+                            group.create_task(self._stage(bodies, posts, self._parse, 1))
+                            group.create_task(self._stage(posts, None, self._join, self.concurrency))
+                    finally:
+                        # მომხმარებლების fetch-ები ჯგუფის გარეთ იქმნება, ამიტომ ცალკე უქმდება
+                        for user in self.users.values():
+                            user.cancel()
+        finally:
+            if self.cache is not None:
+                self.cache.close()
+
+        self.metrics.stop()
+        print(f"Wrote {self.writer.count} posts and {self.users_writer.count} users.")
+        await self.save_reports()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crawls posts with their comments, users, albums and photos.")
+    parser.add_argument("--count", type=int, default=100, help="number of posts to crawl")
+    parser.add_argument("--first-id", type=int, default=1, help="id of the first post")
+    parser.add_argument("--concurrency", type=int, default=50, help="maximum requests in flight at once")
+    parser.add_argument("--format", choices=(JSON_ARRAY, NDJSON), default=NDJSON, help="output format")
+    parser.add_argument("--base-url", default=BASE_URL, help="root of the API")
+    parser.add_argument("--queue-size", type=int, default=100, help="items waiting between two stages")
+    parser.add_argument("--rate", type=float, default=None, help="maximum requests per second")
+    parser.add_argument("--attempts", type=int, default=5, help="tries per request before giving up")
+    parser.add_argument("--cache", nargs='?', const=CACHE_FILE, default=None, metavar="FILE",
+                        help=f"refetch conditionally through an HTTP cache (default file: {CACHE_FILE})")
+    args = parser.parse_args()
+
+    pipeline = CrawlPipeline(
+        args.count, args.first_id, args.concurrency, args.format, args.base_url, args.queue_size, args.rate,
+        args.attempts, args.cache
+    )
+    asyncio.run(pipeline.main())
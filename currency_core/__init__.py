@@ -0,0 +1,11 @@
+from .config import INT64_MAX
+from .rate_store import RateStore
+from .rate_matrix import RateMatrix
+from .batch import convert_many, default_rates
+from .catalogue import CurrencyCatalogue
+from .search import CurrencyIndex
+from .history import RateHistory
+from .client import HttpClient, get_client
+from .exact import ExactRateTable, convert_exact, convert_minor, minor_units
+from .engine import ConversionEngine, parse_amount
+from .refresher import RateRefresher, diff_rates
@@ -0,0 +1,47 @@
+from .client import get_client
+from .config import ALL_CURRENCIES_URL, DATED_CURRENCY_URL, SINGLE_CURRENCY_URL
+
+
+def fetch_currency_names() -> dict:
+    """Returns {code: name} of every currency known by the API."""
+    response = get_client().get(ALL_CURRENCIES_URL, endpoint='currencies')
+    response.raise_for_status()
+    return response.json()
+
+
+def fetch_currency_rates(currency_code: str) -> tuple[str, dict]:
+    """Returns (snapshot date, {code: rate}) with `currency_code` as the base."""
+    response = get_client().get(SINGLE_CURRENCY_URL.format(currency_code=currency_code), endpoint='rates')
+    response.raise_for_status()
+    data = response.json()
+    return data['date'], data[currency_code]
+
+
+def fetch_currency_rates_on(currency_code: str, date: str) -> tuple[str, dict]:
+    """Same as fetch_currency_rates, but for the snapshot of a past date (YYYY-MM-DD)."""
+    response = get_client().get(
+        DATED_CURRENCY_URL.format(date=date, currency_code=currency_code), endpoint='rates_on_date'
+    )
+    response.raise_for_status()
+    data = response.json()
+    return data['date'], data[currency_code]
+
+
+def fetch_currency_names_if_modified(etag: str | None = None,
+                                     last_modified: str | None = None) -> tuple[dict | None, str | None, str | None]:
+    """
+    Conditional version of fetch_currency_names.
+    Returns (names or None if the server answered 304, etag, last_modified).
+    """
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+
+    response = get_client().get(ALL_CURRENCIES_URL, endpoint='currencies', headers=headers)
+    if response.status_code == 304:
+        return None, etag, last_modified
+
+    response.raise_for_status()
+    return response.json(), response.headers.get('ETag'), response.headers.get('Last-Modified')
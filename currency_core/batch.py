@@ -0,0 +1,77 @@
+import numpy as np
+
+from .config import INT64_MAX
+from .rate_matrix import RateMatrix
+from .rate_store import RateStore
+
+_default_rates: RateMatrix | None = None
+
+
+def default_rates() -> RateMatrix:
+    """
+    The RateMatrix convert_many uses when none is given, created on first use. A
+    RateRefresher attached to it keeps long-running batch callers off the fetch path.
+    """
+    global _default_rates
+    if _default_rates is None:
+        _default_rates = RateMatrix(RateStore())
+    return _default_rates
+
+
+def validate_amounts(amounts: np.ndarray, line_numbers: np.ndarray | None = None) -> np.ndarray:
+    """
+    Applies the converters' amount rules to a whole array at once.
+
+    arguments:
+        line_numbers: 1-based line of every amount in its source file, e.g. a CSV; the
+            1-based position in `amounts` if omitted
+
+    raises:
+        ValueError with the line of the first amount that is negative, too large or not a number
+    """
+    amounts = np.asarray(amounts, dtype=np.float64)
+
+    invalid = np.flatnonzero(~((amounts >= 0) & (amounts < INT64_MAX)))
+    if invalid.size:
+        index = int(invalid[0])
+        line = int(line_numbers[index]) if line_numbers is not None else index + 1
+        raise ValueError(f"Invalid amount at line {line}: {amounts[index]}")
+
+    return amounts
+
+
+def convert_many(
+        amounts: np.ndarray,
+        from_codes: np.ndarray,
+        to_codes: np.ndarray,
+        rates: RateMatrix | None = None,
+        max_age: float | None = None,
+        line_numbers: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Converts every amounts[i] from from_codes[i] to to_codes[i].
+
+    Codes are case-insensitive. Cross rates come from `rates` (a RateMatrix over the
+    default rate store if omitted), one lookup per distinct currency, and the
+    multiplication runs over the whole array. `line_numbers` only label errors
+    (see validate_amounts).
+
+    raises:
+        ValueError if an amount is invalid
+        KeyError if a pair is unknown
+        requests.RequestException if the rates can not be fetched
+    """
+    if rates is None:
+        rates = default_rates()
+
+    amounts = validate_amounts(amounts, line_numbers)
+    from_codes = np.char.lower(np.asarray(from_codes, dtype=str))
+    to_codes = np.char.lower(np.asarray(to_codes, dtype=str))
+
+    if not (len(amounts) == len(from_codes) == len(to_codes)):
+        raise ValueError("amounts, from_codes and to_codes must have the same length")
+
+    if not len(amounts):
+        return amounts
+
+    return amounts * rates.get_rates(from_codes, to_codes, max_age)
@@ -0,0 +1,47 @@
+"""
+Micro-benchmark: exact Decimal conversion kernel vs the float path the converters used.
+
+    python -m currency_core.bench_exact
+"""
+import random
+import timeit
+from decimal import Decimal
+
+from .exact import ExactRateTable, convert_exact
+
+
+def main(currency_count: int = 300, conversions: int = 100_000) -> None:
+    random.seed(0)
+    codes = [f"c{i:03d}" for i in range(currency_count)]
+    snapshot = {code: random.uniform(0.0001, 20000) for code in codes}
+    table = ExactRateTable(snapshot)
+
+    pairs = [(random.choice(codes), random.choice(codes)) for _ in range(conversions)]
+    float_amounts = [random.uniform(0, 1_000_000) for _ in range(conversions)]
+    decimal_amounts = [Decimal(f"{amount:.2f}") for amount in float_amounts]
+    minor_amounts = [round(amount * 100) for amount in float_amounts]
+
+    def float_path():
+        for amount, (from_code, to_code) in zip(float_amounts, pairs):
+            amount * (snapshot[to_code] / snapshot[from_code])
+
+    def exact_path():
+        for amount, (from_code, to_code) in zip(decimal_amounts, pairs):
+            convert_exact(amount, table.cross_rate(from_code, to_code), to_code)
+
+    def scaled_path():
+        for amount, (from_code, to_code) in zip(minor_amounts, pairs):
+            table.convert_minor(amount, from_code, to_code)
+
+    for name, path in (("float", float_path), ("decimal", exact_path), ("scaled integer", scaled_path)):
+        seconds = min(timeit.repeat(path, number=1, repeat=5))
+        print(f"{name:>14}: {conversions / seconds:,.0f} conversions/s ({seconds * 1e9 / conversions:,.0f} ns each)")
+
+    # რატომ არ გამოდგება float: 2**53-ის ზემოთ ცენტები იკარგება
+    amount = 2**53 + 1
+    print(f"\n         float: {float(amount) * 1.0:,.2f}")
+    print(f"       decimal: {convert_exact(Decimal(amount), Decimal(1), 'usd'):,.2f}")
+
+
+if __name__ == "__main__":
+    main()
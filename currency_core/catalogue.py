@@ -0,0 +1,263 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Mapping
+
+from .api import fetch_currency_names_if_modified
+from .config import CATALOGUE_DIR, CATALOGUE_KEEP_VERSIONS, SEED_CATALOGUE_PATH
+
+# magic, format version, count, codes blob offset, names blob offset
+_HEADER = struct.Struct('<4sIIII')
+_MAGIC = b'CCAT'
+_FORMAT_VERSION = 1
+
+
+def write_catalogue(path: str, currency_names: dict) -> None:
+    """
+    Writes {code: name} as a compact binary file sorted by code:
+    header, code offsets, name offsets, codes blob, names blob.
+
+    The file is written next to `path` and moved into place, so a process that already
+    maps an older file at `path` keeps its own copy instead of seeing it truncated.
+    """
+    items = sorted((code.lower().encode('utf-8'), (name or '').encode('utf-8'))
+                   for code, name in currency_names.items())
+    count = len(items)
+
+    code_offsets, name_offsets = [0], [0]
+    for code, name in items:
+        code_offsets.append(code_offsets[-1] + len(code))
+        name_offsets.append(name_offsets[-1] + len(name))
+
+    codes_start = _HEADER.size + 2 * 4 * (count + 1)
+    names_start = codes_start + code_offsets[-1]
+
+    fd, tmp_path = tempfile.mkstemp(prefix='.currencies-', suffix='.tmp', dir=os.path.dirname(path) or '.')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, count, codes_start, names_start))
+            file.write(struct.pack(f'<{count + 1}I', *code_offsets))
+            file.write(struct.pack(f'<{count + 1}I', *name_offsets))
+            file.write(b''.join(code for code, _ in items))
+            file.write(b''.join(name for _, name in items))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+class CurrencyCatalogue(Mapping):
+    """
+    Read-only {code: name} mapping backed by a memory-mapped catalogue file.
+
+    The file is opened lazily on first access and looked up with a binary search
+    over the sorted codes, nothing is parsed up front. `refresh` revalidates the
+    catalogue against the API with ETag/Last-Modified and writes a new version
+    file; `reload` switches to it and must run on the thread that reads.
+
+    Without any catalogue the shipped seed file is installed as version 0, so a first
+    launch without network still has currency names. Several processes may share the
+    directory: version files are never rewritten in place and the last
+    `keep_versions` of them are kept, so a reader that just read meta.json still finds its file.
+    """
+
+    def __init__(
+            self,
+            directory: str = CATALOGUE_DIR,
+            seed_path: str | None = SEED_CATALOGUE_PATH,
+            keep_versions: int = CATALOGUE_KEEP_VERSIONS
+    ):
+        self.directory = directory
+        self.meta_path = os.path.join(directory, 'meta.json')
+        self.seed_path = seed_path
+        self.keep_versions = keep_versions
+
+        self.version: int | None = None
+        self.__file = None
+        self.__mm: mmap.mmap | None = None
+        self.__view: memoryview | None = None
+        self.__load_attempted = False
+        self.__count = 0
+        self.__code_offsets: memoryview | None = None
+        self.__name_offsets: memoryview | None = None
+        self.__codes_start = 0
+        self.__names_start = 0
+        self.__refresh_lock = threading.Lock()
+
+    def _read_meta(self) -> dict:
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _write_meta(self, meta: dict) -> None:
+        # ყოველ პროცესს თავისი დროებითი ფაილი აქვს, ერთმანეთს არ გადაეწერებიან
+        fd, tmp_path = tempfile.mkstemp(prefix='.meta-', suffix='.tmp', dir=self.directory)
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            json.dump(meta, file, indent=4)
+        os.replace(tmp_path, self.meta_path)
+
+    def _version_path(self, version: int) -> str:
+        return os.path.join(self.directory, f'currencies.v{version}.bin')
+
+    def exists(self) -> bool:
+        return 'version' in self._read_meta()
+
+    def _ensure_loaded(self) -> None:
+        if self.__mm is None and not self.__load_attempted:
+            self.__load_attempted = True
+            if not self.exists():
+                self.install_seed()
+            self.reload()
+
+    def install_seed(self) -> bool:
+        """Installs the shipped seed as version 0 if there is no catalogue yet. Returns True if it did."""
+        if self.seed_path is None:
+            return False
+
+        with self.__refresh_lock:
+            if self.exists():
+                return False
+            try:
+                with open(self.seed_path, 'r', encoding='utf-8') as file:
+                    currency_names = json.load(file)
+            except (OSError, json.JSONDecodeError):
+                return False
+
+            os.makedirs(self.directory, exist_ok=True)
+            write_catalogue(self._version_path(0), currency_names)
+            # etag-ის გარეშე პირველი refresh სრულ კატალოგს ჩამოტვირთავს
+            self._write_meta({'version': 0, 'seed': True})
+            return True
+
+    def reload(self) -> bool:
+        """Maps the newest catalogue version if it differs from the mapped one. Returns True if it switched."""
+        version = self._read_meta().get('version')
+        if version is None or version == self.version:
+            return False
+
+        path = self._version_path(version)
+        try:
+            file = open(path, 'rb')
+        except FileNotFoundError:
+            # სხვა პროცესმა ახალი ვერსია ჩაწერა და ეს უკვე წაშალა, შემდეგ reload-ზე გადავალთ
+            return False
+        mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, format_version, count, codes_start, names_start = _HEADER.unpack_from(mm, 0)
+        if magic != _MAGIC or format_version != _FORMAT_VERSION:
+            mm.close()
+            file.close()
+            raise ValueError(f"{path} is not a currency catalogue")
+
+        self.close()
+
+        view = memoryview(mm)
+        offsets_size = 4 * (count + 1)
+        self.__file, self.__mm, self.__view = file, mm, view
+        self.__count = count
+        self.__code_offsets = view[_HEADER.size:_HEADER.size + offsets_size].cast('I')
+        self.__name_offsets = view[_HEADER.size + offsets_size:_HEADER.size + 2 * offsets_size].cast('I')
+        self.__codes_start, self.__names_start = codes_start, names_start
+        self.version = version
+        return True
+
+    def _prune(self, newest: int) -> None:
+        """
+        Removes version files older than the last `keep_versions`. A file that is already mapped
+        stays readable after the unlink on POSIX; on Windows its removal fails and is retried later.
+        """
+        for name in os.listdir(self.directory):
+            if not (name.startswith('currencies.v') and name.endswith('.bin')):
+                continue
+            version = name[len('currencies.v'):-len('.bin')]
+            if version.isdigit() and int(version) <= newest - self.keep_versions:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def refresh(self) -> bool:
+        """
+        Revalidates the catalogue against the API. Returns True if a new version
+        was written, False if the server answered 304 Not Modified.
+
+        raises:
+            requests.RequestException if the API can not be reached
+        """
+        with self.__refresh_lock:
+            meta = self._read_meta()
+            currency_names, etag, last_modified = fetch_currency_names_if_modified(
+                meta.get('etag'), meta.get('last_modified')
+            )
+
+            if currency_names is None:
+                meta['checked_at'] = time.time()
+                self._write_meta(meta)
+                return False
+
+            os.makedirs(self.directory, exist_ok=True)
+            version = meta.get('version', 0) + 1
+            write_catalogue(self._version_path(version), currency_names)
+            self._write_meta({
+                'version': version,
+                'etag': etag,
+                'last_modified': last_modified,
+                'checked_at': time.time()
+            })
+            self._prune(version)
+            return True
+
+    def _code(self, i: int) -> bytes:
+        start = self.__codes_start + self.__code_offsets[i]
+        return self.__mm[start:self.__codes_start + self.__code_offsets[i + 1]]
+
+    def _name(self, i: int) -> str:
+        start = self.__names_start + self.__name_offsets[i]
+        return self.__mm[start:self.__names_start + self.__name_offsets[i + 1]].decode('utf-8')
+
+    def index_of(self, code: str) -> int:
+        """Returns the position of `code` in the sorted catalogue or -1."""
+        self._ensure_loaded()
+        if self.__mm is None:
+            return -1
+
+        key = code.encode('utf-8')
+        i = bisect_left(range(self.__count), key, key=self._code)
+        return i if i < self.__count and self._code(i) == key else -1
+
+    def __getitem__(self, code: str) -> str:
+        if (i := self.index_of(code)) < 0:
+            raise KeyError(code)
+        return self._name(i)
+
+    def __iter__(self):
+        self._ensure_loaded()
+        for i in range(self.__count):
+            yield self._code(i).decode('utf-8')
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return self.__count
+
+    def close(self) -> None:
+        if self.__mm is None:
+            return
+
+        self.__code_offsets.release()
+        self.__name_offsets.release()
+        self.__view.release()
+        self.__mm.close()
+        self.__file.close()
+        self.__mm = self.__file = self.__view = None
+        self.__code_offsets = self.__name_offsets = None
+        self.__count = 0
+        self.version = None
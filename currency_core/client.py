@@ -0,0 +1,183 @@
+import random
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_SECONDS,
+    HTTP_BACKOFF_SECONDS,
+    HTTP_MAX_RETRIES,
+    HTTP_POOL_SIZE,
+    HTTP_TIMEOUT
+)
+
+# ამ სტატუსებზე რექუესტი თავიდან იგზავნება, სხვა შეცდომები მაშინვე ბრუნდება
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised without touching the network while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls for
+    `reset_seconds`; after that one trial call is let through (half-open) and its
+    outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_seconds: float = CIRCUIT_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.__lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self.__lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.reset_seconds:
+                # half-open: ერთი საცდელი რექუესტი, შემდეგი ისევ ელოდება მის შედეგს
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self.__lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self.__lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class LatencyStats:
+    """Request count, errors and latency percentiles of one endpoint (last `window` requests)."""
+
+    def __init__(self, window: int = 1000):
+        self.count = 0
+        self.errors = 0
+        self.latencies: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float, ok: bool) -> None:
+        self.count += 1
+        self.errors += not ok
+        self.latencies.append(seconds)
+
+    def summary(self) -> dict:
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return {'count': self.count, 'errors': self.errors}
+
+        def percentile(p: float) -> float:
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'p50': percentile(0.50),
+            'p95': percentile(0.95),
+            'max': latencies[-1]
+        }
+
+
+class HttpClient:
+    """
+    Shared HTTP client of every rate/catalogue fetch: a pooled keep-alive
+    requests.Session with timeouts, exponential-backoff retries, a per-endpoint
+    circuit breaker and latency metrics.
+    """
+
+    def __init__(
+            self,
+            timeout: float | tuple[float, float] = HTTP_TIMEOUT,
+            max_retries: int = HTTP_MAX_RETRIES,
+            backoff_seconds: float = HTTP_BACKOFF_SECONDS,
+            pool_size: int = HTTP_POOL_SIZE
+    ):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self.stats: dict[str, LatencyStats] = {}
+        self.__lock = threading.Lock()
+
+    def _endpoint(self, endpoint: str) -> tuple[CircuitBreaker, LatencyStats]:
+        with self.__lock:
+            if endpoint not in self.breakers:
+                self.breakers[endpoint] = CircuitBreaker()
+                self.stats[endpoint] = LatencyStats()
+            return self.breakers[endpoint], self.stats[endpoint]
+
+    def get(self, url: str, endpoint: str, **kwargs) -> requests.Response:
+        """
+        GET with retries. `endpoint` groups URLs for the circuit breaker and metrics.
+        Retries connection errors, timeouts and 429/5xx answers; any other response
+        (including 304 and 404) is returned as is.
+
+        raises:
+            CircuitOpenError if the endpoint's circuit is open
+            requests.RequestException once the retries are exhausted
+        """
+        breaker, stats = self._endpoint(endpoint)
+        kwargs.setdefault('timeout', self.timeout)
+
+        for attempt in range(self.max_retries + 1):
+            if not breaker.allow():
+                raise CircuitOpenError(f"circuit open for {endpoint}")
+
+            start_time = time.perf_counter()
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                stats.record(time.perf_counter() - start_time, ok=False)
+                breaker.record_failure()
+                if attempt == self.max_retries:
+                    raise
+            else:
+                ok = response.status_code not in RETRY_STATUSES
+                stats.record(time.perf_counter() - start_time, ok=ok)
+                if ok:
+                    breaker.record_success()
+                    return response
+
+                breaker.record_failure()
+                if attempt == self.max_retries:
+                    return response
+
+            # exponential backoff + jitter
+            time.sleep(self.backoff_seconds * 2 ** attempt * (0.5 + random.random()))
+
+    def metrics(self) -> dict[str, dict]:
+        return {endpoint: stats.summary() for endpoint, stats in self.stats.items()}
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_client: HttpClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    """Returns the process-wide HttpClient, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
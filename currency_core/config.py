@@ -0,0 +1,49 @@
+import os
+
+# base directory
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Local data directory (rate store, catalogue, ...)
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+
+# Rate store path
+RATE_STORE_PATH = os.path.join(DATA_DIR, 'rates.sqlite3')
+
+# Currency API
+ALL_CURRENCIES_URL = "https://cdn.jsdelivr.net/npm/@fawazahmed0/currency-api@latest/v1/currencies.json"
+SINGLE_CURRENCY_URL = ALL_CURRENCIES_URL.replace('.json', '') + "/{currency_code}.json"
+# Daily snapshots of the API, @YYYY-MM-DD instead of @latest
+DATED_CURRENCY_URL = SINGLE_CURRENCY_URL.replace('@latest', '@{date}')
+
+# Pivot currency of the rate matrix, every cross rate is derived from its snapshot
+PIVOT_CURRENCY = "usd"
+
+# Largest amount accepted by the converters
+INT64_MAX = 2**63 - 1
+
+# Historical daily snapshots, one directory per base currency
+HISTORY_DIR = os.path.join(DATA_DIR, 'history')
+
+# Currency name catalogue (versioned binary files + metadata)
+CATALOGUE_DIR = os.path.join(DATA_DIR, 'catalogue')
+
+# {code: name} shipped with the code, installed as the catalogue on a first (offline) launch
+SEED_CATALOGUE_PATH = os.path.join(BASE_DIR, 'seed', 'currencies.json')
+
+# Old catalogue versions kept for processes that read meta.json just before a refresh
+CATALOGUE_KEEP_VERSIONS = 3
+
+# HTTP client: (connect, read) timeout in seconds, retries and circuit breaker
+HTTP_TIMEOUT = (3.05, 10)
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_SECONDS = 0.5
+HTTP_POOL_SIZE = 10
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_SECONDS = 30
+
+# Background refresher: interval of the hot bases (seconds, +- jitter fraction) and
+# how long a base stays hot after its last conversion
+REFRESH_INTERVAL_SECONDS = 1800
+REFRESH_MIN_INTERVAL_SECONDS = 60
+REFRESH_JITTER = 0.1
+REFRESH_IDLE_SECONDS = 86400
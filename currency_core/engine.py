@@ -0,0 +1,85 @@
+from decimal import Decimal, InvalidOperation
+
+from .config import INT64_MAX
+from .exact import ONE, convert_exact
+from .rate_matrix import RateMatrix
+from .rate_store import RateStore
+
+INVALID_AMOUNT_MESSAGE = "გთხოვთ, შეიყვანოთ ვალიდური თანხა"
+NEGATIVE_AMOUNT_MESSAGE = "თანხა უნდა იყოს დადებითი რიცხვი"
+AMOUNT_TOO_LARGE_MESSAGE = "თანხა ძალიან დიდია"
+
+
+def parse_amount(text: str | Decimal) -> Decimal:
+    """
+    Parses an amount the way the converters accept it (thousands separators allowed).
+
+    raises:
+        ValueError with the message to show the user
+    """
+    if isinstance(text, Decimal):
+        amount = text
+    else:
+        try:
+            amount = Decimal(text.replace(',', '').strip())
+        except InvalidOperation:
+            raise ValueError(INVALID_AMOUNT_MESSAGE) from None
+
+    if amount.is_nan():
+        raise ValueError(INVALID_AMOUNT_MESSAGE)
+    if amount < 0:
+        raise ValueError(NEGATIVE_AMOUNT_MESSAGE)
+    if amount >= INT64_MAX:
+        raise ValueError(AMOUNT_TOO_LARGE_MESSAGE)
+
+    return amount
+
+
+class ConversionEngine:
+    """
+    The conversion logic of the converters without any widgets: amount validation,
+    rate lookup through a RateMatrix and exact rounding. Both UIs and the HTTP
+    service share it, so one process keeps one rate cache.
+    """
+
+    def __init__(self, rates: RateMatrix | None = None):
+        self.rates = RateMatrix(RateStore()) if rates is None else rates
+
+    @staticmethod
+    def needs_rate(amount: Decimal, from_code: str, to_code: str) -> bool:
+        """Zero amounts and same-currency conversions are answered without any rate."""
+        return amount != 0 and from_code != to_code
+
+    def convert(self, amount: str | Decimal, from_code: str, to_code: str, max_age: float | None = None) -> Decimal:
+        """
+        Converts `amount` and rounds it to the minor units of `to_code`. May fetch rates,
+        so UI code calls it off the UI thread.
+
+        raises:
+            ValueError if the amount is invalid
+            KeyError if the pair is unknown
+            requests.RequestException if the rates can not be fetched
+        """
+        amount = parse_amount(amount)
+        from_code, to_code = from_code.lower(), to_code.lower()
+
+        if not self.needs_rate(amount, from_code, to_code):
+            return convert_exact(amount, ONE, to_code)
+
+        return convert_exact(amount, self.rates.get_exact_rate(from_code, to_code, max_age), to_code)
+
+    def peek(self, amount: str | Decimal, from_code: str, to_code: str) -> Decimal | None:
+        """Like convert, but only with rates already in memory or in the store; None if there are none."""
+        amount = parse_amount(amount)
+        from_code, to_code = from_code.lower(), to_code.lower()
+
+        if not self.needs_rate(amount, from_code, to_code):
+            return convert_exact(amount, ONE, to_code)
+
+        if (rate := self.rates.peek_exact_rate(from_code, to_code)) is None:
+            return None
+        return convert_exact(amount, rate, to_code)
+
+    def base_rates(self, base: str, max_age: float | None = None) -> tuple[str | None, dict[str, float]]:
+        """Returns (snapshot_date, {code: rate}) of every currency against `base`."""
+        return self.rates.get_base_rates(base.lower(), max_age)
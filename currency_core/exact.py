@@ -0,0 +1,130 @@
+from decimal import ROUND_HALF_EVEN, Context, Decimal
+
+# ზუსტი გამოთვლებისთვის საკმარისი სიზუსტე: INT64_MAX (19 ციფრი) x კურსი (28 ციფრი)
+KERNEL_CONTEXT = Context(prec=60, rounding=ROUND_HALF_EVEN)
+ONE = Decimal(1)
+
+# ISO 4217 minor units, ყველა დანარჩენი ვალუტა 2 ათწილადით
+MINOR_UNITS = {
+    'bif': 0, 'clp': 0, 'djf': 0, 'gnf': 0, 'isk': 0, 'jpy': 0, 'kmf': 0, 'krw': 0, 'pyg': 0,
+    'rwf': 0, 'ugx': 0, 'uyi': 0, 'vnd': 0, 'vuv': 0, 'xaf': 0, 'xof': 0, 'xpf': 0,
+    'bhd': 3, 'iqd': 3, 'jod': 3, 'kwd': 3, 'lyd': 3, 'omr': 3, 'tnd': 3,
+    'clf': 4, 'uyw': 4,
+    'btc': 8, 'eth': 8,
+}
+DEFAULT_MINOR_UNITS = 2
+
+# გამოთვლების სიზუსტე კურსებისთვის (ორმხრივი და cross)
+RATE_PRECISION = 28
+
+
+def minor_units(code: str) -> int:
+    return MINOR_UNITS.get(code.lower(), DEFAULT_MINOR_UNITS)
+
+
+# ვალუტის კოდი -> quantize-ის ექსპონენტა (Decimal('0.01') და ა.შ.)
+_QUANTUMS: dict[str, Decimal] = {}
+
+
+def _quantum(code: str) -> Decimal:
+    if (quantum := _QUANTUMS.get(code)) is None:
+        quantum = _QUANTUMS[code] = ONE.scaleb(-minor_units(code))
+    return quantum
+
+
+def to_decimal(value: float | int | str | Decimal) -> Decimal:
+    """Converts API floats through their shortest repr, so 0.1 stays 0.1 and not 0.1000000000000000055..."""
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, float):
+        return Decimal(repr(value))
+    return Decimal(value)
+
+
+class ExactRateTable:
+    """
+    Decimal rates of one pivot snapshot with their reciprocals precomputed, so a
+    cross rate is a single multiplication: rate[to] * (1 / rate[from]). Cross rates
+    are memoized, after the first conversion a pair costs one dict lookup.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        context = Context(prec=RATE_PRECISION, rounding=ROUND_HALF_EVEN)
+
+        self.rates: dict[str, Decimal] = {}
+        self.reciprocals: dict[str, Decimal] = {}
+        for code, rate in rates.items():
+            if not rate > 0:
+                continue
+            rate = to_decimal(rate)
+            self.rates[code] = rate
+            self.reciprocals[code] = context.divide(ONE, rate)
+
+        self._cross: dict[tuple[str, str], Decimal] = {}
+        self._scaled: dict[tuple[str, str], tuple[int, int]] = {}
+        self._context = context
+
+    def cross_rate(self, from_code: str, to_code: str) -> Decimal:
+        """
+        raises:
+            KeyError if the snapshot does not know one of the currencies
+        """
+        if from_code == to_code:
+            return ONE
+
+        if (rate := self._cross.get((from_code, to_code))) is None:
+            rate = self._cross[(from_code, to_code)] = self._context.multiply(
+                self.rates[to_code], self.reciprocals[from_code]
+            )
+        return rate
+
+    def convert_minor(self, amount_minor: int, from_code: str, to_code: str) -> int:
+        """
+        convert_minor with the pair's scaled rate memoized as (multiplier, divisor),
+        so a conversion is one multiplication and at most one divmod.
+        """
+        if (scaled := self._scaled.get((from_code, to_code))) is None:
+            mantissa, exponent = scaled_rate(self.cross_rate(from_code, to_code))
+            shift = exponent - minor_units(from_code) + minor_units(to_code)
+            scaled = self._scaled[(from_code, to_code)] = (
+                mantissa * 10 ** max(shift, 0), 10 ** max(-shift, 0)
+            )
+
+        multiplier, divisor = scaled
+        value = amount_minor * multiplier
+        if divisor == 1:
+            return value
+        return _round_half_even(value, divisor)
+
+
+def convert_exact(amount: Decimal, rate: Decimal, to_code: str) -> Decimal:
+    """Returns amount * rate rounded half-even to the minor units of `to_code`."""
+    return KERNEL_CONTEXT.multiply(amount, rate).quantize(_quantum(to_code), context=KERNEL_CONTEXT)
+
+
+def scaled_rate(rate: Decimal) -> tuple[int, int]:
+    """Splits a Decimal rate into (integer mantissa, power of ten exponent)."""
+    exponent = rate.as_tuple().exponent
+    return int(rate.scaleb(-exponent, context=KERNEL_CONTEXT)), exponent
+
+
+def convert_minor(amount_minor: int, from_code: str, to_code: str, rate: Decimal | tuple[int, int]) -> int:
+    """
+    Scaled-integer variant: `amount_minor` is in minor units of `from_code` (cents),
+    the result is in minor units of `to_code`, rounded half-even. Only Python int
+    arithmetic is involved, no Decimal context.
+    """
+    mantissa, exponent = scaled_rate(rate) if isinstance(rate, Decimal) else rate
+    shift = exponent - minor_units(from_code) + minor_units(to_code)
+
+    value = amount_minor * mantissa
+    if shift >= 0:
+        return value * 10 ** shift
+    return _round_half_even(value, 10 ** -shift)
+
+
+def _round_half_even(value: int, divisor: int) -> int:
+    quotient, remainder = divmod(value, divisor)
+    if 2 * remainder > divisor or (2 * remainder == divisor and quotient & 1):
+        quotient += 1
+    return quotient
@@ -0,0 +1,253 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+
+import numpy as np
+import requests
+
+from .api import fetch_currency_rates_on
+from .config import HISTORY_DIR, INT64_MAX, PIVOT_CURRENCY
+
+
+def to_date(value: date | str) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+class RateHistory:
+    """
+    Append-only store of daily rate snapshots of one base currency.
+
+    On disk there are three files per base: `codes.json` (the manifest: column order),
+    `dates.bin` (int32 day ordinals in append order) and `rates.<width>.bin` (one
+    float64 row per date, one column per code, NaN where a currency was unknown). Rows
+    are only ever appended, so backfilling older dates is cheap; a sorted view of the
+    dates is kept in memory and every date lookup is a binary search.
+
+    Crash safety: a row is appended before its date and _load cuts both files back to
+    the rows that have a date, so an interrupted append is discarded instead of
+    shifting every later row. Widening writes a new rates file for the new width and
+    then replaces the manifest, which is the single commit point.
+    """
+
+    def __init__(self, directory: str = HISTORY_DIR, base: str = PIVOT_CURRENCY):
+        self.base = base
+        self.path = os.path.join(directory, base)
+        self.codes_path = os.path.join(self.path, 'codes.json')
+        self.dates_path = os.path.join(self.path, 'dates.bin')
+        self.rates_path = self._rates_path(0)
+
+        self.codes: list[str] = []
+        self.index: dict[str, int] = {}
+        self.dates: np.ndarray = np.empty(0, dtype=np.int32)
+        self.rates: np.ndarray = np.empty((0, 0), dtype=np.float64)
+
+        self._sorted_dates: np.ndarray = self.dates
+        self._order: np.ndarray = np.empty(0, dtype=np.intp)
+
+        # დღეები, რომლებზეც API-მ snapshot არ დააბრუნა (შაბათ-კვირა, მომავალი) - get_rate მათ თავიდან აღარ ითხოვს
+        self._unavailable: set[int] = set()
+
+        self.__lock = threading.Lock()
+
+        os.makedirs(self.path, exist_ok=True)
+        self._load()
+
+    def _rates_path(self, width: int) -> str:
+        return os.path.join(self.path, f'rates.{width}.bin')
+
+    def _write_manifest(self, codes: list[str]) -> None:
+        tmp_path = self.codes_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({"codes": codes}, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.codes_path)
+
+    def _load(self) -> None:
+        if os.path.exists(self.codes_path):
+            with open(self.codes_path, 'r', encoding='utf-8') as file:
+                self.codes = json.load(file)['codes']
+        self.index = {code: i for i, code in enumerate(self.codes)}
+
+        width = len(self.codes)
+        self.rates_path = self._rates_path(width)
+        self._remove_stale_rates()
+
+        dates = np.fromfile(self.dates_path, dtype=np.int32) if os.path.exists(self.dates_path) else self.dates
+        rows = os.path.getsize(self.rates_path) // (8 * width) if width and os.path.exists(self.rates_path) else 0
+
+        # თუ ჩაწერა შუაში გაწყდა, მხოლოდ ის სრული სტრიქონები რჩება, რომლებსაც თარიღიც აქვთ;
+        # ფაილებიც იჭრება, თორემ შემდეგი append ობოლი სტრიქონის შემდეგ დაწერდა
+        count = min(len(dates), rows)
+        self._truncate(self.dates_path, count * 4)
+        self._truncate(self.rates_path, count * width * 8)
+        self.dates = dates[:count]
+        self.rates = (np.memmap(self.rates_path, dtype=np.float64, mode='r', shape=(count, width))
+                      if count else np.empty((0, width), dtype=np.float64))
+
+        self._order = np.argsort(self.dates, kind='stable')
+        self._sorted_dates = self.dates[self._order]
+
+    @staticmethod
+    def _truncate(path: str, size: int) -> None:
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            os.truncate(path, size)
+
+    def _remove_stale_rates(self) -> None:
+        """Removes rates files of other widths, left over by a _widen that did not reach its manifest."""
+        current = os.path.basename(self.rates_path)
+        for name in os.listdir(self.path):
+            if name.startswith('rates.') and name.endswith(('.bin', '.bin.tmp')) and name != current:
+                os.remove(os.path.join(self.path, name))
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __contains__(self, day: date | str) -> bool:
+        ordinal = to_date(day).toordinal()
+        i = np.searchsorted(self._sorted_dates, ordinal)
+        return i < len(self._sorted_dates) and self._sorted_dates[i] == ordinal
+
+    def _widen(self, new_codes: list[str]) -> None:
+        """Adds columns for currencies the store has not seen yet (rare, rewrites the rates file)."""
+        width = len(self.codes) + len(new_codes)
+        widened = np.full((len(self.dates), width), np.nan, dtype=np.float64)
+        widened[:, :len(self.codes)] = self.rates
+
+        widened_path = self._rates_path(width)
+        with open(widened_path + '.tmp', 'wb') as file:
+            widened.tofile(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(widened_path + '.tmp', widened_path)
+
+        # manifest-ის ჩანაცვლებამდე გაწყვეტისას ძველი (codes, rates) წყვილი რჩება მოქმედი
+        self._write_manifest(self.codes + new_codes)
+
+        old_path, self.rates_path = self.rates_path, widened_path
+        self.rates = widened
+        self.codes = self.codes + new_codes
+        self.index = {code: i for i, code in enumerate(self.codes)}
+        if os.path.exists(old_path):
+            os.remove(old_path)
+
+    def append(self, day: date | str, rates: dict) -> bool:
+        """Appends the snapshot of `day`. Returns False if that date is already stored."""
+        day = to_date(day)
+
+        with self.__lock:
+            if day in self:
+                return False
+
+            if new_codes := sorted(set(rates) - self.index.keys()):
+                self._widen(new_codes)
+
+            row = np.full(len(self.codes), np.nan, dtype=np.float64)
+            for code, rate in rates.items():
+                row[self.index[code]] = rate
+
+            # ჯერ სტრიქონი, მერე თარიღი - ასე გაწყვეტილი ჩაწერა _load-ს არ არევს
+            with open(self.rates_path, 'ab') as file:
+                row.tofile(file)
+            with open(self.dates_path, 'ab') as file:
+                np.array([day.toordinal()], dtype=np.int32).tofile(file)
+
+            ordinal = day.toordinal()
+            self.dates = np.append(self.dates, np.int32(ordinal))
+            self.rates = np.memmap(
+                self.rates_path, dtype=np.float64, mode='r', shape=(len(self.dates), len(self.codes))
+            )
+
+            position = np.searchsorted(self._sorted_dates, ordinal)
+            self._sorted_dates = np.insert(self._sorted_dates, position, ordinal)
+            self._order = np.insert(self._order, position, len(self.dates) - 1)
+            return True
+
+    def row_on(self, day: date | str) -> int | None:
+        """Returns the row of the newest snapshot on or before `day`, O(log n)."""
+        i = np.searchsorted(self._sorted_dates, to_date(day).toordinal(), side='right') - 1
+        return int(self._order[i]) if i >= 0 else None
+
+    def fetch(self, day: date | str) -> bool:
+        snapshot_date, rates = fetch_currency_rates_on(self.base, to_date(day).isoformat())
+        return self.append(snapshot_date, rates)
+
+    def backfill(self, start: date | str, end: date | str, max_workers: int = 8) -> int:
+        """
+        Fetches every missing date in [start, end] with at most `max_workers` requests
+        in flight. Returns the number of snapshots added; dates the API does not have
+        or that fail to download are skipped.
+        """
+        start, end = to_date(start), to_date(end)
+        missing = [
+            start + timedelta(days=i)
+            for i in range((end - start).days + 1)
+            if start + timedelta(days=i) not in self
+        ]
+
+        added = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(fetch_currency_rates_on, self.base, day.isoformat())
+                for day in missing
+            ]
+
+            for future in as_completed(futures):
+                try:
+                    snapshot_date, rates = future.result()
+                except requests.RequestException:
+                    continue
+
+                added += self.append(snapshot_date, rates)
+
+        return added
+
+    def get_rate(self, from_code: str, to_code: str, on: date | str) -> float:
+        """
+        Returns the `from_code` -> `to_code` rate of the snapshot for `on`. A missing
+        snapshot is fetched first; if the API has none for that day (weekend,
+        future date) the newest earlier snapshot is used, and the day is not asked
+        for again by this instance. A failed download falls back the same way but is
+        retried on the next call.
+
+        raises:
+            KeyError if no snapshot on or before `on` knows both currencies
+        """
+        if from_code == to_code:
+            return 1.0
+
+        ordinal = to_date(on).toordinal()
+        if ordinal not in self._unavailable and on not in self:
+            try:
+                self.fetch(on)
+            except requests.HTTPError as e:
+                if e.response is not None and e.response.status_code == 404:
+                    self._unavailable.add(ordinal)
+            except requests.RequestException:
+                pass
+            else:
+                # API-მ უახლოესი წინა snapshot დააბრუნა
+                if on not in self:
+                    self._unavailable.add(ordinal)
+
+        if (row := self.row_on(on)) is None:
+            raise KeyError(f"no {self.base} snapshot on or before {on}")
+
+        base_rates = self.rates[row]
+        from_rate = 1.0 if from_code == self.base else base_rates[self.index[from_code]]
+        to_rate = 1.0 if to_code == self.base else base_rates[self.index[to_code]]
+
+        rate = to_rate / from_rate
+        if not rate > 0:
+            raise KeyError(f"{from_code}/{to_code} is unknown on {on}")
+
+        return float(rate)
+
+    def convert(self, amount: float, from_code: str, to_code: str, on: date | str) -> float:
+        """Converts `amount` at the rates of the booking date `on`, with the converters' amount rules."""
+        if not 0 <= amount < INT64_MAX:
+            raise ValueError(f"Invalid amount: {amount}")
+
+        return amount * self.get_rate(from_code.lower(), to_code.lower(), on)
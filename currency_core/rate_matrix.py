@@ -0,0 +1,273 @@
+import threading
+import time
+from decimal import Decimal
+
+import numpy as np
+import requests
+
+from .api import fetch_currency_rates
+from .config import PIVOT_CURRENCY
+from .exact import ONE, ExactRateTable, to_decimal
+from .rate_store import RateStore
+
+
+class RateSnapshot:
+    """
+    One pivot snapshot: the sorted codes, their index, the rate array and the exact table.
+
+    Never changed after it is built. A new currency shifts the index of every later code,
+    so the index and the array are only meaningful together; RateMatrix publishes a new
+    snapshot with a single reference assignment and readers take one reference to it.
+    """
+
+    __slots__ = ('codes', 'index', 'rates', 'exact', 'snapshot_date', 'fetched_at')
+
+    def __init__(self, rates: dict, snapshot_date: str | None, fetched_at: float):
+        codes = tuple(sorted(rates))
+        values = np.array([rates[code] for code in codes], dtype=np.float64)
+
+        # ნულოვანი ან არავალიდური კურსი ისე აღირიცხება, თითქოს ვალუტა საერთოდ არ იყოს
+        values[~(values > 0)] = np.nan
+        values.flags.writeable = False
+
+        self.codes = codes
+        self.index = {code: i for i, code in enumerate(codes)}
+        self.rates = values
+        self.exact = ExactRateTable(rates)
+        self.snapshot_date = snapshot_date
+        self.fetched_at = fetched_at
+
+    def cross_rate(self, from_code: str, to_code: str) -> float | None:
+        """rates[to] / rates[from], or None if the snapshot does not know one of the codes."""
+        i = self.index.get(from_code)
+        j = self.index.get(to_code)
+        if i is None or j is None:
+            return None
+
+        rate = self.rates[j] / self.rates[i]
+        return None if np.isnan(rate) else float(rate)
+
+
+class RateMatrix:
+    """
+    Derives every currency pair from a single pivot snapshot.
+
+    The pivot rates live in a NumPy array indexed by currency code, so a cross rate
+    is just rates[to] / rates[from]. The per-base fetch is only used as a fallback
+    when the pivot snapshot does not know one of the currencies.
+
+    The current RateSnapshot is replaced as a whole, so lookups from other threads
+    (executors, the refresher) never see the index of one snapshot with the rates of another.
+    Refreshes are serialized by their own lock, which is held across the upstream fetch;
+    the lock peek_rate may take only guards the swap, so a UI thread never waits on HTTP.
+    """
+
+    def __init__(self, store: RateStore, pivot: str = PIVOT_CURRENCY, max_age: float = 3600):
+        self.store = store
+        self.pivot = pivot
+        self.max_age = max_age
+
+        self.__snapshot = RateSnapshot({}, None, 0.0)
+        # __lock მხოლოდ snapshot-ის ჩანაცვლებას იცავს, __refresh_lock კი fetch-ის ჩათვლით ეჭირება refresh-ს
+        self.__lock = threading.Lock()
+        self.__refresh_lock = threading.Lock()
+
+    @property
+    def snapshot(self) -> RateSnapshot:
+        return self.__snapshot
+
+    @property
+    def codes(self) -> tuple[str, ...]:
+        return self.__snapshot.codes
+
+    @property
+    def snapshot_date(self) -> str | None:
+        return self.__snapshot.snapshot_date
+
+    @property
+    def fetched_at(self) -> float:
+        return self.__snapshot.fetched_at
+
+    def load(self, rates: dict, snapshot_date: str, fetched_at: float | None = None) -> None:
+        """Publishes a new pivot snapshot."""
+        self.__snapshot = RateSnapshot(rates, snapshot_date, time.time() if fetched_at is None else fetched_at)
+
+    def _publish(self, rates: dict, snapshot_date: str, fetched_at: float) -> None:
+        """Publishes a snapshot unless a newer one was published in the meantime."""
+        snapshot = RateSnapshot(rates, snapshot_date, fetched_at)
+        with self.__lock:
+            if fetched_at > self.__snapshot.fetched_at:
+                self.__snapshot = snapshot
+
+    def refresh(self, max_age: float | None = None) -> None:
+        """
+        Reloads the pivot snapshot from the store, or from the API if the stored one is stale.
+        If the API can not be reached, stale rates are kept rather than failing.
+        Concurrent callers wait for the refresh in flight and then find the rates fresh.
+        """
+        max_age = self.max_age if max_age is None else max_age
+
+        with self.__refresh_lock:
+            if self.is_fresh(max_age):
+                return
+
+            if ((stored := self.store.latest(self.pivot)) is not None and
+                    stored[2] > self.fetched_at and time.time() - stored[2] <= max_age):
+                snapshot_date, pivot_rates, fetched_at = stored
+                self._publish(pivot_rates, snapshot_date, fetched_at)
+                return
+
+            try:
+                snapshot_date, pivot_rates = fetch_currency_rates(self.pivot)
+            except requests.RequestException:
+                # API მიუწვდომელია (ან circuit breaker ღიაა) - ვაგრძელებთ ძველი კურსებით, თუ გვაქვს
+                if stored is not None and stored[2] > self.fetched_at:
+                    snapshot_date, pivot_rates, fetched_at = stored
+                    self._publish(pivot_rates, snapshot_date, fetched_at)
+                elif not self.__snapshot.index:
+                    raise
+                return
+
+            self.store.put(self.pivot, pivot_rates, snapshot_date)
+            self._publish(pivot_rates, snapshot_date, time.time())
+
+    def is_fresh(self, max_age: float | None = None) -> bool:
+        return time.time() - self.fetched_at <= (self.max_age if max_age is None else max_age)
+
+    def peek_rate(self, from_code: str, to_code: str) -> float | None:
+        """
+        Returns the pair rate from what is already in memory or in the store, regardless
+        of its age, or None if it is unknown. Never fetches, so it is safe on a UI thread.
+        """
+        if from_code == to_code:
+            return 1.0
+
+        snapshot = self.__snapshot
+        if not snapshot.index and (stored := self.store.latest(self.pivot)) is not None:
+            snapshot_date, pivot_rates, fetched_at = stored
+            self._publish(pivot_rates, snapshot_date, fetched_at)
+            snapshot = self.__snapshot
+
+        if (rate := snapshot.cross_rate(from_code, to_code)) is not None:
+            return rate
+
+        if (stored := self.store.latest(from_code)) is not None:
+            return stored[1].get(to_code)
+
+        return None
+
+    def get_rate(self, from_code: str, to_code: str, max_age: float | None = None) -> float:
+        """
+        Returns how many `to_code` one `from_code` is worth.
+
+        raises:
+            KeyError if neither the pivot snapshot nor the `from_code` rates know the pair
+        """
+        if from_code == to_code:
+            return 1.0
+
+        self.refresh(max_age)
+
+        if (rate := self.__snapshot.cross_rate(from_code, to_code)) is not None:
+            return rate
+
+        return self._get_base_rate(from_code, to_code, max_age)
+
+    def get_exact_rate(self, from_code: str, to_code: str, max_age: float | None = None) -> Decimal:
+        """Decimal version of get_rate, taken from the precomputed exact table when possible."""
+        if from_code == to_code:
+            return ONE
+
+        self.refresh(max_age)
+
+        # float-ი და exact ერთი და იმავე snapshot-იდან
+        snapshot = self.__snapshot
+        if snapshot.cross_rate(from_code, to_code) is None:
+            return to_decimal(self._get_base_rate(from_code, to_code, max_age))
+        try:
+            return snapshot.exact.cross_rate(from_code, to_code)
+        except KeyError:
+            return to_decimal(snapshot.cross_rate(from_code, to_code))
+
+    def peek_exact_rate(self, from_code: str, to_code: str) -> Decimal | None:
+        """Decimal version of peek_rate."""
+        snapshot = self.__snapshot
+        if (rate := self.peek_rate(from_code, to_code)) is None:
+            return None
+        if snapshot.cross_rate(from_code, to_code) is None:
+            return to_decimal(rate)
+        try:
+            return snapshot.exact.cross_rate(from_code, to_code)
+        except KeyError:
+            return to_decimal(rate)
+
+    def get_rates(self, from_codes: np.ndarray, to_codes: np.ndarray, max_age: float | None = None) -> np.ndarray:
+        """
+        Vectorized get_rate over arrays of codes. Only distinct codes are looked up in the
+        index, pairs the snapshot cannot derive fall back to per-base rates.
+        """
+        self.refresh(max_age)
+        snapshot = self.__snapshot
+
+        from_codes = np.asarray(from_codes, dtype=str)
+        to_codes = np.asarray(to_codes, dtype=str)
+
+        unique_codes, inverse = np.unique(np.concatenate([from_codes, to_codes]), return_inverse=True)
+        unique_index = np.array([snapshot.index.get(code, -1) for code in unique_codes], dtype=np.intp)
+        from_index = unique_index[inverse[:len(from_codes)]]
+        to_index = unique_index[inverse[len(from_codes):]]
+
+        # -1 ინდექსი (უცნობი ვალუტა) NaN-ს იძლევა, რომელსაც ქვემოთ fallback ავსებს
+        padded = np.append(snapshot.rates, np.nan)
+        result = padded[to_index] / padded[from_index]
+        result[from_codes == to_codes] = 1.0
+
+        missing = np.flatnonzero(np.isnan(result))
+        if missing.size:
+            pairs, pair_inverse = np.unique(
+                np.stack([from_codes[missing], to_codes[missing]], axis=1), axis=0, return_inverse=True
+            )
+            pair_rates = np.array([self._get_base_rate(from_code, to_code, max_age) for from_code, to_code in pairs])
+            result[missing] = pair_rates[pair_inverse.reshape(-1)]
+
+        return result
+
+    def get_base_rates(self, base: str, max_age: float | None = None) -> tuple[str | None, dict[str, float]]:
+        """
+        Returns (snapshot_date, {code: rate}) of every currency against `base`. Derived from
+        the pivot snapshot when it knows `base`, otherwise the per-base rates are used.
+        """
+        self.refresh(max_age)
+        snapshot = self.__snapshot
+
+        if (i := snapshot.index.get(base)) is not None:
+            base_rates = snapshot.rates / snapshot.rates[i]
+            return snapshot.snapshot_date, {
+                code: float(rate) for code, rate in zip(snapshot.codes, base_rates) if not np.isnan(rate)
+            }
+
+        return self._fetch_base_rates(base, max_age)
+
+    def refresh_base(self, base: str) -> None:
+        """Fetches the per-base rates of `base` now, regardless of the age of the stored ones."""
+        self._fetch_base_rates(base, max_age=0)
+
+    def _fetch_base_rates(self, base: str, max_age: float | None = None) -> tuple[str | None, dict[str, float]]:
+        max_age = self.max_age if max_age is None else max_age
+
+        stored = self.store.latest(base)
+        if stored is not None and self.store.get(base, max_age) is not None:
+            return stored[0], stored[1]
+
+        try:
+            snapshot_date, base_rates = fetch_currency_rates(base)
+        except requests.RequestException:
+            if stored is None:
+                raise
+            return stored[0], stored[1]
+
+        self.store.put(base, base_rates, snapshot_date)
+        return snapshot_date, base_rates
+
+    def _get_base_rate(self, from_code: str, to_code: str, max_age: float | None = None) -> float:
+        return self._fetch_base_rates(from_code, max_age)[1][to_code]
@@ -0,0 +1,149 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .config import RATE_STORE_PATH
+
+
+class RateStore:
+    """
+    Persistent rate cache shared by both currency converters.
+
+    Entries are keyed by (base currency, snapshot date) and kept in SQLite, with an
+    in-memory mirror of the newest snapshot per base, so warm lookups after a restart
+    never touch the disk or the network. Entries older than `ttl_seconds` are evicted,
+    above `max_entries` the least recently used ones go first.
+    """
+
+    def __init__(self, db_path: str = RATE_STORE_PATH, ttl_seconds: int = 86400, max_entries: int = 512):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        # base -> (snapshot_date, rates, fetched_at)
+        self.__latest: dict[str, tuple[str, dict, float]] = {}
+        # base -> last access time, flushed to disk on put/close
+        self.__last_access: dict[str, float] = {}
+        self.__lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS rates (
+                base TEXT NOT NULL,
+                snapshot_date TEXT NOT NULL,
+                rates TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (base, snapshot_date)
+            )
+        ''')
+        self.conn.execute("CREATE INDEX IF NOT EXISTS rates_last_access ON rates (last_access)")
+        self.conn.commit()
+
+        self.evict()
+        self._load_latest()
+
+    def _load_latest(self) -> None:
+        """
+        Loads the newest snapshot of every base into memory. get, latest and put read
+        the dict without the lock, so it is built aside and swapped in as a whole.
+        """
+        rows = self.conn.execute('''
+            SELECT base, snapshot_date, rates, fetched_at FROM rates AS r
+            WHERE snapshot_date = (SELECT MAX(snapshot_date) FROM rates WHERE base = r.base)
+        ''').fetchall()
+
+        self.__latest = {
+            base: (snapshot_date, json.loads(rates), fetched_at)
+            for base, snapshot_date, rates, fetched_at in rows
+        }
+
+    def get(self, base: str, max_age: float | None = None) -> dict | None:
+        """
+        Returns the newest rates of `base` or None if missing or older than `max_age` seconds.
+        `max_age` defaults to the store TTL.
+        """
+        entry = self.__latest.get(base)
+        if entry is None:
+            return None
+
+        now = time.time()
+        if now - entry[2] > (self.ttl_seconds if max_age is None else max_age):
+            return None
+
+        self.__last_access[base] = now
+        return entry[1]
+
+    def latest(self, base: str) -> tuple[str, dict, float] | None:
+        """Returns (snapshot_date, rates, fetched_at) of the newest snapshot of `base`, regardless of age."""
+        return self.__latest.get(base)
+
+    def get_snapshot(self, base: str, snapshot_date: str) -> dict | None:
+        """Returns the rates of `base` for an exact snapshot date, regardless of age."""
+        entry = self.__latest.get(base)
+        if entry is not None and entry[0] == snapshot_date:
+            return entry[1]
+
+        with self.__lock:
+            row = self.conn.execute(
+                "SELECT rates FROM rates WHERE base = ? AND snapshot_date = ?", (base, snapshot_date)
+            ).fetchone()
+
+        return json.loads(row[0]) if row is not None else None
+
+    def put(self, base: str, rates: dict, snapshot_date: str) -> None:
+        now = time.time()
+
+        with self.__lock:
+            self.conn.execute('''
+                INSERT OR REPLACE INTO rates (base, snapshot_date, rates, fetched_at, last_access)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (base, snapshot_date, json.dumps(rates), now, now))
+            self._flush_last_access()
+            self.conn.commit()
+
+            # lock-ის ქვეშ, რომ evict-ის მიერ ჩანაცვლებულ ლექსიკონში არ დაიკარგოს
+            latest = self.__latest.get(base)
+            if latest is None or snapshot_date >= latest[0]:
+                self.__latest[base] = (snapshot_date, rates, now)
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Drops expired entries and, above `max_entries`, the least recently used ones."""
+        expired_before = time.time() - self.ttl_seconds
+
+        with self.__lock:
+            removed = self.conn.execute("DELETE FROM rates WHERE fetched_at < ?", (expired_before,)).rowcount
+            removed += self.conn.execute('''
+                DELETE FROM rates WHERE rowid IN (
+                    SELECT rowid FROM rates ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                )
+            ''', (self.max_entries,)).rowcount
+            self.conn.commit()
+
+            if removed:
+                # მეხსიერებაში მხოლოდ ის ჩანაწერები რჩება, რომლებიც ბაზაშიც არის; ლექსიკონები მთლიანად
+                # იცვლება, რომ lock-ის გარეშე მკითხველმა ნახევრად შევსებული არ დაინახოს
+                self._load_latest()
+                self.__last_access = {}
+
+    def _flush_last_access(self) -> None:
+        if not self.__last_access:
+            return
+
+        self.conn.executemany('''
+            UPDATE rates SET last_access = ?
+            WHERE base = ? AND snapshot_date = (SELECT MAX(snapshot_date) FROM rates WHERE base = ?)
+        ''', [(accessed, base, base) for base, accessed in self.__last_access.items()])
+        self.__last_access.clear()
+
+    def close(self) -> None:
+        with self.__lock:
+            self._flush_last_access()
+            self.conn.commit()
+            self.conn.close()
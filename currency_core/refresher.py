@@ -0,0 +1,187 @@
+import random
+import threading
+import time
+import traceback
+from typing import Callable
+
+import requests
+
+from .config import REFRESH_IDLE_SECONDS, REFRESH_INTERVAL_SECONDS, REFRESH_JITTER, REFRESH_MIN_INTERVAL_SECONDS
+from .rate_matrix import RateMatrix
+
+# subscriber(base, snapshot_date, {code: new rate or None if the currency disappeared})
+Subscriber = Callable[[str, str | None, dict[str, float | None]], None]
+
+
+def diff_rates(old: dict[str, float], new: dict[str, float]) -> dict[str, float | None]:
+    """Returns {code: new rate} of every rate that differs, None for currencies missing from `new`."""
+    changed: dict[str, float | None] = {code: rate for code, rate in new.items() if old.get(code) != rate}
+    changed.update(dict.fromkeys(old.keys() - new.keys()))
+    return changed
+
+
+class RateRefresher:
+    """
+    Keeps the hot bases of a RateMatrix fresh from a background thread, so the
+    conversion path finds fresh rates and never waits on a fetch.
+
+    The pivot snapshot is always hot; any other base becomes hot when `touch`ed and
+    is dropped after `idle_seconds` without conversions. Every base is refreshed on
+    its own jittered schedule by one thread, which waits on a Condition until the
+    earliest base is due, so a newly touched base wakes it at once. After a refresh the
+    new snapshot is diffed against the previous one and subscribers are notified
+    only if a rate actually changed. They are called on the refresher thread.
+    """
+
+    def __init__(
+            self,
+            rates: RateMatrix,
+            interval: float = REFRESH_INTERVAL_SECONDS,
+            jitter: float = REFRESH_JITTER,
+            idle_seconds: float = REFRESH_IDLE_SECONDS
+    ):
+        self.rates = rates
+        self.interval = interval
+        self.jitter = jitter
+        self.idle_seconds = idle_seconds
+
+        # base -> ბოლო კონვერტაციის დრო (monotonic), pivot ყოველთვის აქ არის
+        self.__hot: dict[str, float] = {}
+        # base -> შემდეგი განახლების დრო (monotonic)
+        self.__due: dict[str, float] = {}
+        self.__subscribers: list[Subscriber] = []
+        self.__lock = threading.Lock()
+        # touch() და stop() ამით აღვიძებენ ლოდინში მყოფ ნაკადს
+        self.__wake = threading.Condition(self.__lock)
+
+        self.__stop = threading.Event()
+        self.__thread: threading.Thread | None = None
+
+    def subscribe(self, subscriber: Subscriber) -> Callable[[], None]:
+        """Registers `subscriber` and returns a function that unsubscribes it."""
+        with self.__lock:
+            self.__subscribers.append(subscriber)
+        return lambda: self.unsubscribe(subscriber)
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self.__lock:
+            if subscriber in self.__subscribers:
+                self.__subscribers.remove(subscriber)
+
+    def touch(self, base: str) -> None:
+        """Marks `base` as hot; a base that was not hot yet is refreshed right away if running."""
+        with self.__wake:
+            is_new = base not in self.__hot
+            self.__hot[base] = time.monotonic()
+
+            if is_new and self.__thread is not None:
+                self.__due[base] = time.monotonic()
+                self.__wake.notify()
+
+    def start(self) -> None:
+        if self.__thread is not None:
+            return
+
+        # ყოველ გაშვებას საკუთარი stop Event აქვს: ძველი ნაკადი, თუ ჯერ refresh-შია, ახალს არ ერევა
+        self.__stop = threading.Event()
+        self.touch(self.rates.pivot)
+        with self.__wake:
+            now = time.monotonic()
+            self.__due = {
+                base: now if base == self.rates.pivot else now + self._next_delay() for base in self.__hot
+            }
+
+        self.__thread = threading.Thread(target=self._loop, args=(self.__stop,), name='rate-refresher', daemon=True)
+        self.__thread.start()
+
+    def stop(self, wait: bool = False) -> None:
+        """
+        Stops the schedule. A refresh already in flight (HTTP retries included) is not
+        interrupted; the call returns right away unless `wait` is set.
+        """
+        if self.__thread is None:
+            return
+
+        with self.__wake:
+            self.__stop.set()
+            self.__due.clear()
+            self.__wake.notify()
+
+        if wait:
+            self.__thread.join()
+        self.__thread = None
+
+    def _next_delay(self) -> float:
+        interval = max(self.interval, REFRESH_MIN_INTERVAL_SECONDS)
+        # ჯიტერი: რამდენიმე პროცესი/ბაზა ერთსა და იმავე წამს API-ს არ მიმართავს
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _next_due(self, stop: threading.Event) -> str | None:
+        """Waits until a hot base is due and returns it, or None once `stop` is set."""
+        with self.__wake:
+            while not stop.is_set():
+                now = time.monotonic()
+                base = min(self.__due, key=self.__due.get, default=None)
+                if base is None or self.__due[base] > now:
+                    self.__wake.wait(None if base is None else self.__due[base] - now)
+                    continue
+
+                del self.__due[base]
+                if base != self.rates.pivot and now - self.__hot.get(base, 0) > self.idle_seconds:
+                    # დიდხანს არავინ გადაიყვანა - ბაზა აღარ არის ცხელი
+                    self.__hot.pop(base, None)
+                    continue
+                return base
+        return None
+
+    def _loop(self, stop: threading.Event) -> None:
+        while (base := self._next_due(stop)) is not None:
+            try:
+                self.refresh(base)
+            except Exception:
+                traceback.print_exc()
+            finally:
+                with self.__wake:
+                    if not stop.is_set() and base not in self.__due:
+                        self.__due[base] = time.monotonic() + self._next_delay()
+
+    def refresh(self, base: str) -> dict[str, float | None]:
+        """
+        Refreshes `base` now and notifies subscribers if any of its rates changed.
+        Bases the pivot snapshot already covers are refreshed with the pivot.
+        Returns the changed rates.
+        """
+        if base != self.rates.pivot and base in self.rates.snapshot.index:
+            return {}
+
+        before = self.rates.store.latest(base)
+        try:
+            if base == self.rates.pivot:
+                self.rates.refresh(max_age=0)
+            else:
+                self.rates.refresh_base(base)
+        except requests.RequestException:
+            # შემდეგ ჯერზე ისევ ვცდით, მანამდე ძველი კურსები რჩება
+            return {}
+
+        if (after := self.rates.store.latest(base)) is None or after is before:
+            return {}
+
+        changed = diff_rates(before[1] if before is not None else {}, after[1])
+        if changed:
+            with self.__lock:
+                subscribers = list(self.__subscribers)
+            for subscriber in subscribers:
+                try:
+                    subscriber(base, after[0], changed)
+                except Exception:
+                    # ერთი გაფუჭებული subscriber დანარჩენებს და refresher-ის ნაკადს არ აჩერებს
+                    traceback.print_exc()
+
+        return changed
+
+    def affects(self, base: str, changed: dict[str, float | None], from_code: str, to_code: str) -> bool:
+        """Whether a change notification for `base` changes the rate of the from_code -> to_code pair."""
+        if base == self.rates.pivot:
+            return from_code in changed or to_code in changed
+        return base == from_code and to_code in changed
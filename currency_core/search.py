@@ -0,0 +1,68 @@
+from bisect import bisect_left
+from collections.abc import Iterable, Mapping
+
+# ნებისმიერ ტექსტზე "დიდი" სიმბოლო - prefix-ის დიაპაზონის ზედა საზღვარი
+_PREFIX_END = '\U0010ffff'
+
+
+class CurrencyIndex:
+    """
+    Prefix index over currency codes and names, built once per catalogue load.
+
+    Codes are stored upper-cased and sorted, every word of every name is stored
+    lower-cased and sorted, so an as-you-type search is two binary searches and a
+    slice of precomputed tuples.
+    """
+
+    def __init__(self, currency_names: Mapping[str, str], codes: Iterable[str] | None = None):
+        """
+        arguments:
+            currency_names: {code: name} of the catalogue
+            codes: restricts the index to these codes, defaults to the whole catalogue
+        """
+        codes = {code.upper() for code in (currency_names.keys() if codes is None else codes)}
+
+        # upper-cased code -> name, ვალიდაციის ლეიბლებისთვის
+        self.names: dict[str, str] = {}
+        for code in codes:
+            if (name := currency_names.get(code.lower())) is not None:
+                self.names[code] = name
+
+        # კატალოგში არარსებული, მაგრამ ცალსახად მოთხოვნილი კოდებიც ჩანს dropdown-ში
+        self.codes: tuple[str, ...] = tuple(sorted(codes))
+
+        words = sorted(
+            (word, code)
+            for code, name in self.names.items()
+            for word in set(name.lower().split())
+        )
+        self._words: tuple[str, ...] = tuple(word for word, _ in words)
+        self._word_codes: tuple[str, ...] = tuple(code for _, code in words)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def search(self, prefix: str) -> tuple[str, ...]:
+        """
+        Returns the codes whose code or any name word starts with `prefix` (case-insensitive),
+        code matches first. An empty prefix returns every code.
+        """
+        if not prefix:
+            return self.codes
+
+        code_prefix = prefix.upper()
+        start = bisect_left(self.codes, code_prefix)
+        end = bisect_left(self.codes, code_prefix + _PREFIX_END, start)
+        code_matches = self.codes[start:end]
+
+        word_prefix = prefix.lower()
+        start = bisect_left(self._words, word_prefix)
+        end = bisect_left(self._words, word_prefix + _PREFIX_END, start)
+        if start == end:
+            return code_matches
+
+        seen = set(code_matches)
+        name_matches = tuple(
+            code for code in self._word_codes[start:end] if not (code in seen or seen.add(code))
+        )
+        return code_matches + name_matches
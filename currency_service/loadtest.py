@@ -0,0 +1,63 @@
+import argparse
+import asyncio
+import random
+import time
+
+import aiohttp
+
+PAIRS = [('usd', 'gel'), ('eur', 'usd'), ('gel', 'eur'), ('gbp', 'jpy'), ('usd', 'try'), ('eur', 'gel')]
+
+
+def percentile(latencies: list[float], p: float) -> float:
+    """`latencies` must be sorted."""
+    return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+
+async def run(url: str, total: int, concurrency: int) -> tuple[list[float], int, float]:
+    """Sends `total` random /convert requests, `concurrency` at a time. Returns (latencies, errors, seconds)."""
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker(session: aiohttp.ClientSession) -> None:
+        nonlocal errors
+        for _ in remaining:
+            from_code, to_code = random.choice(PAIRS)
+            params = {'from': from_code, 'to': to_code, 'amount': f"{random.uniform(1, 10_000):.2f}"}
+
+            start_time = time.perf_counter()
+            try:
+                async with session.get(f"{url}/convert", params=params) as response:
+                    await response.read()
+                    errors += response.status != 200
+            except aiohttp.ClientError:
+                errors += 1
+            latencies.append(time.perf_counter() - start_time)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start_time = time.perf_counter()
+        await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+        seconds = time.perf_counter() - start_time
+
+    return latencies, errors, seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test of the conversion service.")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    latencies, errors, seconds = asyncio.run(run(args.url.rstrip('/'), args.requests, args.concurrency))
+    latencies.sort()
+
+    print(f"requests: {len(latencies)} ({errors} errors) in {seconds:.2f}s")
+    print(f"throughput: {len(latencies) / seconds:,.0f} requests/s")
+    print(f"latency: p50 {percentile(latencies, 0.50) * 1000:.2f}ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f}ms, max {latencies[-1] * 1000:.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
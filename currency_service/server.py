@@ -0,0 +1,151 @@
+import argparse
+import asyncio
+import os
+import re
+import sys
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from aiohttp import web
+
+# currency_core საერთოა ორივე კონვერტორისთვის და რეპოზიტორიის root-ში მდებარეობს
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from currency_core import ConversionEngine, RateMatrix, RateRefresher, RateStore, parse_amount  # noqa: E402
+
+# API-ის კოდები პატარა ასოებითა და ციფრებით იწერება (მაგ. usd, 1inch)
+CURRENCY_CODE = re.compile(r'[a-z0-9]{2,10}')
+
+
+class ConversionService:
+    """
+    HTTP front of a ConversionEngine.
+
+    Requests are answered on the event loop from the in-process rate cache. Blocking
+    work (a stale pivot snapshot, a base the snapshot does not know) runs in a thread
+    pool, and concurrent requests that need the same upstream fetch await one shared
+    future instead of fetching again. A request is validated before anything is fetched;
+    a currency is reported unknown (404) only when upstream says so.
+    """
+
+    def __init__(self, engine: ConversionEngine, max_workers: int = 8):
+        self.engine = engine
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='rates')
+        # ცხელი ბაზები ფონურად ახლდება, ასე რომ რექუესტები upstream-ს იშვიათად ელოდება
+        self.refresher = RateRefresher(engine.rates, interval=engine.rates.max_age / 2)
+        self.__in_flight: dict[str, asyncio.Future] = {}
+
+    async def _coalesced(self, key: str, fn: Callable, *args):
+        """Runs fn(*args) in the pool unless a call with the same key is already running."""
+        if (future := self.__in_flight.get(key)) is None:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+            self.__in_flight[key] = future
+            future.add_done_callback(lambda _: self.__in_flight.pop(key, None))
+
+        # shield: ერთი კლიენტის გაუქმება სხვების საერთო fetch-ს არ აუქმებს
+        return await asyncio.shield(future)
+
+    async def _ensure_fresh(self) -> None:
+        if not self.engine.rates.is_fresh():
+            await self._coalesced('pivot', self.engine.rates.refresh)
+
+    async def convert(self, request: web.Request) -> web.Response:
+        query = request.query
+        try:
+            amount, from_code, to_code = query['amount'], query['from'].lower(), query['to'].lower()
+        except KeyError as e:
+            return error_response(400, f"missing query parameter: {e.args[0]}")
+
+        # ჯერ ვალიდაცია, რომ არასწორმა რექუესტმა upstream-ს არ მიმართოს
+        try:
+            parse_amount(amount)
+        except ValueError as e:
+            return error_response(400, str(e))
+        if not (CURRENCY_CODE.fullmatch(from_code) and CURRENCY_CODE.fullmatch(to_code)):
+            return error_response(400, f"invalid currency code: {from_code}/{to_code}")
+
+        try:
+            await self._ensure_fresh()
+            result = self.engine.peek(amount, from_code, to_code)
+            if result is None:
+                # snapshot-ში წყვილი არ არის - from_code-ის საკუთარი კურსები ერთხელ ჩამოიტვირთება,
+                # რამდენ სამიზნე ვალუტასაც არ უნდა ითხოვდნენ (იგივე fetch, რაც /rates/{base}-ს)
+                await self._coalesced(f"rates:{from_code}", self.engine.base_rates, from_code)
+                result = self.engine.peek(amount, from_code, to_code)
+        except requests.RequestException as e:
+            if is_not_found(e):
+                return error_response(404, f"unknown currency: {from_code}")
+            return error_response(502, "rates are unavailable")
+
+        if result is None:
+            return error_response(404, f"unknown currency pair: {from_code}/{to_code}")
+
+        # მხოლოდ ნამდვილი წყვილის ბაზა ხდება ცხელი - უცნობი კოდები ფონურ fetch-ებს არ ამრავლებს
+        self.refresher.touch(from_code)
+
+        return web.json_response({
+            'from': from_code,
+            'to': to_code,
+            'amount': amount,
+            'result': str(result),
+            'snapshot_date': self.engine.rates.snapshot_date
+        })
+
+    async def rates(self, request: web.Request) -> web.Response:
+        base = request.match_info['base'].lower()
+        if not CURRENCY_CODE.fullmatch(base):
+            return error_response(400, f"invalid currency code: {base}")
+        try:
+            await self._ensure_fresh()
+            snapshot_date, base_rates = await self._coalesced(f"rates:{base}", self.engine.base_rates, base)
+        except requests.RequestException as e:
+            if is_not_found(e):
+                return error_response(404, f"unknown currency: {base}")
+            return error_response(502, "rates are unavailable")
+
+        return web.json_response({'base': base, 'date': snapshot_date, 'rates': base_rates})
+
+    async def start(self, _app: web.Application) -> None:
+        self.refresher.start()
+
+    async def close(self, _app: web.Application) -> None:
+        self.refresher.stop()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def is_not_found(error: requests.RequestException) -> bool:
+    """Whether upstream answered 404, i.e. it does not know the currency (not a failure)."""
+    return error.response is not None and error.response.status_code == 404
+
+
+def error_response(status: int, message: str) -> web.Response:
+    return web.json_response({'error': message}, status=status)
+
+
+def create_app(engine: ConversionEngine | None = None) -> web.Application:
+    service = ConversionService(engine or ConversionEngine())
+
+    app = web.Application()
+    app.add_routes([
+        web.get('/convert', service.convert),
+        web.get('/rates/{base}', service.rates),
+    ])
+    app.on_startup.append(service.start)
+    app.on_cleanup.append(service.close)
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Currency conversion HTTP service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-age", type=float, default=3600, help="maximum age of cached rates in seconds")
+    args = parser.parse_args()
+
+    engine = ConversionEngine(RateMatrix(RateStore(), max_age=args.max_age))
+    web.run_app(create_app(engine), host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,24 @@
+from .checkpoint import Checkpoint, open_checkpoint
+from .codec import (
+    ALBUM_SCHEMA,
+    COMMENT_SCHEMA,
+    PHOTO_SCHEMA,
+    POST_SCHEMA,
+    USER_SCHEMA,
+    ParsePool,
+    decode_batch,
+    decode_record,
+)
+from .http_cache import CACHE_FILE, HttpCache
+from .output import (
+    FORMATS,
+    JSON_ARRAY,
+    NDJSON,
+    AsyncBatchWriter,
+    StreamingWriter,
+    external_sort,
+    read_records,
+    write_records,
+)
+from .metrics import PERCENTILES, PHASES, FetchMetrics, LatencyHistogram, aiohttp_trace_config, trace_phases
+from .scheduler import AimdLimit, FetchScheduler, RetryPolicy, TokenBucket
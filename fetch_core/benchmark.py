@@ -0,0 +1,190 @@
+"""
+Compares the fetch strategies against a local mock server:
+
+    threaded  a thread and a new connection per post, like the original assignment_3
+    pooled    assignment_3's PostFetcher: a bounded thread pool over one pooled Session
+    asyncio   assignment_4's PostFetcher: one aiohttp session, semaphore-bounded tasks
+
+    python -m fetch_core.benchmark --sizes 100 10000 100000 --latency-ms 20 --output results.json
+
+Every (strategy, size) runs in a fresh child process, so its peak RSS is its own. The
+server runs in this process with the same seed for every run, so every run sees the
+same per-post latencies and failures. Absolute numbers are bounded by the
+thread-per-connection mock server; compare strategies within one run of the suite.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+from .metrics import FetchMetrics
+from .mock_server import MockServer, add_config_arguments, config_from_args
+from .output import NDJSON, StreamingWriter
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STRATEGIES = ('threaded', 'pooled', 'asyncio')
+SIZES = (100, 10_000, 100_000)
+
+
+def peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux-ზე KiB-შია, macOS-ზე ბაიტებში
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+
+def fetch_thread_per_post(api: str, post_ids: range, concurrency: int) -> FetchMetrics:
+    """The original strategy: a new thread and connection per post, at most `concurrency` alive."""
+    metrics = FetchMetrics()
+    slots = threading.BoundedSemaphore(concurrency)
+
+    def fetch(post_id: int) -> None:
+        try:
+            start_time = time.perf_counter()
+            response = requests.get(api.format(post_id=post_id))
+            if response.status_code != 200:
+                metrics.record_error()
+                return
+            writer.write(response.json())
+            metrics.record(post_id, {'total': time.perf_counter() - start_time})
+        except requests.RequestException:
+            metrics.record_error()
+        finally:
+            slots.release()
+
+    threads = []
+    with StreamingWriter('data.ndjson', NDJSON) as writer:
+        metrics.start()
+        for post_id in post_ids:
+            slots.acquire()
+            thread = threading.Thread(target=fetch, args=(post_id,))
+            thread.start()
+            threads.append(thread)
+            if len(threads) > concurrency * 4:
+                threads = [thread for thread in threads if thread.is_alive()]
+        for thread in threads:
+            thread.join()
+        metrics.stop()
+    return metrics
+
+
+def run_strategy(strategy: str, api: str, count: int, concurrency: int) -> FetchMetrics:
+    sys.path.append(os.path.join(ROOT_DIR, 'assignment_3'))
+    sys.path.append(os.path.join(ROOT_DIR, 'assignment_4'))
+
+    if strategy == 'threaded':
+        return fetch_thread_per_post(api, range(1, count + 1), concurrency)
+
+    if strategy == 'pooled':
+        from jsonplaceholder import PostFetcher
+        fetcher = PostFetcher(count, 1, concurrency, NDJSON, sort_output=False, api=api)
+        fetcher.main()
+        return fetcher.metrics
+
+    import asyncio
+    from async_request import PostFetcher
+    fetcher = PostFetcher(count, 1, concurrency, concurrency, NDJSON, api)
+    asyncio.run(fetcher.main())
+    return fetcher.metrics
+
+
+def run_child(strategy: str, api: str, count: int, concurrency: int) -> dict:
+    """Runs one strategy in this process (the child) and returns its measurements."""
+    rss_before = peak_rss_mb()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        metrics = run_strategy(strategy, api, count, concurrency)
+
+    summary = metrics.summary()
+    return {
+        "strategy": strategy,
+        "posts": count,
+        "concurrency": concurrency,
+        "fetched": summary["requests"],
+        "errors": summary["errors"],
+        "seconds": summary["total_time"],
+        "requests_per_second": summary["requests_per_second"],
+        "latency_ms": summary["latency"].get("total", {}),
+        "throughput": summary["throughput"],
+        "rss_before_mb": rss_before,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run_suite(args: argparse.Namespace) -> list[dict]:
+    results = []
+    with MockServer(config_from_args(args)) as server:
+        for size in args.sizes:
+            for strategy in args.strategies:
+                server.reset()
+                # ყოველი გაშვება ცარიელ დირექტორიაში და ახალ პროცესში
+                with tempfile.TemporaryDirectory() as work_dir:
+                    completed = subprocess.run(
+                        [
+                            sys.executable, '-m', 'fetch_core.benchmark', '--child', strategy,
+                            '--api', server.api, '--count', str(size), '--concurrency', str(args.concurrency)
+                        ],
+                        cwd=work_dir,
+                        env={**os.environ, 'PYTHONPATH': ROOT_DIR},
+                        capture_output=True,
+                        text=True,
+                        check=True
+                    )
+                result = json.loads(completed.stdout.splitlines()[-1])
+                results.append(result)
+                print(format_result(result), flush=True)
+    return results
+
+
+def format_result(result: dict) -> str:
+    latency = result["latency_ms"]
+    return (
+        f"{result['strategy']:>8} {result['posts']:>7}  {result['requests_per_second']:>8.0f} req/s"
+        f"  p50={latency.get('p50_ms', 0):.1f}  p99={latency.get('p99_ms', 0):.1f}"
+        f"  p99.9={latency.get('p999_ms', 0):.1f}  max={latency.get('max_ms', 0):.1f} ms"
+        f"  errors={result['errors']}  peak RSS={result['peak_rss_mb'] or 0:.0f} MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks the fetch strategies against a local mock server.")
+    parser.add_argument("--sizes", type=int, nargs='+', default=list(SIZES))
+    parser.add_argument("--strategies", choices=STRATEGIES, nargs='+', default=list(STRATEGIES))
+    parser.add_argument("--concurrency", type=int, default=64, help="threads / tasks in flight, for every strategy")
+    parser.add_argument("--output", default=None, help="write the results as JSON to this file")
+    parser.add_argument("--child", choices=STRATEGIES, help=argparse.SUPPRESS)
+    parser.add_argument("--api", help=argparse.SUPPRESS)
+    parser.add_argument("--count", type=int, help=argparse.SUPPRESS)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.api, args.count, args.concurrency)))
+        return
+
+    print(f"{'strategy':>8} {'posts':>7}")
+    results = run_suite(args)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "server": config_from_args(args).to_dict(),
+                "results": results,
+            }, file, indent=4)
+
+
+if __name__ == '__main__':
+    main()
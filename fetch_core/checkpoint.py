@@ -0,0 +1,152 @@
+import json
+import os
+import time
+from collections.abc import Iterator
+
+CHECKPOINT_INTERVAL_SECONDS = 5.0
+
+
+class Checkpoint:
+    """
+    Which posts of a run already are in its output file: one bit per id of
+    first_id .. first_id + count - 1, so a million posts take 125 KB.
+
+    The output writer marks the ids of every batch after writing it and, at most every
+    `interval` seconds, fsyncs the output and saves the bitmap together with the
+    output's size at that moment. The file is a JSON header line followed by the raw
+    bitmap, replaced atomically. Resuming truncates the output back to the saved size,
+    so ids marked after the last save are fetched again instead of being duplicated.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            first_id: int,
+            count: int,
+            output_format: str,
+            interval: float = CHECKPOINT_INTERVAL_SECONDS
+    ):
+        self.path = path
+        self.first_id = first_id
+        self.count = count
+        self.output_format = output_format
+        self.interval = interval
+
+        self.bitmap = bytearray((count + 7) // 8)
+        self.done = 0
+        self.output_offset: int | None = None
+        self.__saved_at = time.monotonic()
+
+    @classmethod
+    def load(cls, path: str, interval: float = CHECKPOINT_INTERVAL_SECONDS) -> 'Checkpoint | None':
+        """The checkpoint saved at `path`, or None if there is none."""
+        try:
+            with open(path, 'rb') as file:
+                header = json.loads(file.readline())
+                bitmap = file.read()
+        except FileNotFoundError:
+            return None
+
+        checkpoint = cls(path, header['first_id'], header['count'], header['format'], interval)
+        if len(bitmap) != len(checkpoint.bitmap):
+            raise ValueError(f"checkpoint {path} is damaged")
+
+        checkpoint.bitmap[:] = bitmap
+        checkpoint.done = header['done']
+        checkpoint.output_offset = header['output_offset']
+        return checkpoint
+
+    def covers(self, first_id: int, count: int, output_format: str) -> bool:
+        return (self.first_id, self.count, self.output_format) == (first_id, count, output_format)
+
+    def is_done(self, post_id: int) -> bool:
+        index = post_id - self.first_id
+        return bool(self.bitmap[index >> 3] & (1 << (index & 7)))
+
+    def mark(self, post_id: int) -> None:
+        index = post_id - self.first_id
+        if not 0 <= index < self.count:
+            return
+
+        mask = 1 << (index & 7)
+        if not self.bitmap[index >> 3] & mask:
+            self.bitmap[index >> 3] |= mask
+            self.done += 1
+
+    def pending(self) -> Iterator[int]:
+        """Ids not in the output yet, in order."""
+        for index, byte in enumerate(self.bitmap):
+            # სრულად დასრულებული ბაიტი (8 პოსტი) ერთი შემოწმებით გამოიტოვება
+            if byte == 0xFF:
+                continue
+            for bit in range(8):
+                post_index = (index << 3) + bit
+                if post_index < self.count and not byte & (1 << bit):
+                    yield self.first_id + post_index
+
+    def due(self) -> bool:
+        return time.monotonic() - self.__saved_at >= self.interval
+
+    def save(self, output_offset: int) -> None:
+        """Saves the bitmap for an output that is durable up to `output_offset` bytes."""
+        self.output_offset = output_offset
+        header = json.dumps({
+            "first_id": self.first_id,
+            "count": self.count,
+            "format": self.output_format,
+            "done": self.done,
+            "output_offset": output_offset,
+        })
+
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as file:
+            file.write(header.encode('utf-8') + b'\n')
+            file.write(self.bitmap)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
+        self.__saved_at = time.monotonic()
+
+
+def sync_checkpoint(checkpoint: Checkpoint | None, file, ids: list[int], force: bool = False) -> None:
+    """
+    Marks the `ids` of a batch that was just written to `file`; when the checkpoint is
+    due (or `force`), makes the output durable and saves the checkpoint at its size.
+    """
+    if checkpoint is None:
+        return
+
+    for post_id in ids:
+        checkpoint.mark(post_id)
+
+    if force or checkpoint.due():
+        file.flush()
+        os.fsync(file.fileno())
+        checkpoint.save(file.tell())
+
+
+def open_checkpoint(path: str, post_ids: range, output_format: str, resume: bool) -> tuple[Checkpoint, bool]:
+    """
+    The checkpoint of a run over `post_ids` and whether it continues a previous one:
+    with `resume` the saved checkpoint is loaded (it must cover the same run), otherwise
+    or when there is none a new one is started.
+
+    raises:
+        ValueError: if the saved checkpoint belongs to a different range or format
+    """
+    checkpoint = Checkpoint.load(path) if resume else None
+    if checkpoint is None or checkpoint.output_offset is None:
+        # წინა გაშვების checkpoint ახალ output-ს აღარ შეესაბამება
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        return Checkpoint(path, post_ids.start, len(post_ids), output_format), False
+
+    if not checkpoint.covers(post_ids.start, len(post_ids), output_format):
+        last_id = checkpoint.first_id + checkpoint.count - 1
+        raise ValueError(
+            f"checkpoint {path} covers posts {checkpoint.first_id}..{last_id} ({checkpoint.output_format}), "
+            f"not this run"
+        )
+    return checkpoint, True
@@ -0,0 +1,132 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# პოსტის აუცილებელი ველები და მათი ტიპები
+POST_SCHEMA = {"id": int, "userId": int, "title": str, "body": str}
+# crawl-ის დანარჩენი რესურსებიდან მხოლოდ ის ველები, რომლებითაც ისინი ერთმანეთს უკავშირდება
+USER_SCHEMA = {"id": int}
+COMMENT_SCHEMA = {"id": int, "postId": int}
+ALBUM_SCHEMA = {"id": int, "userId": int}
+PHOTO_SCHEMA = {"id": int, "albumId": int}
+
+
+def loads(data: bytes | str):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def dumps(record) -> str:
+    """
+    Compact single-line JSON. orjson and the json fallback agree on ordinary records,
+    but not on every value (NaN, integers beyond 64 bits, some floats), so a written
+    file is never re-encoded: external_sort moves its lines as they are.
+    """
+    if orjson is not None:
+        return orjson.dumps(record).decode('utf-8')
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+
+
+def validate(record, schema: dict[str, type]) -> str | None:
+    """None if `record` is an object with every field of `schema` of the right type, otherwise why not."""
+    if not isinstance(record, dict):
+        return f"expected an object, got {type(record).__name__}"
+
+    for field, field_type in schema.items():
+        value = record.get(field)
+        # bool-ი int-ის ქვეკლასია, მაგრამ id-ად არ გამოდგება
+        if not isinstance(value, field_type) or (field_type is int and isinstance(value, bool)):
+            return f"field {field!r} must be {field_type.__name__}"
+    return None
+
+
+def decode_record(body: bytes, schema: dict[str, type], many: bool = False) -> tuple[object, str | None]:
+    """
+    Decodes and validates one response body: an object, or an array of objects if `many`.
+    Returns (record, None), or (None, why it was rejected).
+    """
+    try:
+        record = loads(body)
+    except ValueError as e:
+        return None, f"invalid JSON: {e}"
+
+    if not many:
+        return (None, error) if (error := validate(record, schema)) is not None else (record, None)
+
+    if not isinstance(record, list):
+        return None, f"expected an array, got {type(record).__name__}"
+    for item in record:
+        if (error := validate(item, schema)) is not None:
+            return None, error
+    return record, None
+
+
+def decode_batch(
+        bodies: list[bytes], schema: dict[str, type] | None = None
+) -> tuple[list[int], list[str], list[tuple[int, str]]]:
+    """
+    Decodes, validates and re-encodes raw response bodies. Returns the ids and the compact
+    lines of the valid ones and (position in `bodies`, message) of every rejected one.
+    A body that is not a JSON object is rejected even without a `schema`.
+    Module level, so that ProcessPoolExecutor workers can run it.
+    """
+    ids, lines, errors = [], [], []
+    for position, body in enumerate(bodies):
+        try:
+            record = loads(body)
+        except ValueError as e:
+            errors.append((position, f"invalid JSON: {e}"))
+            continue
+
+        # schema-ს გარეშეც მხოლოდ ობიექტები გადის - მასივს ან რიცხვს id არ აქვს
+        if (error := validate(record, schema or {})) is not None:
+            errors.append((position, error))
+            continue
+
+        ids.append(record.get('id'))
+        lines.append(dumps(record))
+    return ids, lines, errors
+
+
+class ParsePool:
+    """
+    decode_batch on a ProcessPoolExecutor, for fetch rates at which parsing would
+    otherwise hold the GIL the I/O threads or the event loop need.
+
+    A batch is split into one chunk per process; only raw bytes go in and encoded
+    lines come back, so the records never have to be pickled as objects.
+    """
+
+    def __init__(self, processes: int, min_chunk: int = 64):
+        self.processes = processes
+        self.min_chunk = min_chunk
+        self.__executor = ProcessPoolExecutor(max_workers=processes)
+
+    def decode(
+            self, bodies: list[bytes], schema: dict[str, type] | None = None
+    ) -> tuple[list[int], list[str], list[tuple[int, str]]]:
+        """Like decode_batch, in the pool; blocks the calling (writer) thread until done."""
+        chunk_size = max(self.min_chunk, -(-len(bodies) // self.processes))
+        starts = range(0, len(bodies), chunk_size)
+        chunks = [bodies[start:start + chunk_size] for start in starts]
+
+        ids, lines, errors = [], [], []
+        for start, (chunk_ids, chunk_lines, chunk_errors) in zip(starts, self.__executor.map(
+                decode_batch, chunks, [schema] * len(chunks)
+        )):
+            ids += chunk_ids
+            lines += chunk_lines
+            errors += [(start + position, error) for position, error in chunk_errors]
+        return ids, lines, errors
+
+    def close(self) -> None:
+        self.__executor.shutdown()
+
+    def __enter__(self) -> 'ParsePool':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
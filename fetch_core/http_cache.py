@@ -0,0 +1,121 @@
+import os
+import sqlite3
+import threading
+import time
+
+CACHE_FILE = "http_cache.sqlite"
+
+
+class HttpCache:
+    """
+    Persistent cache of 200 responses keyed by URL, for conditional refetches.
+
+    Responses that carry an ETag or Last-Modified are stored in SQLite with their body.
+    The validators of every URL are loaded into memory when the cache opens, so building
+    a conditional request (If-None-Match / If-Modified-Since) never touches the disk; a
+    body is read back only when the server answers 304 Not Modified.
+
+    Stores are committed every `commit_every` responses and on close(), without an fsync
+    per commit (WAL, synchronous=NORMAL). A crash loses at most the uncommitted entries,
+    which only costs their full download on the next run. Shared by threads; the asyncio
+    fetcher calls not_modified() and store() through asyncio.to_thread, as both touch SQLite.
+    """
+
+    def __init__(self, path: str = CACHE_FILE, commit_every: int = 500):
+        self.path = path
+        self.commit_every = commit_every
+        self.revalidated = 0
+        self.stored = 0
+
+        self.__uncommitted = 0
+        self.__lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB NOT NULL,
+                stored_at REAL NOT NULL
+            )
+        ''')
+        self.conn.commit()
+
+        # url -> (etag, last_modified); სხეულები დისკზე რჩება
+        self.__validators: dict[str, tuple[str | None, str | None]] = {
+            url: (etag, last_modified)
+            for url, etag, last_modified in self.conn.execute("SELECT url, etag, last_modified FROM responses")
+        }
+
+    def __len__(self) -> int:
+        return len(self.__validators)
+
+    def __enter__(self) -> 'HttpCache':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """Request headers that let the server answer 304 if the cached response of `url` is still current."""
+        validators = self.__validators.get(url)
+        if validators is None:
+            return {}
+
+        etag, last_modified = validators
+        headers = {}
+        if etag is not None:
+            headers['If-None-Match'] = etag
+        if last_modified is not None:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def not_modified(self, url: str) -> bytes | None:
+        """The cached body of `url`, after the server answered 304; None if it is not cached."""
+        with self.__lock:
+            row = self.conn.execute("SELECT body FROM responses WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+            self.revalidated += 1
+        return row[0]
+
+    def store(self, url: str, headers, body: bytes) -> None:
+        """Caches a 200 response of `url`; `headers` is any case-insensitive mapping of the response headers."""
+        validators = (headers.get('ETag'), headers.get('Last-Modified'))
+        if validators == (None, None):
+            return
+        # იგივე ETag იგივე სხეულს ნიშნავს, თავიდან ჩაწერა საჭირო არ არის
+        if validators[0] is not None and self.__validators.get(url) == validators:
+            return
+
+        with self.__lock:
+            self.conn.execute('''
+                INSERT OR REPLACE INTO responses (url, etag, last_modified, body, stored_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (url, *validators, body, time.time()))
+            self.__validators[url] = validators
+            self.stored += 1
+
+            self.__uncommitted += 1
+            if self.__uncommitted >= self.commit_every:
+                self.conn.commit()
+                self.__uncommitted = 0
+
+    def summary(self) -> dict:
+        return {"entries": len(self), "revalidated": self.revalidated, "stored": self.stored}
+
+    def report(self) -> str:
+        return (
+            f"HTTP cache: {self.revalidated} responses were not modified (304) and read from {self.path}, "
+            f"{self.stored} were stored."
+        )
+
+    def close(self) -> None:
+        with self.__lock:
+            self.conn.commit()
+            self.conn.close()
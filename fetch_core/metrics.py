@@ -0,0 +1,246 @@
+import math
+import threading
+import time
+
+# მოთხოვნის ფაზები: dns და connect მხოლოდ ახალ კავშირზე არსებობს, ttfb ითვლება
+# კავშირის მზადყოფნიდან პასუხის header-ებამდე, body - სხეულის წაკითხვა
+PHASES = ('dns', 'connect', 'ttfb', 'body', 'total')
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of durations: values are kept as integer microseconds in
+    log-linear buckets, so memory does not grow with the number of samples and every
+    percentile is within 1 / 2**(sub_bucket_bits - 1) of the recorded value.
+
+    Values below 2**sub_bucket_bits µs get a bucket each; above that each power of
+    two is split into 2**(sub_bucket_bits - 1) equal buckets.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 8):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.sub_bucket_half = self.sub_bucket_count >> 1
+
+        self.counts: list[int] = []
+        self.count = 0
+        self.total = 0
+        self.min: int | None = None
+        self.max: int | None = None
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return self.sub_bucket_count + (shift - 1) * self.sub_bucket_half + (value >> shift) - self.sub_bucket_half
+
+    def _highest_value(self, index: int) -> int:
+        if index < self.sub_bucket_count:
+            return index
+        shift, sub_bucket = divmod(index - self.sub_bucket_count, self.sub_bucket_half)
+        shift += 1
+        return ((sub_bucket + self.sub_bucket_half + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        value = max(round(seconds * 1_000_000), 0)
+        index = self._index(value)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        if other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("histograms with different precision can not be merged")
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, percent: float) -> float:
+        """The duration in seconds that `percent` % of the samples do not exceed; 0 when empty."""
+        if not self.count:
+            return 0.0
+
+        target = max(math.ceil(percent / 100 * self.count), 1)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._highest_value(index), self.max) / 1_000_000
+        return self.max / 1_000_000
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count / 1_000_000 if self.count else 0.0
+
+    def summary(self) -> dict:
+        """count, min, mean, max and the PERCENTILES, durations in milliseconds."""
+        summary = {
+            "count": self.count,
+            "min_ms": (self.min or 0) / 1000,
+            "mean_ms": self.mean * 1000,
+            "max_ms": (self.max or 0) / 1000,
+        }
+        for percent in PERCENTILES:
+            summary[f"p{percent:g}_ms".replace('.', '')] = self.percentile(percent) * 1000
+        return summary
+
+
+class FetchMetrics:
+    """
+    Timings of one fetch run, shared by the fetch threads or tasks.
+
+    Every finished request adds its phases to one LatencyHistogram per phase and one
+    completion to a per-`interval` throughput bucket. Timestamps come from
+    time.perf_counter. Only the fastest and the slowest request are kept by key
+    (a post id, reported as `key_label`).
+    """
+
+    def __init__(self, interval: float = 1.0, key_label: str = "Post ID"):
+        self.interval = interval
+        self.key_label = key_label
+        self.histograms = {phase: LatencyHistogram() for phase in PHASES}
+        self.completed: list[int] = []
+        self.errors = 0
+        self.fastest: tuple[int | str, float] | None = None
+        self.slowest: tuple[int | str, float] | None = None
+
+        self.started_at: float | None = None
+        self.stopped_at: float | None = None
+        self.__lock = threading.Lock()
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+
+    def stop(self) -> None:
+        self.stopped_at = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.stopped_at or time.perf_counter()) - self.started_at
+
+    def record(self, key: int | str, phases: dict[str, float]) -> None:
+        """Adds one finished request; `phases` must contain 'total', other phases are optional."""
+        finished_at = time.perf_counter()
+        total = phases['total']
+
+        with self.__lock:
+            for phase, seconds in phases.items():
+                self.histograms[phase].record(seconds)
+
+            bucket = int((finished_at - self.started_at) / self.interval)
+            if bucket >= len(self.completed):
+                self.completed.extend([0] * (bucket + 1 - len(self.completed)))
+            self.completed[bucket] += 1
+
+            if self.fastest is None or total < self.fastest[1]:
+                self.fastest = (key, total)
+            if self.slowest is None or total > self.slowest[1]:
+                self.slowest = (key, total)
+
+    def record_error(self) -> None:
+        with self.__lock:
+            self.errors += 1
+
+    def throughput(self) -> list[float]:
+        """Completed requests per second in every `interval` of the run."""
+        return [count / self.interval for count in self.completed]
+
+    def summary(self) -> dict:
+        elapsed = self.elapsed
+        requests = self.histograms['total'].count
+        return {
+            "total_time": elapsed,
+            "requests": requests,
+            "errors": self.errors,
+            "requests_per_second": requests / elapsed if elapsed else 0.0,
+            "fastest_response": self.fastest,
+            "slowest_response": self.slowest,
+            "latency": {
+                phase: histogram.summary() for phase, histogram in self.histograms.items() if histogram.count
+            },
+            "throughput_interval": self.interval,
+            "throughput": self.throughput(),
+        }
+
+    def report(self) -> str:
+        """A few human-readable lines: totals, then the percentiles of every measured phase."""
+        elapsed = self.elapsed
+        requests = self.histograms['total'].count
+        lines = [
+            f"Finished {requests} requests ({self.errors} failed) in {elapsed:.2f} seconds, "
+            f"{requests / elapsed if elapsed else 0:.1f} requests/s."
+        ]
+
+        if self.fastest is not None:
+            lines.append(f"Fastest response: {self.key_label} {self.fastest[0]} took {self.fastest[1] * 1000:.1f} ms.")
+            lines.append(f"Slowest response: {self.key_label} {self.slowest[0]} took {self.slowest[1] * 1000:.1f} ms.")
+
+        for phase, histogram in self.histograms.items():
+            if not histogram.count:
+                continue
+            percentiles = '  '.join(
+                f"p{percent:g}={histogram.percentile(percent) * 1000:.1f}" for percent in PERCENTILES
+            )
+            lines.append(f"{phase:>8} ms: {percentiles}  max={histogram.max / 1000:.1f}  (n={histogram.count})")
+
+        throughput = self.throughput()
+        if len(throughput) > 1:
+            lines.append(
+                f"throughput per {self.interval:g}s: min={min(throughput):.0f}  max={max(throughput):.0f} requests/s"
+            )
+        return '\n'.join(lines)
+
+
+def aiohttp_trace_config():
+    """
+    An aiohttp.TraceConfig that timestamps the connection and request events into the
+    dict passed as `trace_request_ctx`; turn the marks into phases with `trace_phases`.
+    aiohttp is imported here so that the threaded fetcher does not need it.
+    """
+    import aiohttp
+
+    def mark(name: str):
+        async def on_event(session, context, params) -> None:
+            if isinstance(context.trace_request_ctx, dict):
+                context.trace_request_ctx[name] = time.perf_counter()
+        return on_event
+
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(mark('request_start'))
+    config.on_dns_resolvehost_start.append(mark('dns_start'))
+    config.on_dns_resolvehost_end.append(mark('dns_end'))
+    config.on_connection_create_start.append(mark('connect_start'))
+    config.on_connection_create_end.append(mark('connected'))
+    config.on_connection_reuseconn.append(mark('connected'))
+    config.on_request_end.append(mark('headers'))
+    return config
+
+
+def trace_phases(marks: dict[str, float], body_end: float) -> dict[str, float]:
+    """Phases of one request from the `aiohttp_trace_config` marks and the time its body was read."""
+    phases = {'total': body_end - marks['request_start']}
+
+    if 'dns_end' in marks:
+        phases['dns'] = marks['dns_end'] - marks['dns_start']
+    if 'connect_start' in marks and 'connected' in marks:
+        # connect-ში DNS არ შედის, ის ცალკე ფაზაა
+        phases['connect'] = marks['connected'] - marks['connect_start'] - phases.get('dns', 0)
+    if 'headers' in marks:
+        phases['ttfb'] = marks['headers'] - marks.get('connected', marks['request_start'])
+        phases['body'] = body_end - marks['headers']
+    return phases
@@ -0,0 +1,381 @@
+"""
+A local stand-in for jsonplaceholder.typicode.com, for reproducible fetcher runs. It serves
+/posts/{id}, /posts/{id}/comments, /users/{id}, /users/{id}/albums and /albums/{id}/photos,
+linked like the real API (10 posts and 10 albums per user, 5 comments per post, 50 photos
+per album), for any id. Responses carry an ETag and a Last-Modified header and conditional
+requests for an unchanged resource are answered 304 Not Modified.
+
+    python -m fetch_core.mock_server --port 8000 --latency lognormal --latency-ms 20 --error-rate 0.01
+
+then point a fetcher at it with --api http://127.0.0.1:8000/posts/{post_id}.
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LATENCY_DISTRIBUTIONS = ('constant', 'uniform', 'exponential', 'lognormal')
+MAX_LATENCY_SECONDS = 10.0
+# მოკის მონაცემები არ იცვლება, ამიტომ ყველა რესურსს ერთი თარიღი აქვს
+LAST_MODIFIED = 'Mon, 01 Jan 2024 00:00:00 GMT'
+
+_FILLER = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+
+
+class MockConfig:
+    """
+    How the mock server behaves.
+
+    arguments:
+        latency: one of LATENCY_DISTRIBUTIONS
+        latency_ms: the constant, mean (uniform, exponential) or median (lognormal) latency
+        latency_spread: ± fraction for uniform, sigma for lognormal
+        error_rate: share of requests answered with 500
+        body_size: approximate size of a post in bytes, None for jsonplaceholder-like posts
+        max_id: posts (and users, albums) above it are 404, None for no limit
+        capacity: requests handled at once before the server answers 429, None for no limit
+        seed: the same seed gives every (path, attempt) the same latency and outcome
+        tags: small objects added to every post as "tags", for bodies that are costly to parse
+    """
+
+    def __init__(
+            self,
+            latency: str = 'lognormal',
+            latency_ms: float = 20.0,
+            latency_spread: float = 0.5,
+            error_rate: float = 0.0,
+            body_size: int | None = None,
+            max_id: int | None = None,
+            seed: int = 0,
+            capacity: int | None = None,
+            tags: int = 0
+    ):
+        if latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"latency must be one of {LATENCY_DISTRIBUTIONS}")
+        if not 0 <= error_rate <= 1:
+            raise ValueError("error_rate must be between 0 and 1")
+
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.latency_spread = latency_spread
+        self.error_rate = error_rate
+        self.body_size = body_size
+        self.max_id = max_id
+        self.seed = seed
+        self.capacity = capacity
+        self.tags = tags
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """One latency in seconds."""
+        if self.latency_ms <= 0:
+            return 0.0
+
+        if self.latency == 'constant':
+            ms = self.latency_ms
+        elif self.latency == 'uniform':
+            ms = rng.uniform(self.latency_ms * (1 - self.latency_spread), self.latency_ms * (1 + self.latency_spread))
+        elif self.latency == 'exponential':
+            ms = rng.expovariate(1 / self.latency_ms)
+        else:
+            ms = rng.lognormvariate(math.log(self.latency_ms), self.latency_spread)
+        return min(max(ms, 0) / 1000, MAX_LATENCY_SECONDS)
+
+    def to_dict(self) -> dict:
+        return dict(vars(self))
+
+
+def make_post(post_id: int, body_size: int | None = None, tags: int = 0) -> dict:
+    """A post shaped like jsonplaceholder's, the same for the same arguments."""
+    rng = random.Random(post_id)
+    words = _FILLER.split()
+    post = {
+        "userId": (post_id - 1) // 10 + 1,
+        "id": post_id,
+        "title": ' '.join(rng.choice(words) for _ in range(6)),
+        "body": ' '.join(rng.choice(words) for _ in range(30)),
+    }
+    if tags:
+        post["tags"] = [{"id": index, "name": rng.choice(words), "weight": rng.random()} for index in range(tags)]
+
+    if body_size is not None:
+        missing = body_size - len(json.dumps(post))
+        if missing > 0:
+            post["body"] += ' ' + (_FILLER * (missing // len(_FILLER) + 1))[:missing - 1]
+    return post
+
+
+def _words(rng: random.Random, count: int) -> str:
+    words = _FILLER.split()
+    return ' '.join(rng.choice(words) for _ in range(count))
+
+
+def make_comments(post_id: int) -> list[dict]:
+    comments = []
+    for comment_id in range((post_id - 1) * 5 + 1, post_id * 5 + 1):
+        rng = random.Random(f"comment:{comment_id}")
+        comments.append({
+            "postId": post_id,
+            "id": comment_id,
+            "name": _words(rng, 4),
+            "email": f"commenter{comment_id}@example.com",
+            "body": _words(rng, 20),
+        })
+    return comments
+
+
+def make_user(user_id: int) -> dict:
+    rng = random.Random(f"user:{user_id}")
+    return {
+        "id": user_id,
+        "name": _words(rng, 2).title(),
+        "username": f"user{user_id}",
+        "email": f"user{user_id}@example.com",
+        "address": {"street": _words(rng, 2).title(), "city": _words(rng, 1).title(), "zipcode": f"{user_id:05d}"},
+        "phone": f"555-{user_id:04d}",
+        "website": f"user{user_id}.example.com",
+        "company": {"name": _words(rng, 2).title(), "catchPhrase": _words(rng, 5)},
+    }
+
+
+def make_albums(user_id: int) -> list[dict]:
+    return [
+        {"userId": user_id, "id": album_id, "title": _words(random.Random(f"album:{album_id}"), 4)}
+        for album_id in range((user_id - 1) * 10 + 1, user_id * 10 + 1)
+    ]
+
+
+def make_photos(album_id: int) -> list[dict]:
+    return [
+        {
+            "albumId": album_id,
+            "id": photo_id,
+            "title": _words(random.Random(f"photo:{photo_id}"), 5),
+            "url": f"https://via.placeholder.com/600/{photo_id:06x}",
+            "thumbnailUrl": f"https://via.placeholder.com/150/{photo_id:06x}",
+        }
+        for photo_id in range((album_id - 1) * 50 + 1, album_id * 50 + 1)
+    ]
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1: კავშირები keep-alive-ით მეორდება, როგორც ნამდვილ API-ზე
+    protocol_version = 'HTTP/1.1'
+    # header-ები და სხეული ცალ-ცალკე იწერება; Nagle-ით კლიენტი delayed ACK-ს ~40ms ელოდება
+    disable_nagle_algorithm = True
+    server: 'MockServer'
+
+    # (რესურსი, ქვე-რესურსი) -> MockServer-ის მეთოდი, რომელიც id-ით პასუხს აგებს
+    ROUTES = {
+        ('posts', None): 'post',
+        ('posts', 'comments'): 'comments',
+        ('users', None): 'user',
+        ('users', 'albums'): 'albums',
+        ('albums', 'photos'): 'photos',
+    }
+
+    def do_GET(self) -> None:
+        parts = self.path.split('?')[0].strip('/').split('/')
+        route = self.ROUTES.get((parts[0], parts[2] if len(parts) == 3 else None)) if len(parts) in (2, 3) else None
+        if route is None or not parts[1].isdigit():
+            self.send_json(404, {})
+            return
+
+        resource_id = int(parts[1])
+        config = self.server.config
+        if resource_id < 1 or (config.max_id is not None and resource_id > config.max_id):
+            self.send_json(404, {})
+            return
+
+        if not self.server.enter():
+            self.send_json(429, {"error": "too many requests"})
+            return
+
+        try:
+            rng = random.Random(f"{config.seed}:{self.path}:{self.server.next_attempt(self.path)}")
+            time.sleep(config.sample_latency(rng))
+            failed = rng.random() < config.error_rate
+        finally:
+            self.server.leave()
+
+        if failed:
+            self.send_json(500, {"error": "mock failure"})
+            return
+
+        body = json.dumps(getattr(self.server, route)(resource_id)).encode('utf-8')
+        validators = {'ETag': '"%s"' % hashlib.sha1(body).hexdigest()[:20], 'Last-Modified': LAST_MODIFIED}
+        if self.not_modified(validators['ETag']):
+            self.send_response(304)
+            for name, value in validators.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.server.count_not_modified()
+        else:
+            self.send_body(200, body, validators)
+
+    def not_modified(self, etag: str) -> bool:
+        """Whether the client's copy is current; If-None-Match takes precedence over If-Modified-Since."""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            return etag in (tag.strip().removeprefix('W/') for tag in if_none_match.split(','))
+        return self.headers.get('If-Modified-Since') == LAST_MODIFIED
+
+    def send_json(self, status: int, data: dict | list) -> None:
+        self.send_body(status, json.dumps(data).encode('utf-8'))
+
+    def send_body(self, status: int, body: bytes, headers: dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+class MockServer(ThreadingHTTPServer):
+    """
+    The mock API on a thread per connection. Usable as a context manager that serves
+    from a background thread; `api` is the URL template the fetchers expect.
+    """
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, config: MockConfig | None = None, host: str = '127.0.0.1', port: int = 0):
+        super().__init__((host, port), MockHandler)
+        self.config = config or MockConfig()
+        self.requests = 0
+        self.rejected = 0
+        self.not_modified = 0
+        self.active = 0
+
+        # (path, attempt) განსაზღვრავს შედეგს, ასე რომ retry შეიძლება წარმატებით დასრულდეს
+        self.__attempts: dict[str, int] = {}
+        self.__lock = threading.Lock()
+        self.__posts: dict[int, dict] = {}
+        self.__thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api(self) -> str:
+        return self.base_url + "/posts/{post_id}"
+
+    def reset(self) -> None:
+        """Forgets the attempts, so the next run sees the same latencies and failures as the first."""
+        with self.__lock:
+            self.requests = 0
+            self.rejected = 0
+            self.not_modified = 0
+            self.__attempts.clear()
+
+    def enter(self) -> bool:
+        """Counts a request in, False if the server is at capacity."""
+        with self.__lock:
+            if self.config.capacity is not None and self.active >= self.config.capacity:
+                self.rejected += 1
+                return False
+            self.active += 1
+            return True
+
+    def leave(self) -> None:
+        with self.__lock:
+            self.active -= 1
+
+    def count_not_modified(self) -> None:
+        with self.__lock:
+            self.not_modified += 1
+
+    def next_attempt(self, path: str) -> int:
+        with self.__lock:
+            self.requests += 1
+            attempt = self.__attempts.get(path, 0)
+            self.__attempts[path] = attempt + 1
+        return attempt
+
+    def post(self, post_id: int) -> dict:
+        post = self.__posts.get(post_id)
+        if post is None:
+            post = self.__posts[post_id] = make_post(post_id, self.config.body_size, self.config.tags)
+        return post
+
+    @staticmethod
+    def comments(post_id: int) -> list[dict]:
+        return make_comments(post_id)
+
+    @staticmethod
+    def user(user_id: int) -> dict:
+        return make_user(user_id)
+
+    @staticmethod
+    def albums(user_id: int) -> list[dict]:
+        return make_albums(user_id)
+
+    @staticmethod
+    def photos(album_id: int) -> list[dict]:
+        return make_photos(album_id)
+
+    def handle_error(self, request, client_address) -> None:
+        # კლიენტი keep-alive კავშირს პროცესის დასრულებისას წყვეტს, ეს შეცდომა არ არის
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def __enter__(self) -> 'MockServer':
+        self.__thread = threading.Thread(target=self.serve_forever, name='mock-server', daemon=True)
+        self.__thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default='lognormal')
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="mean/median latency, 0 for none")
+    parser.add_argument("--latency-spread", type=float, default=0.5, help="uniform ± fraction or lognormal sigma")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 500")
+    parser.add_argument("--body-size", type=int, default=None, help="approximate post size in bytes")
+    parser.add_argument("--max-id", type=int, default=None, help="posts above it are 404")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--capacity", type=int, default=None, help="concurrent requests before answering 429")
+    parser.add_argument("--tags", type=int, default=0, help="small objects per post, to make parsing costly")
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    return MockConfig(
+        args.latency, args.latency_ms, args.latency_spread, args.error_rate, args.body_size, args.max_id, args.seed,
+        args.capacity, args.tags
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serves mock JSONPlaceholder posts.")
+    parser.add_argument("--host", default='127.0.0.1')
+    parser.add_argument("--port", type=int, default=8000)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockServer(config_from_args(args), args.host, args.port)
+    print(f"serving {server.api}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,420 @@
+import asyncio
+import heapq
+import os
+import queue
+import tempfile
+import threading
+from collections.abc import Iterable, Iterator
+from typing import Callable
+
+from .checkpoint import Checkpoint, sync_checkpoint
+from .codec import ParsePool, decode_batch, dumps, loads
+
+# გამოსავალი ფაილის ფორმატები: ერთი JSON ობიექტი სტრიქონზე, ან JSON მასივი,
+# რომლის ყოველი ელემენტიც ცალკე სტრიქონზეა
+NDJSON = 'ndjson'
+JSON_ARRAY = 'json'
+FORMATS = (NDJSON, JSON_ARRAY)
+
+_STOP = object()
+
+
+def encode_record(record: dict) -> str:
+    """One record as compact single-line JSON (newlines inside strings are escaped)."""
+    return dumps(record)
+
+
+def encode_items(
+        items: list[dict | tuple[object, bytes]],
+        schema: dict[str, type] | None = None,
+        parse_pool: ParsePool | None = None
+) -> tuple[list[int], list[str], list[tuple[object, str]]]:
+    """
+    The ids and encoded lines of a writer batch, and (key, why) of every rejected raw body.
+    Records are encoded as they are; raw response bodies, queued as (key, bytes), are decoded,
+    checked against `schema` and re-encoded by decode_batch, in `parse_pool` if there is one.
+    """
+    raw = [item for item in items if isinstance(item, tuple)]
+    bodies = [body for _, body in raw]
+    if not bodies:
+        ids, lines, errors = [], [], []
+    elif parse_pool is not None:
+        ids, lines, errors = parse_pool.decode(bodies, schema)
+    else:
+        ids, lines, errors = decode_batch(bodies, schema)
+
+    if len(raw) < len(items):
+        for record in items:
+            if not isinstance(record, tuple):
+                ids.append(record.get('id'))
+                lines.append(encode_record(record))
+    return ids, lines, [(raw[position][0], error) for position, error in errors]
+
+
+def join_lines(lines: list[str], output_format: str, written: int) -> str:
+    """
+    The text that appends encoded `lines` to a file that already holds `written` records
+    (and, for JSON_ARRAY, the opening bracket).
+    """
+    if output_format == NDJSON:
+        return ''.join(line + '\n' for line in lines)
+
+    separator = ',\n' if written else '\n'
+    return separator + ',\n'.join(lines)
+
+
+def open_output(path: str, output_format: str, buffer_size: int, resume_offset: int | None = None):
+    """
+    Opens `path` for a writer: a new file (with the opening bracket for JSON_ARRAY),
+    or, with `resume_offset`, the existing file cut back to its first `resume_offset` bytes.
+    """
+    if resume_offset is None:
+        file = open(path, 'w', encoding='utf-8', buffering=buffer_size)
+        if output_format == JSON_ARRAY:
+            file.write('[')
+        return file
+
+    # შეწყვეტილი გაშვების ბოლო (ნახევრად ჩაწერილი batch ან დახურვის ფრჩხილი) იჭრება
+    with open(path, 'r+b') as file:
+        file.truncate(resume_offset)
+    return open(path, 'a', encoding='utf-8', buffering=buffer_size)
+
+
+def _resume_offset(checkpoint: Checkpoint | None, resume: bool) -> int | None:
+    if not resume:
+        return None
+    if checkpoint is None or checkpoint.output_offset is None:
+        raise ValueError("resuming needs a saved checkpoint")
+    return checkpoint.output_offset
+
+
+def read_lines(path: str) -> Iterator[str]:
+    """The encoded records of a file written in either format, exactly as they were written."""
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            line = line.strip().rstrip(',')
+            if line and line not in ('[', ']', '[]'):
+                yield line
+
+
+def read_records(path: str) -> Iterator[dict]:
+    """Reads a file written in either format, one record at a time."""
+    return map(loads, read_lines(path))
+
+
+class StreamingWriter:
+    """
+    Append-only output written by a single thread.
+
+    Fetch threads only put records on an unbounded queue, so they never wait for
+    the disk; the writer thread drains the queue in batches into one buffered file.
+    In JSON_ARRAY mode the closing bracket is written on close(), so a closed file
+    is always valid JSON, empty runs included.
+
+    With a `checkpoint` the ids of every written batch are marked in it (see
+    Checkpoint); with `resume` the output is continued from the checkpoint's saved size.
+
+    write() also takes a raw response body (bytes): it is decoded, checked against
+    `schema` and re-encoded by the writer thread, or by `parse_pool`'s processes, so
+    the fetch threads never parse JSON. Bodies that fail are listed in `rejected` as
+    (key, why), with the key they were written with, so the caller can dead-letter them.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            output_format: str = JSON_ARRAY,
+            buffer_size: int = 1 << 20,
+            checkpoint: Checkpoint | None = None,
+            resume: bool = False,
+            schema: dict[str, type] | None = None,
+            parse_pool: ParsePool | None = None
+    ):
+        if output_format not in FORMATS:
+            raise ValueError(f"output_format must be one of {FORMATS}")
+
+        self.path = path
+        self.output_format = output_format
+        self.buffer_size = buffer_size
+        self.checkpoint = checkpoint
+        self.schema = schema
+        self.parse_pool = parse_pool
+        self.count = 0
+        self.rejected: list[tuple[object, str]] = []
+
+        self.__resume_offset = _resume_offset(checkpoint, resume)
+        # ფაილში უკვე არსებული ჩანაწერები: JSON_ARRAY-ში გამყოფი მათზეა დამოკიდებული
+        self.__existing = checkpoint.done if resume else 0
+
+        self.__queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.__thread: threading.Thread | None = None
+        self.__error: BaseException | None = None
+
+    def __enter__(self) -> 'StreamingWriter':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def start(self) -> None:
+        self.__thread = threading.Thread(target=self._run, name="writer", daemon=True)
+        self.__thread.start()
+
+    def write(self, record: dict | bytes, key=None) -> None:
+        """Queues a record, or a raw body; `key` (e.g. the post id) names a body in `rejected`."""
+        self.__queue.put((key, record) if isinstance(record, bytes) else record)
+
+    def close(self) -> None:
+        """Writes everything still queued, finishes the file and re-raises a write error, if any."""
+        if self.__thread is None:
+            return
+
+        self.__queue.put(_STOP)
+        self.__thread.join()
+        self.__thread = None
+
+        if self.__error is not None:
+            raise self.__error
+
+    def _run(self) -> None:
+        stopped = False
+        try:
+            with open_output(self.path, self.output_format, self.buffer_size, self.__resume_offset) as file:
+                while not stopped:
+                    # ბლოკირება მხოლოდ პირველ ჩანაწერზე, დანარჩენი რაც რიგშია ერთ batch-ად იწერება
+                    batch = [self.__queue.get()]
+                    while True:
+                        try:
+                            batch.append(self.__queue.get_nowait())
+                        except queue.Empty:
+                            break
+
+                    if batch[-1] is _STOP:
+                        batch.pop()
+                        stopped = True
+
+                    ids = self._write_batch(file, batch)
+                    file.flush()
+                    sync_checkpoint(self.checkpoint, file, ids, force=stopped)
+
+                if self.output_format == JSON_ARRAY:
+                    file.write('\n]\n')
+        except BaseException as e:
+            self.__error = e
+            # დარჩენილი ჩანაწერები აღარ ჩაიწერება, close() შეცდომას აბრუნებს
+            while not stopped and self.__queue.get() is not _STOP:
+                pass
+
+    def _write_batch(self, file, batch: list[dict | tuple]) -> list[int]:
+        ids, lines, errors = encode_items(batch, self.schema, self.parse_pool)
+        self.rejected += errors
+        if lines:
+            file.write(join_lines(lines, self.output_format, self.__existing + self.count))
+            self.count += len(lines)
+        return ids
+
+
+class AsyncBatchWriter:
+    """
+    The asyncio counterpart of StreamingWriter: one long-lived task owns the file.
+
+    write() only appends to an asyncio.Queue, so fetch tasks never wait for the disk.
+    The writer task buffers records and flushes them once `batch_size` are pending or
+    `flush_interval` seconds after the first of them arrived. Encoding and the write
+    itself run in a worker thread, so the event loop only hands over a list per
+    flush. The number of disk writes depends on the thresholds, not on the request count.
+    close() writes what is left and the closing bracket, so a closed JSON_ARRAY file
+    is always valid JSON, empty runs included. `checkpoint`, `resume` and raw bodies
+    (`schema`, `parse_pool`) work as in StreamingWriter; decoding happens in the
+    flush thread, so it never runs on the event loop.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            output_format: str = JSON_ARRAY,
+            batch_size: int = 1000,
+            flush_interval: float = 1.0,
+            buffer_size: int = 1 << 20,
+            checkpoint: Checkpoint | None = None,
+            resume: bool = False,
+            schema: dict[str, type] | None = None,
+            parse_pool: ParsePool | None = None
+    ):
+        if output_format not in FORMATS:
+            raise ValueError(f"output_format must be one of {FORMATS}")
+
+        self.path = path
+        self.output_format = output_format
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self.checkpoint = checkpoint
+        self.schema = schema
+        self.parse_pool = parse_pool
+        self.count = 0
+        self.rejected: list[tuple[object, str]] = []
+
+        self.__resume_offset = _resume_offset(checkpoint, resume)
+        self.__existing = checkpoint.done if resume else 0
+
+        self.__queue: asyncio.Queue | None = None
+        self.__task: asyncio.Task | None = None
+
+    async def __aenter__(self) -> 'AsyncBatchWriter':
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def start(self) -> None:
+        """Starts the writer task; must be called from the running event loop."""
+        self.__queue = asyncio.Queue()
+        self.__task = asyncio.create_task(self._run(), name="writer")
+
+    def write(self, record: dict | bytes, key=None) -> None:
+        if self.__task.done():
+            # ჩაწერის შეცდომა close()-მდე არ უნდა დაიმალოს
+            self.__task.result()
+        self.__queue.put_nowait((key, record) if isinstance(record, bytes) else record)
+
+    async def close(self) -> None:
+        """Writes everything still queued, finishes the file and re-raises a write error, if any."""
+        if self.__task is None:
+            return
+
+        task, self.__task = self.__task, None
+        if not task.done():
+            self.__queue.put_nowait(_STOP)
+        await task
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        file = await asyncio.to_thread(
+            open_output, self.path, self.output_format, self.buffer_size, self.__resume_offset
+        )
+        try:
+            pending: list[dict | tuple] = []
+            deadline = 0.0
+            stopped = False
+            while not stopped:
+                # ცარიელი ბუფერით დროის ლიმიტი არ მოქმედებს, ვიცდით პირველ ჩანაწერს
+                try:
+                    if pending:
+                        item = await asyncio.wait_for(self.__queue.get(), max(deadline - loop.time(), 0))
+                    else:
+                        item = await self.__queue.get()
+                        deadline = loop.time() + self.flush_interval
+                except asyncio.TimeoutError:
+                    item = None
+
+                # რაც უკვე რიგშია, ლოდინის გარეშე ემატება
+                while item is not None:
+                    if item is _STOP:
+                        stopped = True
+                        break
+                    pending.append(item)
+                    if len(pending) >= self.batch_size:
+                        break
+                    try:
+                        item = self.__queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        item = None
+
+                # გაჩერებისას ცარიელი batch-იც იწერება: checkpoint ბოლოჯერ ინახება
+                if stopped or (pending and (len(pending) >= self.batch_size or loop.time() >= deadline)):
+                    await asyncio.to_thread(self._flush, file, pending, stopped)
+                    pending = []
+
+            if self.output_format == JSON_ARRAY:
+                await asyncio.to_thread(file.write, '\n]\n')
+        finally:
+            await asyncio.to_thread(file.close)
+
+    def _flush(self, file, batch: list[dict | tuple], final: bool = False) -> None:
+        ids, lines, errors = encode_items(batch, self.schema, self.parse_pool)
+        self.rejected += errors
+        if lines:
+            file.write(join_lines(lines, self.output_format, self.__existing + self.count))
+            file.flush()
+            self.count += len(lines)
+        sync_checkpoint(self.checkpoint, file, ids, force=final)
+
+
+def write_records(path: str, records: Iterable[dict], output_format: str) -> int:
+    """Writes `records` to `path` in one pass. Returns how many were written."""
+    writer = StreamingWriter(path, output_format)
+    writer.start()
+    try:
+        for record in records:
+            writer.write(record)
+    finally:
+        writer.close()
+    return writer.count
+
+
+def write_lines(path: str, lines: Iterable[str], output_format: str) -> int:
+    """Writes already encoded records to `path` with the framing of the writers. Returns how many."""
+    written = 0
+    with open(path, 'w', encoding='utf-8', buffering=1 << 20) as file:
+        if output_format == JSON_ARRAY:
+            file.write('[')
+        for line in lines:
+            file.write(join_lines([line], output_format, written))
+            written += 1
+        if output_format == JSON_ARRAY:
+            file.write('\n]\n')
+    return written
+
+
+def external_sort(
+        path: str,
+        output_format: str,
+        key: Callable[[dict], object] = lambda record: record['id'],
+        chunk_size: int = 100_000
+) -> None:
+    """
+    Sorts the records of `path` in place with at most `chunk_size` of them in memory:
+    sorted runs are written to temporary NDJSON files and then k-way merged.
+
+    Lines are only decoded to compute `key` and are moved as they were written, so the
+    file keeps its exact size (a checkpoint's output offset stays valid) whichever
+    codec wrote it.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    run_paths: list[str] = []
+
+    def line_key(line: str):
+        return key(loads(line))
+
+    try:
+        chunk: list[str] = []
+        for line in read_lines(path):
+            chunk.append(line)
+            if len(chunk) >= chunk_size:
+                run_paths.append(_write_run(directory, sorted(chunk, key=line_key)))
+                chunk = []
+
+        # ერთ run-ში ჩატეული ფაილი დროებითი ფაილების გარეშე სორტირდება
+        if not run_paths:
+            runs = [sorted(chunk, key=line_key)]
+        else:
+            if chunk:
+                run_paths.append(_write_run(directory, sorted(chunk, key=line_key)))
+            runs = [read_lines(run_path) for run_path in run_paths]
+
+        tmp_path = path + '.sorted'
+        write_lines(tmp_path, heapq.merge(*runs, key=line_key), output_format)
+        os.replace(tmp_path, path)
+    finally:
+        for run_path in run_paths:
+            os.remove(run_path)
+
+
+def _write_run(directory: str, lines: list[str]) -> str:
+    fd, run_path = tempfile.mkstemp(prefix='.sort-', suffix='.ndjson', dir=directory)
+    with os.fdopen(fd, 'w', encoding='utf-8') as file:
+        file.writelines(line + '\n' for line in lines)
+    return run_path
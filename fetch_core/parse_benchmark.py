@@ -0,0 +1,143 @@
+"""
+Measures how much parsing the responses delays the asyncio fetcher's event loop:
+
+    inline   the bodies are json.loads-ed on the event loop (how assignment_4 used to work)
+    thread   raw bodies go to the AsyncBatchWriter, which decodes them in its flush thread
+    process  as thread, but a ParsePool of --processes processes decodes them
+
+    python -m fetch_core.parse_benchmark --count 20000 --tags 200 --latency-ms 5
+
+While the fetcher runs, a task sleeps for --tick seconds in a loop and records how much
+later than asked it wakes up: that lag is what every other coroutine waits too. Like
+fetch_core.benchmark, every mode runs in a fresh child process against a mock server in
+this process.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from .codec import orjson
+from .metrics import LatencyHistogram
+from .mock_server import MockServer, add_config_arguments, config_from_args
+from .output import NDJSON
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ('inline', 'thread', 'process')
+
+
+async def watch_lag(histogram: LatencyHistogram, tick: float) -> None:
+    """Records, every `tick` seconds until cancelled, how late the event loop woke up."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(tick)
+        histogram.record(max(loop.time() - start - tick, 0.0))
+
+
+def run_child(mode: str, api: str, count: int, concurrency: int, processes: int, tick: float) -> dict:
+    """Runs the asyncio fetcher in `mode` in this process (the child) and returns its measurements."""
+    sys.path.append(os.path.join(ROOT_DIR, 'assignment_4'))
+    from async_request import PostFetcher
+
+    class InlineParseFetcher(PostFetcher):
+        async def fetch_post(self, post_id):
+            body = await self.request(self.API.format(post_id=post_id), post_id)
+            if body is not None:
+                self.writer.write(json.loads(body))
+
+    if mode == 'inline':
+        fetcher = InlineParseFetcher(count, 1, concurrency, concurrency, NDJSON, api)
+    else:
+        fetcher = PostFetcher(count, 1, concurrency, concurrency, NDJSON, api,
+                              parse_processes=processes if mode == 'process' else 0)
+
+    lag = LatencyHistogram()
+
+    async def run() -> None:
+        watcher = asyncio.create_task(watch_lag(lag, tick))
+        try:
+            await fetcher.main()
+        finally:
+            watcher.cancel()
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        asyncio.run(run())
+
+    summary = fetcher.metrics.summary()
+    return {
+        "mode": mode,
+        "posts": count,
+        "written": fetcher.writer.count,
+        "errors": summary["errors"],
+        "seconds": summary["total_time"],
+        "requests_per_second": summary["requests_per_second"],
+        "loop_lag_ms": lag.summary(),
+    }
+
+
+def run_suite(args: argparse.Namespace) -> list[dict]:
+    results = []
+    with MockServer(config_from_args(args)) as server:
+        for mode in args.modes:
+            server.reset()
+            with tempfile.TemporaryDirectory() as work_dir:
+                completed = subprocess.run(
+                    [
+                        sys.executable, '-m', 'fetch_core.parse_benchmark', '--child', mode, '--api', server.api,
+                        '--count', str(args.count), '--concurrency', str(args.concurrency),
+                        '--processes', str(args.processes), '--tick', str(args.tick)
+                    ],
+                    cwd=work_dir,
+                    env={**os.environ, 'PYTHONPATH': ROOT_DIR},
+                    capture_output=True,
+                    text=True,
+                    check=True
+                )
+            result = json.loads(completed.stdout.splitlines()[-1])
+            results.append(result)
+            print(format_result(result), flush=True)
+    return results
+
+
+def format_result(result: dict) -> str:
+    lag = result["loop_lag_ms"]
+    return (
+        f"{result['mode']:>8}  {result['requests_per_second']:>7.0f} req/s  loop lag"
+        f"  p50={lag['p50_ms']:.2f}  p99={lag['p99_ms']:.2f}  p99.9={lag['p999_ms']:.2f}  max={lag['max_ms']:.2f} ms"
+        f"  written={result['written']}/{result['posts']}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measures event-loop lag of the asyncio fetcher per parse mode.")
+    parser.add_argument("--count", type=int, default=20_000, help="posts per run")
+    parser.add_argument("--modes", choices=MODES, nargs='+', default=list(MODES))
+    parser.add_argument("--concurrency", type=int, default=64, help="maximum requests in flight")
+    parser.add_argument("--processes", type=int, default=max((os.cpu_count() or 2) // 2, 1),
+                        help="ParsePool size in the process mode")
+    parser.add_argument("--tick", type=float, default=0.005, help="seconds the lag watcher sleeps per round")
+    parser.add_argument("--output", default=None, help="write the results as JSON to this file")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--api", help=argparse.SUPPRESS)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.api, args.count, args.concurrency, args.processes, args.tick)))
+        return
+
+    print(f"orjson: {'yes' if orjson is not None else 'no'}, {args.tags} tags per post")
+    results = run_suite(args)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump({"server": config_from_args(args).to_dict(), "results": results}, file, indent=4)
+
+
+if __name__ == '__main__':
+    main()
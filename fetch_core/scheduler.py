@@ -0,0 +1,231 @@
+import asyncio
+import random
+import threading
+import time
+
+# გადატვირთვის ნიშნები: ამ სტატუსებზე (და კავშირის შეცდომაზე, status=None) კონკურენცია
+# მცირდება და მოთხოვნა თავიდან იგზავნება
+OVERLOAD_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """Allows `rate` requests per second on average and bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(rate, 1.0)
+        self.__tokens = self.capacity
+        self.__updated_at = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token and returns how many seconds to wait before using it."""
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens = min(self.capacity, self.__tokens + (now - self.__updated_at) * self.rate)
+            self.__updated_at = now
+            # ვალად აღებული ტოკენი: მომდევნო მომლოდინე უფრო გვიან მიიღებს თავისას
+            self.__tokens -= 1
+            return 0.0 if self.__tokens >= 0 else -self.__tokens / self.rate
+
+
+class AimdLimit:
+    """
+    A concurrency limit that grows by about one per round trip while responses are
+    fine and is multiplied by `backoff` on overload. Overload means a 429/5xx, a
+    connection error, or a smoothed latency above `latency_tolerance` times the
+    lowest smoothed latency seen.
+    At most one decrease happens per smoothed round trip, so one burst of errors
+    halves the limit once rather than collapsing it to the minimum.
+    Not thread safe by itself; FetchScheduler calls it under its lock.
+    """
+
+    def __init__(
+            self,
+            initial: int,
+            minimum: int = 1,
+            maximum: int = 100,
+            backoff: float = 0.5,
+            latency_tolerance: float = 2.0
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.limit = float(min(max(initial, minimum), maximum))
+
+        self.latency: float | None = None
+        self.baseline: float | None = None
+        self.__decreased_at = 0.0
+
+    @property
+    def slots(self) -> int:
+        return int(self.limit)
+
+    def on_success(self, latency: float) -> None:
+        self.latency = latency if self.latency is None else 0.9 * self.latency + 0.1 * latency
+        if self.baseline is None or self.latency < self.baseline:
+            self.baseline = self.latency
+        else:
+            # საბაზისო დაყოვნება ნელა მიჰყვება ზემოთ, სერვერის ნორმა შეიძლება შეიცვალოს
+            self.baseline += (self.latency - self.baseline) * 0.001
+
+        if self.latency > self.baseline * self.latency_tolerance:
+            self.on_overload()
+        else:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def on_overload(self) -> None:
+        now = time.monotonic()
+        if now - self.__decreased_at < max(self.latency or 0, 0.05):
+            return
+
+        self.__decreased_at = now
+        self.limit = max(float(self.minimum), self.limit * self.backoff)
+
+
+class RetryPolicy:
+    """Retries overloads and connection errors up to `max_attempts` with full-jitter exponential backoff."""
+
+    def __init__(self, max_attempts: int = 5, base_delay: float = 0.2, max_delay: float = 10.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def retryable(self, status: int | None) -> bool:
+        return status is None or status in OVERLOAD_STATUSES
+
+    def delay(self, attempt: int, retry_after: str | None = None) -> float:
+        # full jitter: ერთდროულად ჩავარდნილი მოთხოვნები ერთ წამში აღარ ბრუნდება
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after is not None and retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), self.max_delay))
+        return delay
+
+
+class FetchScheduler:
+    """
+    Decides when a fetcher may send its next request; shared by the threaded and
+    the asyncio PostFetcher.
+
+    A request first waits for a concurrency slot (the AimdLimit), then for a token
+    (the optional TokenBucket). release() reports how it went, which moves the
+    limit, and retry_delay() says whether and when to send it again. Posts that run
+    out of attempts or fail permanently (e.g. 404) end up in `dead_letters`.
+    Threads use acquire(), coroutines acquire_async(). The state is shared under
+    one lock.
+    """
+
+    def __init__(
+            self,
+            max_concurrency: int,
+            initial_concurrency: int | None = None,
+            min_concurrency: int = 1,
+            rate: float | None = None,
+            burst: float | None = None,
+            retry: RetryPolicy | None = None
+    ):
+        if initial_concurrency is None:
+            initial_concurrency = max(min_concurrency, max_concurrency // 4)
+
+        self.limit = AimdLimit(initial_concurrency, min_concurrency, max_concurrency)
+        self.bucket = TokenBucket(rate, burst) if rate is not None else None
+        self.retry = retry or RetryPolicy()
+        self.dead_letters: list[dict] = []
+        self.retries = 0
+
+        self.__in_flight = 0
+        self.__lock = threading.Lock()
+        self.__available = threading.Condition(self.__lock)
+        self.__async_waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+
+    @property
+    def in_flight(self) -> int:
+        return self.__in_flight
+
+    def acquire(self) -> None:
+        """Blocks the calling thread until the request may be sent."""
+        with self.__available:
+            while self.__in_flight >= self.limit.slots:
+                self.__available.wait()
+            self.__in_flight += 1
+
+        if self.bucket is not None and (delay := self.bucket.reserve()) > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        """Waits, without blocking the event loop, until the request may be sent."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self.__lock:
+                if self.__in_flight < self.limit.slots:
+                    self.__in_flight += 1
+                    break
+                waiter = loop.create_future()
+                self.__async_waiters.append((loop, waiter))
+            await waiter
+
+        if self.bucket is not None and (delay := self.bucket.reserve()) > 0:
+            await asyncio.sleep(delay)
+
+    def release(self, status: int | None, latency: float) -> None:
+        """Frees the slot of a finished request; `status` is None for a connection error or timeout."""
+        with self.__lock:
+            self.__in_flight -= 1
+            # 304 (პირობითი მოთხოვნა, სხეული ქეშიდან) ისეთივე წარმატებაა, როგორც 200
+            if status is not None and (200 <= status < 300 or status == 304):
+                self.limit.on_success(latency)
+            elif self.retry.retryable(status):
+                self.limit.on_overload()
+
+            # ლიმიტი შეიძლება გაიზარდა კიდეც, ამიტომ რამდენი ადგილიცაა, იმდენი მომლოდინე იღვიძებს
+            free = self.limit.slots - self.__in_flight
+            self.__available.notify(max(free, 0))
+            while free > 0 and self.__async_waiters:
+                loop, waiter = self.__async_waiters.pop(0)
+                if not waiter.done():
+                    loop.call_soon_threadsafe(_wake, waiter)
+                    free -= 1
+
+    def retry_delay(
+            self, key: int | str, attempt: int, status: int | None, retry_after: str | None = None
+    ) -> float | None:
+        """
+        Seconds to wait before attempt `attempt + 1` of a failed request, or None if
+        it should not be retried, in which case `key` (a post id or a path) is added to `dead_letters`.
+        """
+        with self.__lock:
+            if self.retry.retryable(status) and attempt + 1 < self.retry.max_attempts:
+                self.retries += 1
+                return self.retry.delay(attempt, retry_after)
+
+            self.dead_letters.append({"request": key, "status": status, "attempts": attempt + 1})
+            return None
+
+    def reject(self, key: int | str, error: str, status: int | None = 200) -> None:
+        """Dead-letters `key` whose response arrived but could not be used, e.g. a malformed body."""
+        with self.__lock:
+            self.dead_letters.append({"request": key, "status": status, "error": error})
+
+    def summary(self) -> dict:
+        return {
+            "concurrency_limit": self.limit.slots,
+            "smoothed_latency_ms": (self.limit.latency or 0) * 1000,
+            "retries": self.retries,
+            "dead_letters": len(self.dead_letters),
+        }
+
+    def report(self) -> str:
+        summary = self.summary()
+        return (
+            f"Concurrency limit settled at {summary['concurrency_limit']}, {summary['retries']} retries, "
+            f"{summary['dead_letters']} posts gave up."
+        )
+
+
+def _wake(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)